@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_app', '0006_remove_customuser_user_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['type'], name='customuser_type_idx'),
+        ),
+    ]
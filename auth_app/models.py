@@ -34,8 +34,19 @@ class CustomUser(AbstractUser):
     # Timestamp for when the user account was created
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Timestamp of the last change to the account / profile
+    updated_at = models.DateTimeField(auto_now=True)
+
     # Timestamp for when a profile-related file was uploaded
     uploaded_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Profile lists and platform stats filter by role
+            models.Index(fields=["type"], name="customuser_type_idx"),
+            # Profile lists page through one role by (created_at, id)
+            models.Index(fields=["type", "created_at", "id"], name="customuser_type_created_idx"),
+        ]
+
     def __str__(self):
         return self.username
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import BaseInfoView
+from .views import BaseInfoView, TimeSeriesView
 
 urlpatterns = [
     path('base-info/', BaseInfoView.as_view(), name='base-info'),
+    path('base-info/timeseries/', TimeSeriesView.as_view(), name='base-info-timeseries'),
 ]
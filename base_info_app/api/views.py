@@ -1,10 +1,13 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from reviews_app.models import Review
-from offers_app.models import Offer
-from auth_app.models import CustomUser
-from django.db.models import Avg
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from base_info_app import rollups
+from base_info_app.stats import get_stats
 
 class BaseInfoView(APIView):
     """
@@ -22,29 +25,102 @@ class BaseInfoView(APIView):
         - Average rating across all reviews (rounded to 1 decimal)
         - Total number of business profiles
         - Total number of offers
+
+        Computed in one query and cached (see base_info_app.stats); the
+        X-Cache header tells HIT, STALE or MISS.
         """
+        stats, state = get_stats()
+        response = Response(stats)
+        response["X-Cache"] = state
+        return response
+
+
+class TimeSeriesView(APIView):
+    """
+    GET /api/base-info/timeseries/?metric=<name>&from=<date>&to=<date>
+        Daily values of one metric, read from the DailyMetric rollups
+        only (see base_info_app.rollups). Days without activity are 0;
+        days after the last rollup are not included – `complete_through`
+        tells up to where the series is final.
 
-        # Total number of reviews
-        review_count = Review.objects.count()
+        metric       offers_created | orders_placed | orders_completed |
+                     revenue | reviews_created | rating_sum
+        from, to     YYYY-MM-DD, default the 30 days up to the last rollup;
+                     at most 366 days
+        business_user=<id>  that business only (the business itself or
+                     staff); without it the platform-wide series
+                     (revenue: staff only)
 
-        # Calculate average rating, default to 0 if none exist
-        average_rating = Review.objects.aggregate(avg=Avg("rating"))["avg"] or 0
-        average_rating = round(average_rating, 1)
+    Expected errors
+        400 unknown metric / invalid or too long date range
+        401 unauthenticated
+        403 foreign business series / platform revenue for non-staff
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_days = 366
+    staff_platform_metrics = ("revenue",)
+
+    def get(self, request):
+        params = request.query_params
+        metric = params.get("metric")
+        if metric not in rollups.METRICS:
+            raise ValidationError({"metric": f"Must be one of: {', '.join(rollups.METRICS)}."})
 
+        business_user_id = self.get_business_user_id(request, metric)
 
-        
+        complete_through = rollups.processed_through()
+        last = self.parse_day(params, "to") or complete_through
+        if last is None:
+            # nothing rolled up yet
+            return Response(self.payload(metric, business_user_id, None, None, [], None))
+        first = self.parse_day(params, "from") or last - timedelta(days=29)
+        if first > last:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        if (last - first).days >= self.max_days:
+            raise ValidationError({"from": f"At most {self.max_days} days per request."})
 
-        # Count business user profiles
-        business_profile_count = CustomUser.objects.filter(type='business').count()
+        end = min(last, complete_through) if complete_through else None
+        points = rollups.series(metric, first, end, business_user_id) if end and end >= first else []
+        return Response(self.payload(metric, business_user_id, first, last, points, complete_through))
 
+    def get_business_user_id(self, request, metric):
+        raw = request.query_params.get("business_user")
+        user = request.user
+        if raw is None:
+            if metric in self.staff_platform_metrics and not user.is_staff:
+                raise PermissionDenied("Only staff may read platform-wide revenue.")
+            return None
+        try:
+            business_user_id = int(raw)
+        except ValueError:
+            raise ValidationError({"business_user": "Must be a valid integer ID."})
+        if business_user_id != user.pk and not user.is_staff:
+            raise PermissionDenied("You can only read your own business series.")
+        return business_user_id
 
-        # Total number of offers
-        offer_count = Offer.objects.count()
+    def parse_day(self, params, name):
+        raw = params.get(name)
+        if raw is None:
+            return None
+        try:
+            day = parse_date(raw)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({name: "Must be a date (YYYY-MM-DD)."})
+        return day
 
-        # Return data as JSON response
-        return Response({
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        })
+    def payload(self, metric, business_user_id, first, last, points, complete_through):
+        return {
+            "metric": metric,
+            "business_user": business_user_id,
+            "from": first,
+            "to": last,
+            "complete_through": complete_through,
+            # revenue as a decimal string, like order prices
+            "points": [
+                {"date": day, "value": str(value) if isinstance(value, Decimal) else value}
+                for day, value in points
+            ],
+        }
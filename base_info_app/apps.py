@@ -10,3 +10,8 @@ class BaseInfoAppConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base_info_app'
+
+    def ready(self):
+        # Register signal handlers (base-info cache invalidation) and the
+        # shared-cache deploy check
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,26 @@
+from django.core.checks import Tags, Warning, register
+
+from base_info_app.stats import cache_settings
+from core.caching import is_per_process
+
+@register(Tags.caches, deploy=True)
+def check_stats_cache_is_shared(app_configs, **kwargs):
+    """
+    The refresh lock, generation and counters of the base-info cache only
+    work across workers on a shared backend.
+    """
+    alias = cache_settings()["ALIAS"]
+    if not is_per_process(alias):
+        return []
+    return [
+        Warning(
+            f"BASE_INFO_CACHE uses the per-process cache '{alias}'.",
+            hint=(
+                "Every worker then refreshes the statistics on its own, writes do not "
+                "invalidate other workers' copies and base_info_cache_stats sees no "
+                "counters. Point BASE_INFO_CACHE['ALIAS'] at a Redis, Memcached or "
+                "database cache."
+            ),
+            id="base_info_app.W001",
+        )
+    ]
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from base_info_app.stats import cache_settings, get_counter
+from core.caching import is_per_process
+
+
+class Command(BaseCommand):
+    """
+    Prints hit / stale / miss counters of the platform statistics cache.
+
+        python manage.py base_info_cache_stats [--reset]
+    """
+
+    help = "Show (or reset) base-info cache statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true")
+
+    def handle(self, *args, **options):
+        alias = cache_settings()["ALIAS"]
+        if is_per_process(alias):
+            self.stderr.write(self.style.WARNING(
+                f"BASE_INFO_CACHE uses the per-process cache '{alias}' – this command "
+                "only sees its own counters, not those of the server workers."
+            ))
+        counter = get_counter()
+        stats = counter.snapshot()
+        self.stdout.write(
+            f"hits {stats['hit']}  stale {stats['stale']}  misses {stats['miss']}  "
+            f"hit ratio {stats['hit_ratio']:.2%}"
+        )
+        if options["reset"]:
+            counter.reset()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
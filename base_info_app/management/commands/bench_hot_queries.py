@@ -0,0 +1,197 @@
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth_app.models import CustomUser
+from base_info_app.api.views import BaseInfoView
+from base_info_app.stats import compute_stats
+from core.bench import capture_plans, format_timing, measure, scratch_database
+from offers_app.models import Offer, OfferDetail
+from orders_app.api.views import CompletedOrderCountView, OrderCountView
+from orders_app.models import Order
+from profiles_app.api.views import BusinessUserListView
+from reviews_app.models import Review
+
+
+class Command(BaseCommand):
+    """
+    Prints EXPLAIN QUERY PLAN and timings for the queries behind the hot
+    endpoints, once without and once with the indexes / unique constraints
+    declared on Order, OfferDetail, Review and CustomUser.
+
+        python manage.py bench_hot_queries --orders 200000
+    """
+
+    help = "EXPLAIN QUERY PLAN + timings for hot lookups, before/after indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--businesses", type=int, default=2_000)
+        parser.add_argument("--customers", type=int, default=10_000)
+        parser.add_argument("--orders", type=int, default=200_000)
+        parser.add_argument("--offers", type=int, default=20_000)
+        parser.add_argument("--reviews", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with scratch_database():
+            self.seed(options, rng)
+            scenarios = self.scenarios(rng)
+
+            self.set_indexes(enabled=False)
+            self.stdout.write(self.style.MIGRATE_HEADING("\n=== before (no indexes) ==="))
+            self.run(scenarios, options["repeat"])
+
+            self.set_indexes(enabled=True)
+            self.stdout.write(self.style.MIGRATE_HEADING("\n=== after (indexes) ==="))
+            self.run(scenarios, options["repeat"])
+
+    # ------------------------------------------------------------------
+    def scenarios(self, rng):
+        factory = APIRequestFactory()
+        business = CustomUser.objects.filter(type="business").order_by("?").first()
+        customer = CustomUser.objects.filter(type="customer").order_by("?").first()
+        offer = Offer.objects.order_by("?").first()
+
+        def get(view, path, **kwargs):
+            def call():
+                request = factory.get(path)
+                force_authenticate(request, user=customer)
+                response = view(request, **kwargs)
+                response.render()
+                return response
+            return call
+
+        return [
+            (
+                f"GET /api/order-count/{business.id}/",
+                get(OrderCountView.as_view(), "/", business_user_id=business.id),
+            ),
+            (
+                f"GET /api/completed-order-count/{business.id}/",
+                get(CompletedOrderCountView.as_view(), "/", business_user_id=business.id),
+            ),
+            (
+                "PATCH /api/offers/<id>/ tier load",
+                lambda: list(offer.details.all()),
+            ),
+            (
+                "POST /api/reviews/ duplicate check",
+                lambda: Review.objects.filter(
+                    reviewer=customer, business_user_id=business.id
+                ).exists(),
+            ),
+            (
+                "GET /api/profiles/business/",
+                get(BusinessUserListView.as_view(), "/"),
+            ),
+            ("base-info statistics (uncached)", compute_stats),
+            ("GET /api/base-info/ (cached)", get(BaseInfoView.as_view(), "/")),
+        ]
+
+    def run(self, scenarios, repeat):
+        for label, call in scenarios:
+            self.stdout.write(f"\n{label}")
+            for sql, plan in capture_plans(call):
+                self.stdout.write(f"  SQL  {sql[:160]}")
+                for line in plan:
+                    self.stdout.write(f"       {line}")
+            self.stdout.write(format_timing("  timing", measure(call, repeat=repeat)))
+
+    # ------------------------------------------------------------------
+    def managed_indexes(self):
+        """(model, index-or-constraint) pairs added for the hot lookups."""
+        pairs = []
+        for model in (Order, CustomUser):
+            pairs += [(model, index) for index in model._meta.indexes]
+        for model in (OfferDetail, Review):
+            pairs += [(model, constraint) for constraint in model._meta.constraints]
+        return pairs
+
+    def set_indexes(self, enabled):
+        with connection.schema_editor() as editor:
+            for model, item in self.managed_indexes():
+                if item in model._meta.indexes:
+                    (editor.add_index if enabled else editor.remove_index)(model, item)
+                elif enabled:
+                    editor.add_constraint(model, item)
+                else:
+                    # SQLite drops a table-level UNIQUE by rebuilding the table
+                    # from the model state, so hide the constraint meanwhile.
+                    declared = model._meta.constraints
+                    model._meta.constraints = [c for c in declared if c is not item]
+                    try:
+                        editor.remove_constraint(model, item)
+                    finally:
+                        model._meta.constraints = declared
+
+    def seed(self, options, rng):
+        self.stdout.write("Seeding scratch database ...")
+        businesses = CustomUser.objects.bulk_create(
+            CustomUser(username=f"biz{i}", type="business")
+            for i in range(options["businesses"])
+        )
+        customers = CustomUser.objects.bulk_create(
+            CustomUser(username=f"cust{i}", type="customer")
+            for i in range(options["customers"])
+        )
+
+        offers = Offer.objects.bulk_create(
+            (
+                Offer(user=rng.choice(businesses), title=f"Offer {i}", description="-")
+                for i in range(options["offers"])
+            ),
+            batch_size=5_000,
+        )
+        OfferDetail.objects.bulk_create(
+            (
+                OfferDetail(
+                    offer=offer, title=ot, price=Decimal(rng.randint(5, 500)), offer_type=ot
+                )
+                for offer in offers
+                for ot in ("basic", "standard", "premium")
+            ),
+            batch_size=5_000,
+        )
+
+        statuses = ["in_progress", "completed", "cancelled"]
+        now = timezone.now()
+        Order.objects.bulk_create(
+            (
+                Order(
+                    customer_user=rng.choice(customers),
+                    business_user=rng.choice(businesses),
+                    title="Order",
+                    revisions=1,
+                    delivery_time_in_days=5,
+                    created_at=now,
+                    due_at=Order.compute_due_at(now, 5),
+                    price=Decimal(100),
+                    offer_type="basic",
+                    status=rng.choice(statuses),
+                )
+                for _ in range(options["orders"])
+            ),
+            batch_size=5_000,
+        )
+
+        pairs = set()
+        while len(pairs) < options["reviews"]:
+            pairs.add((rng.randrange(len(customers)), rng.randrange(len(businesses))))
+        Review.objects.bulk_create(
+            (
+                Review(
+                    reviewer=customers[c],
+                    business_user=businesses[b],
+                    rating=rng.randint(1, 5),
+                    description="-",
+                )
+                for c, b in pairs
+            ),
+            batch_size=5_000,
+        )
@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from base_info_app import rollups
+
+
+class Command(BaseCommand):
+    """
+    Rolls up the days since the last run into DailyMetric (per business
+    user and platform-wide). Schedule it once a day, e.g. shortly after
+    midnight; only days that have fully passed are processed.
+
+        python manage.py rollup_daily_metrics
+        python manage.py rollup_daily_metrics --rebuild-from 2025-01-01
+    """
+
+    help = "Incrementally roll up daily offer / order / review metrics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild-from",
+            type=date.fromisoformat,
+            help="Re-process from this day (YYYY-MM-DD) instead of the watermark.",
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Last day to process (default: yesterday).",
+        )
+
+    def handle(self, *args, **options):
+        until = options["until"]
+        if until is not None and until >= timezone.localdate():
+            raise CommandError("--until must be a day that has already ended.")
+        days = rollups.run(
+            until=until,
+            start=options["rebuild_from"],
+            log=lambda line: self.stdout.write(f"  {line}"),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {days} day(s); processed through {rollups.processed_through()}."
+            )
+        )
@@ -1,3 +1,57 @@
 from django.db import models
+from django.db.models import Q
+from auth_app.models import CustomUser
 
-# Create your models here.
+
+class DailyMetric(models.Model):
+    """
+    One day of activity, either of one business user or – with
+    business_user NULL – of the whole platform.
+
+    Written only by `rollup_daily_metrics` (see base_info_app.rollups), so
+    time series are read from here instead of grouping the source tables.
+    """
+
+    day = models.DateField()
+    # Calendar day in settings.TIME_ZONE
+
+    business_user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='daily_metrics'
+    )
+    # The business the figures belong to; NULL for the platform-wide row
+
+    offers_created = models.PositiveIntegerField(default=0)
+    orders_placed = models.PositiveIntegerField(default=0)
+    orders_completed = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Sum of the prices of the orders completed that day
+
+    reviews_created = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    # Sum of the ratings of that day's reviews (average = rating_sum / reviews_created)
+
+    class Meta:
+        constraints = [
+            # Also the index of the per-business series
+            models.UniqueConstraint(fields=['business_user', 'day'], name='daily_metric_business_day'),
+            models.UniqueConstraint(
+                fields=['day'], condition=Q(business_user__isnull=True), name='daily_metric_platform_day'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.business_user_id or 'platform'}"
+
+
+class RollupWatermark(models.Model):
+    """Last day a rollup has fully processed; the next run starts the day after."""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    processed_through = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.processed_through}"
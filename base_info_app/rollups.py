@@ -0,0 +1,153 @@
+"""
+Daily rollups of platform and business activity (DailyMetric).
+
+`rollup_daily_metrics` processes whole days only – from the day after the
+watermark up to yesterday – one window at a time. A window groups each
+source table once by (business user, day), replaces the DailyMetric rows
+of those days and moves the watermark in the same transaction, so an
+interrupted run resumes where it stopped and re-running is harmless.
+
+Sources:
+    offers_created    Offer.created_at, by Offer.user
+    orders_placed     Order / ArchivedOrder.created_at
+    orders_completed  Order / ArchivedOrder.completed_at (set when the
+    revenue           status turns 'completed'; later edits do not move it)
+    reviews_created,  Review.created_at
+    rating_sum
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from base_info_app.models import DailyMetric, RollupWatermark
+from offers_app.models import Offer
+from orders_app.models import ArchivedOrder, Order
+from reviews_app.models import Review
+
+WATERMARK = "daily_metrics"
+WINDOW_DAYS = 31
+
+METRICS = (
+    "offers_created",
+    "orders_placed",
+    "orders_completed",
+    "revenue",
+    "reviews_created",
+    "rating_sum",
+)
+
+
+def processed_through():
+    """Last fully rolled-up day, or None before the first run."""
+    return (
+        RollupWatermark.objects.filter(pk=WATERMARK).values_list("processed_through", flat=True).first()
+    )
+
+
+def first_activity_day():
+    firsts = [
+        model.objects.aggregate(first=Min("created_at"))["first"]
+        for model in (Offer, Order, ArchivedOrder, Review)
+    ]
+    firsts = [value for value in firsts if value is not None]
+    return timezone.localtime(min(firsts)).date() if firsts else None
+
+
+def run(until=None, start=None, log=None):
+    """
+    Rolls up the days after the watermark (or from `start`, to rebuild)
+    through `until` (default yesterday). Returns the number of days
+    processed.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    done = processed_through()
+    if done is None:
+        start = min(filter(None, (start, first_activity_day())), default=None)
+    elif start is None or start > done + timedelta(days=1):
+        # never leave a gap behind the watermark
+        start = done + timedelta(days=1)
+    if start is None or start > until:
+        return 0
+
+    day = start
+    while day <= until:
+        last = min(day + timedelta(days=WINDOW_DAYS - 1), until)
+        written = roll_up_window(day, last)
+        if log:
+            log(f"{day} – {last}: {written} row(s)")
+        day = last + timedelta(days=1)
+    return (until - start).days + 1
+
+
+def roll_up_window(first, last):
+    """Replaces the rows of [first, last] and sets the watermark to `last`."""
+    lower = _day_start(first)
+    upper = _day_start(last + timedelta(days=1))
+    rows = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+
+    def add(queryset, user_field, time_field, **aggregates):
+        grouped = (
+            queryset.filter(**{f"{time_field}__gte": lower, f"{time_field}__lt": upper})
+            .annotate(day=TruncDate(time_field))
+            .order_by()
+            .values(user_field, "day")
+            .annotate(**aggregates)
+        )
+        for group in grouped:
+            row = rows[group[user_field], group["day"]]
+            for metric in aggregates:
+                row[metric] += group[metric] or 0
+
+    add(Offer.objects.all(), "user_id", "created_at", offers_created=Count("pk"))
+    for model in (Order, ArchivedOrder):
+        add(model.objects.all(), "business_user_id", "created_at", orders_placed=Count("pk"))
+        add(
+            model.objects.filter(status="completed"),
+            "business_user_id",
+            "completed_at",
+            orders_completed=Count("pk"),
+            revenue=Sum("price"),
+        )
+    add(Review.objects.all(), "business_user_id", "created_at", reviews_created=Count("pk"), rating_sum=Sum("rating"))
+
+    platform = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    for (_, day), values in rows.items():
+        for metric, value in values.items():
+            platform[day][metric] += value
+
+    metrics = [
+        DailyMetric(business_user_id=user_id, day=day, **values)
+        for (user_id, day), values in rows.items()
+    ] + [DailyMetric(business_user=None, day=day, **values) for day, values in platform.items()]
+
+    with transaction.atomic():
+        DailyMetric.objects.filter(day__gte=first, day__lte=last).delete()
+        DailyMetric.objects.bulk_create(metrics, batch_size=1000)
+        RollupWatermark.objects.update_or_create(pk=WATERMARK, defaults={"processed_through": last})
+    return len(metrics)
+
+
+def series(metric, first, last, business_user_id=None):
+    """
+    [(day, value)] for every day of [first, last] – days without activity
+    as 0. Reads only DailyMetric.
+    """
+    rows = DailyMetric.objects.filter(
+        business_user_id=business_user_id, day__gte=first, day__lte=last
+    ).values_list("day", metric)
+    values = dict(rows)
+    zero = Decimal("0.00") if metric == "revenue" else 0
+    return [
+        (first + timedelta(days=offset), values.get(first + timedelta(days=offset), zero))
+        for offset in range((last - first).days + 1)
+    ]
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
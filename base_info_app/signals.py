@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+from base_info_app import stats
+from offers_app.models import Offer
+from reviews_app.models import Review
+from reviews_app.summaries import summaries_changed
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=CustomUser)
+@receiver(summaries_changed)
+def invalidate_base_info(sender, **kwargs):
+    """Review / offer / user changes make the platform statistics stale on commit."""
+    transaction.on_commit(stats.invalidate)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_base_info_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    # only new users or a (possibly) changed type move business_profile_count
+    if created or update_fields is None or "type" in update_fields:
+        transaction.on_commit(stats.invalidate)
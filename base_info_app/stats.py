@@ -0,0 +1,130 @@
+"""
+Platform statistics for GET /api/base-info/.
+
+The four figures come from one SELECT of scalar subqueries (one round
+trip), and are cached with stale-while-revalidate:
+
+  * fresh entry                 → served (HIT)
+  * expired, within STALE       → one worker takes a short lock and
+                                  recomputes; the others keep serving the
+                                  old figures (STALE) instead of piling
+                                  onto the database
+  * missing / past STALE        → recomputed (MISS)
+
+Review, offer and user writes bump a generation number after commit (see
+base_info_app.signals), which turns the cached entry stale at once.
+
+The lock, the generation and the hit counters only work across workers
+on a shared backend (Redis, Memcached, database); `check --deploy` warns
+when the alias is a per-process one (base_info_app.checks).
+
+Settings:
+    BASE_INFO_CACHE = {
+        "ALIAS": "shared",    # entry of CACHES to use
+        "TIMEOUT": 60,        # seconds the figures count as fresh
+        "STALE": 600,         # further seconds they may be served while refreshing
+    }
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from auth_app.models import CustomUser
+from core.caching import CacheCounter
+from offers_app.models import Offer
+from reviews_app.models import Review
+
+NAMESPACE = "base-info"
+ENTRY_KEY = f"{NAMESPACE}:stats"
+GENERATION_KEY = f"{NAMESPACE}:generation"
+LOCK_KEY = f"{NAMESPACE}:refresh-lock"
+LOCK_TIMEOUT = 30  # seconds – a crashed refresher blocks others at most this long
+
+DEFAULTS = {"ALIAS": "default", "TIMEOUT": 60, "STALE": 600}
+
+
+def cache_settings():
+    return {**DEFAULTS, **getattr(settings, "BASE_INFO_CACHE", {})}
+
+
+def get_cache():
+    return caches[cache_settings()["ALIAS"]]
+
+
+def get_counter():
+    return CacheCounter(NAMESPACE, cache_settings()["ALIAS"])
+
+
+def compute_stats():
+    """All four figures in a single query."""
+    quote = connection.ops.quote_name
+    reviews = quote(Review._meta.db_table)
+    users = quote(CustomUser._meta.db_table)
+    offers = quote(Offer._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT (SELECT COUNT(*) FROM {reviews}),"
+            f" (SELECT AVG({quote('rating')}) FROM {reviews}),"
+            f" (SELECT COUNT(*) FROM {users} WHERE {quote('type')} = %s),"
+            f" (SELECT COUNT(*) FROM {offers})",
+            ["business"],
+        )
+        review_count, average_rating, business_profile_count, offer_count = cursor.fetchone()
+    return {
+        "review_count": review_count,
+        "average_rating": round(average_rating or 0, 1),
+        "business_profile_count": business_profile_count,
+        "offer_count": offer_count,
+    }
+
+
+def get_stats():
+    """Returns (stats, "HIT" | "STALE" | "MISS")."""
+    cache = get_cache()
+    counter = get_counter()
+    values = cache.get_many([ENTRY_KEY, GENERATION_KEY])
+    entry = values.get(ENTRY_KEY)
+    generation = values.get(GENERATION_KEY, 0)
+
+    if entry is not None:
+        fresh = entry["generation"] == generation and entry["expires_at"] > time.time()
+        if fresh:
+            counter.hit()
+            return entry["stats"], "HIT"
+        if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+            # someone else is refreshing – serve the previous figures
+            counter.stale()
+            return entry["stats"], "STALE"
+        try:
+            counter.miss()
+            return refresh(generation), "MISS"
+        finally:
+            cache.delete(LOCK_KEY)
+
+    counter.miss()
+    return refresh(generation), "MISS"
+
+
+def refresh(generation):
+    """
+    Recomputes and stores the figures under `generation`, read *before*
+    computing – a write committed meanwhile leaves the entry stale.
+    """
+    options = cache_settings()
+    stats = compute_stats()
+    entry = {"stats": stats, "generation": generation, "expires_at": time.time() + options["TIMEOUT"]}
+    get_cache().set(ENTRY_KEY, entry, options["TIMEOUT"] + options["STALE"])
+    return stats
+
+
+def invalidate():
+    """Marks the cached figures stale; the next request refreshes them."""
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        if not cache.add(GENERATION_KEY, 1, timeout=None):
+            cache.incr(GENERATION_KEY)
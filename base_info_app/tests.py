@@ -1,3 +1,164 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from base_info_app import checks, rollups, stats
+from base_info_app.models import DailyMetric
+from offers_app.models import Offer
+from orders_app.models import Order
+from reviews_app.models import Review
+
+
+class BaseInfoTests(TestCase):
+    """One query per refresh, cached with stale-while-revalidate, invalidated by writes."""
+
+    def setUp(self):
+        self.cache = stats.get_cache()
+        self.cache.clear()
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description="Fine")
+        Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        self.client = APIClient()
+
+    def get(self, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get("/api/base-info/")
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_figures_are_computed_in_one_query_and_cached(self):
+        response = self.get(queries=1)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.data,
+            {"review_count": 1, "average_rating": 4.0, "business_profile_count": 1, "offer_count": 1},
+        )
+        self.assertEqual(self.get(queries=0)["X-Cache"], "HIT")
+
+    def test_writes_invalidate_after_commit(self):
+        self.get(queries=1)
+        other = CustomUser.objects.create_user(username="cus2", password="pw", type="customer")
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(business_user=self.business, reviewer=other, rating=5, description="Great")
+        response = self.get(queries=1)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual((response.data["review_count"], response.data["average_rating"]), (2, 4.5))
+
+    def test_expired_figures_are_served_while_another_worker_refreshes(self):
+        self.get(queries=1)
+        entry = self.cache.get(stats.ENTRY_KEY)
+        self.cache.set(stats.ENTRY_KEY, {**entry, "expires_at": time.time() - 1})
+
+        self.cache.add(stats.LOCK_KEY, 1)  # a concurrent request is refreshing
+        self.assertEqual(self.get(queries=0)["X-Cache"], "STALE")
+        self.cache.delete(stats.LOCK_KEY)
+        self.assertEqual(self.get(queries=1)["X-Cache"], "MISS")
+        self.assertEqual(self.get(queries=0)["X-Cache"], "HIT")
+
+        out = StringIO()
+        call_command("base_info_cache_stats", stdout=out, stderr=StringIO())
+        self.assertIn("hits 1  stale 1  misses 2  hit ratio 50.00%", out.getvalue())
+
+    def test_per_process_cache_alias_is_flagged(self):
+        shared = {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "test_shared_cache"}
+        with override_settings(CACHES={"default": shared}, BASE_INFO_CACHE={"ALIAS": "default"}):
+            self.assertEqual(checks.check_stats_cache_is_shared(None), [])
+
+        with override_settings(BASE_INFO_CACHE={"ALIAS": "default"}):
+            self.assertEqual(
+                [message.id for message in checks.check_stats_cache_is_shared(None)], ["base_info_app.W001"]
+            )
+            err = StringIO()
+            call_command("base_info_cache_stats", stdout=StringIO(), stderr=err)
+        self.assertIn("per-process cache 'default'", err.getvalue())
+
+
+class DailyRollupTests(TestCase):
+    """rollup_daily_metrics rolls up finished days once; the time series reads only the rollups."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.today = timezone.localdate()
+        now = timezone.now()
+        for days_ago, order_status in ((3, "completed"), (3, "completed"), (2, "in_progress"), (0, "completed")):
+            order = Order.objects.create(
+                customer_user=self.customer,
+                business_user=self.business,
+                title="Logo",
+                revisions=1,
+                delivery_time_in_days=5,
+                price=Decimal("10.50"),
+                offer_type="basic",
+                status=order_status,
+            )
+            moment = now - timedelta(days=days_ago)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=moment, updated_at=moment, completed_at=order.completed_at and moment
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+
+    def series(self, **params):
+        response = self.client.get("/api/base-info/timeseries/", params)
+        self.assertEqual(response.status_code, 200)
+        return [point["value"] for point in response.data["points"]]
+
+    def test_rollup_is_incremental_and_serves_the_series(self):
+        call_command("rollup_daily_metrics", stdout=StringIO())
+        yesterday = self.today - timedelta(days=1)
+        self.assertEqual(rollups.processed_through(), yesterday)
+        # today is not finished – its order is not rolled up yet
+        self.assertEqual(DailyMetric.objects.filter(day=self.today).count(), 0)
+
+        out = StringIO()
+        call_command("rollup_daily_metrics", stdout=out)
+        self.assertIn("Rolled up 0 day(s)", out.getvalue())
+
+        start = (self.today - timedelta(days=4)).isoformat()
+        with self.assertNumQueries(2):
+            revenue = self.series(metric="revenue", business_user=self.business.pk, **{"from": start})
+        self.assertEqual(revenue, ["0.00", "21.00", "0.00", "0.00"])
+        self.assertEqual(self.series(metric="orders_placed", **{"from": start}), [0, 2, 1, 0])
+
+    def test_later_edits_do_not_count_a_completion_again(self):
+        rollups.run(until=self.today - timedelta(days=3))
+        completed = Order.objects.filter(status="completed").order_by("created_at").first()
+
+        # a later PATCH of the completed order, rolled up a day after
+        response = self.client.patch(f"/api/orders/{completed.pk}/", {"status": "completed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        Order.objects.filter(pk=completed.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        call_command("rollup_daily_metrics", stdout=StringIO())
+
+        start = (self.today - timedelta(days=3)).isoformat()
+        self.assertEqual(self.series(metric="orders_completed", **{"from": start}), [2, 0, 0])
+
+        # leaving 'completed' clears the completion time, completing again sets it anew
+        self.client.patch(f"/api/orders/{completed.pk}/", {"status": "in_progress"}, format="json")
+        completed.refresh_from_db()
+        self.assertIsNone(completed.completed_at)
+        self.client.patch(f"/api/orders/{completed.pk}/", {"status": "completed"}, format="json")
+        completed.refresh_from_db()
+        self.assertEqual(completed.completed_at.date(), timezone.now().date())
+
+    def test_series_permissions_and_validation(self):
+        call_command("rollup_daily_metrics", stdout=StringIO())
+        get = self.client.get
+        self.assertEqual(get("/api/base-info/timeseries/", {"metric": "revenue"}).status_code, 403)
+        self.assertEqual(
+            get("/api/base-info/timeseries/", {"metric": "orders_placed", "business_user": self.customer.pk}).status_code,
+            403,
+        )
+        self.assertEqual(get("/api/base-info/timeseries/", {"metric": "profit"}).status_code, 400)
+        self.assertEqual(
+            get("/api/base-info/timeseries/", {"metric": "orders_placed", "from": "2025-02-30"}).status_code, 400
+        )
@@ -3,6 +3,10 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve through this (e.g. ``uvicorn core.asgi:application``) for the
+long-lived order event stream at /api/orders/events/; under WSGI that
+endpoint answers one poll per request instead of holding a worker.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
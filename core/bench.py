@@ -0,0 +1,107 @@
+"""
+Small helpers shared by the ``bench_*`` management commands.
+
+Benchmarks never touch the configured database: they run against a
+throw-away copy created the same way the Django test runner does it.
+"""
+
+import resource
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+
+@contextmanager
+def scratch_database(path=None, options=None):
+    """
+    Creates a fresh, fully migrated test database for the duration of the
+    block. ``path`` switches SQLite from in-memory to a file, which is
+    needed when several threads have to write concurrently; ``options``
+    are merged into the connection OPTIONS (e.g. SQLite transaction_mode).
+    """
+    if path is not None:
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = str(path)
+    if options:
+        for settings_dict in (connection.settings_dict, settings.DATABASES[connection.alias]):
+            settings_dict.setdefault("OPTIONS", {}).update(options)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn, repeat=20, warmup=2):
+    """
+    Calls ``fn`` ``repeat`` times (after ``warmup`` untimed calls) and
+    returns a dict with median / p95 / min latency in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    p95_index = min(len(samples) - 1, int(round(len(samples) * 0.95)) - 1)
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[max(p95_index, 0)],
+        "min_ms": samples[0],
+    }
+
+
+def format_timing(label, timing):
+    """One aligned report line for a ``measure()`` result."""
+    return (
+        f"{label:<40} median {timing['median_ms']:9.2f} ms   "
+        f"p95 {timing['p95_ms']:9.2f} ms   min {timing['min_ms']:9.2f} ms"
+    )
+
+
+def explain_sql(sql, params=()):
+    """Returns SQLite's EXPLAIN QUERY PLAN for one statement as text lines."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def capture_plans(fn):
+    """
+    Runs ``fn`` once and returns ``(sql, plan_lines)`` for every SELECT it
+    executed – i.e. the real query plans of a view or code path.
+    """
+    with CaptureQueriesContext(connection) as captured:
+        fn()
+    return [
+        (query["sql"], explain_sql(query["sql"]))
+        for query in captured.captured_queries
+        if query["sql"].lstrip().upper().startswith("SELECT")
+    ]
+
+
+def rss_bytes():
+    """Current resident set size of this process (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,62 @@
+"""
+Shared helpers for application-level caches.
+"""
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_per_process(alias):
+    """True for backends whose data is private to one worker process."""
+    return isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+class CacheCounter:
+    """
+    Hit / miss counters stored next to the cached data, so with a shared
+    backend (Redis, Memcached) they add up across all workers.
+    """
+
+    EVENTS = ("hit", "miss", "stale")
+
+    def __init__(self, namespace, alias="default"):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, event):
+        return f"{self.namespace}:stats:{event}"
+
+    def record(self, event):
+        key = self._key(event)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # first event (or evicted) – add() keeps a concurrent incr intact
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def hit(self):
+        self.record("hit")
+
+    def miss(self):
+        self.record("miss")
+
+    def stale(self):
+        self.record("stale")
+
+    def snapshot(self):
+        """Counts per event plus the hit ratio (stale hits count as hits)."""
+        values = self.cache.get_many([self._key(event) for event in self.EVENTS])
+        counts = {event: values.get(self._key(event), 0) for event in self.EVENTS}
+        served = counts["hit"] + counts["stale"]
+        total = served + counts["miss"]
+        counts["hit_ratio"] = round(served / total, 4) if total else 0.0
+        return counts
+
+    def reset(self):
+        self.cache.delete_many([self._key(event) for event in self.EVENTS])
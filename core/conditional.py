@@ -0,0 +1,102 @@
+"""
+Conditional request handling (ETag / Last-Modified) for detail views.
+
+Before an object is loaded and serialized, a narrow query fetches only
+its id and the timestamps its representation depends on. From those the
+validators are derived:
+
+  * GET / HEAD with a matching If-None-Match or If-Modified-Since → 304
+  * PATCH / PUT with a non-matching If-Match (or If-Unmodified-Since
+    older than the object) → 412, so concurrent edits cannot silently
+    overwrite each other
+
+Successful responses carry the ETag / Last-Modified headers.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalRequestMixin:
+    """
+    Mixin for generic detail views. Subclasses describe the narrow query:
+
+    * `validator_fields` – timestamp fields (may span relations) that
+      change whenever the representation changes; default ("updated_at",)
+    * `get_validator_queryset()` – the object scoped to what the
+      requester may see; defaults to get_queryset() filtered by the lookup.
+      If the row is not found the view runs normally (→ 403 / 404).
+    """
+
+    validator_fields = ("updated_at",)
+
+    def get_validator_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_queryset().prefetch_related(None).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def get_validators(self, for_update=False):
+        """Returns (etag, last_modified timestamp) or (None, None)."""
+        qs = self.get_validator_queryset().order_by()
+        if for_update:
+            qs = qs.select_for_update(of=("self",))
+        row = qs.values_list("pk", *self.validator_fields).first()
+        if row is None:
+            return None, None
+
+        timestamps = [value for value in row[1:] if value is not None]
+        digest = hashlib.md5(
+            repr((row[0],) + tuple(ts.isoformat() for ts in timestamps)).encode()
+        ).hexdigest()[:16]
+        etag = quote_etag(f"{row[0]}-{digest}")
+        last_modified = timegm(max(timestamps).utctimetuple()) if timestamps else None
+        return etag, last_modified
+
+    def conditional(self, request, handler, for_update=False):
+        etag, last_modified = self.get_validators(for_update=for_update)
+        if etag is not None:
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                return self.set_validator_headers(response, etag, last_modified)
+
+        response = handler()
+        if response.status_code == 200:
+            if for_update:
+                etag, last_modified = self.get_validators()
+            if etag is not None:
+                self.set_validator_headers(response, etag, last_modified)
+        return response
+
+    def set_validator_headers(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional(
+            request, lambda: super(ConditionalRequestMixin, self).get(request, *args, **kwargs)
+        )
+
+    def patch(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return self.conditional(
+                request,
+                lambda: super(ConditionalRequestMixin, self).patch(request, *args, **kwargs),
+                for_update=True,
+            )
+
+    def put(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return self.conditional(
+                request,
+                lambda: super(ConditionalRequestMixin, self).put(request, *args, **kwargs),
+                for_update=True,
+            )
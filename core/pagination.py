@@ -0,0 +1,273 @@
+"""
+Opt-in keyset ("cursor") pagination for list endpoints.
+
+Page-number pagination needs a COUNT(*) and an OFFSET that grows with the
+page number. Keyset pagination instead remembers the sort key of the last
+row it returned and asks for the rows after it:
+
+    ORDER BY updated_at DESC, id DESC
+    WHERE updated_at <= :v AND (updated_at < :v OR (updated_at = :v AND id < :id))
+
+With an index on (updated_at, id) every page is a short range scan, so
+page 1000 costs the same as page 1. The id tiebreak keeps the order total,
+which means rows never repeat or go missing between pages.
+
+Clients opt in with `?pagination=cursor` (or by following a `next` /
+`previous` link, which carries `?cursor=`). Setting
+`API_KEYSET_PAGINATION_DEFAULT = True` makes it the default for every view
+using it.
+
+Clients that did not opt in keep the plain JSON list, but never more than
+`API_LIST_MAX_ROWS` (default 1000) rows of it: a longer list is cut there
+and the response carries `Link: <...?offset=1000>; rel="next"` for the
+rest, so no list endpoint can dump a whole table.
+"""
+
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple("Cursor", ["position", "reverse"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Views describe their key with two optional attributes:
+
+    * `keyset_ordering` – default key, e.g. ("-updated_at", "-id")
+    * `keyset_fields`   – fields a client may sort by via ?ordering=; the
+      first term of the queryset's ordering is used if it is one of them,
+      with the primary key appended as tiebreak
+
+    Any other ordering (e.g. search relevance) cannot be expressed as a
+    range and falls back to `keyset_ordering`.
+
+    When the client did not opt in, `fallback_class` paginates the request
+    instead (None → the plain list, capped at `API_LIST_MAX_ROWS` rows with
+    an `?offset=` link in the `Link` header).
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    offset_query_param = "offset"
+    default_ordering = ("-created_at", "-id")
+    fallback_class = None
+
+    invalid_cursor_message = "Invalid cursor."
+
+    def is_requested(self, request):
+        params = request.query_params
+        if self.cursor_query_param in params:
+            return True
+        mode = params.get(self.mode_query_param)
+        if mode is not None:
+            return mode == "cursor"
+        return getattr(settings, "API_KEYSET_PAGINATION_DEFAULT", False)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if not self.is_requested(request) and self.fallback_class is not None:
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        One page over several querysets with the same key columns and
+        disjoint ids (e.g. a live and an archive table): each contributes
+        at most one page from its own index, the pages are merged in key
+        order. Without opt-in the querysets' own ordering is kept (see
+        paginate_legacy).
+        """
+        self.fallback = None
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.legacy = not self.is_requested(request)
+        if self.legacy:
+            return self.paginate_legacy(querysets, request)
+
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(querysets[0], view)
+        cursor = self.decode_cursor(request, querysets[0].model)
+
+        reverse = cursor is not None and cursor.reverse
+        ordering = _invert(self.ordering) if reverse else self.ordering
+        results = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*ordering)
+            if cursor is not None:
+                queryset = queryset.filter(_after(ordering, cursor.position))
+            # one extra row tells whether there is anything beyond this page
+            results += queryset[: self.page_size + 1]
+        if len(querysets) > 1:
+            # keys share one direction (see get_ordering)
+            results.sort(key=self.position_key, reverse=ordering[0].startswith("-"))
+        has_more = len(results) > self.page_size
+        del results[self.page_size:]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = results
+        return results
+
+    def paginate_legacy(self, querysets, request):
+        """
+        The unpaginated list of old: every row in the queryset's ordering,
+        but at most `API_LIST_MAX_ROWS` of them per response, from ?offset=.
+        Several querysets must share their ordering; each contributes up to
+        offset + limit rows and the merged list is cut to the window.
+        """
+        limit = getattr(settings, "API_LIST_MAX_ROWS", 1000)
+        try:
+            offset = _positive_int(request.query_params.get(self.offset_query_param, 0))
+        except ValueError:
+            offset = 0
+        if len(querysets) == 1:
+            rows = list(querysets[0][offset: offset + limit + 1])
+        else:
+            rows = []
+            for queryset in querysets:
+                rows += queryset[: offset + limit + 1]
+            terms = querysets[0].query.order_by or ("pk",)
+            rows.sort(
+                key=lambda row: tuple(getattr(row, term.lstrip("-")) for term in terms),
+                reverse=terms[0].startswith("-"),
+            )
+            rows = rows[offset: offset + limit + 1]
+        self.next_offset = offset + limit if len(rows) > limit else None
+        del rows[limit:]
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        if self.legacy:
+            response = Response(data)
+            if self.next_offset is not None:
+                url = replace_query_param(self.base_url, self.offset_query_param, self.next_offset)
+                response["Link"] = f'<{url}>; rel="next"'
+            return response
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ------- key ------------------------------------------------------------
+    def get_ordering(self, queryset, view):
+        default = tuple(getattr(view, "keyset_ordering", self.default_ordering))
+        allowed = getattr(view, "keyset_fields", ())
+        requested = queryset.query.order_by
+        if requested and isinstance(requested[0], str):
+            term = requested[0]
+            name = term.lstrip("-")
+            if name in allowed:
+                prefix = "-" if term.startswith("-") else ""
+                return (term, prefix + "id")
+        return default
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    # ------- links ----------------------------------------------------------
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(self.position_of(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(self.position_of(self.page[0]), True))
+
+    def position_key(self, obj):
+        return tuple(getattr(obj, term.lstrip("-")) for term in self.ordering)
+
+    def position_of(self, obj):
+        return [_encode_value(getattr(obj, term.lstrip("-"))) for term in self.ordering]
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps({"p": cursor.position, "r": int(cursor.reverse)})
+        token = urlsafe_b64encode(payload.encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode("ascii")))
+            raw_position = payload["p"]
+            if len(raw_position) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(term.lstrip("-")).to_python(value)
+                for term, value in zip(self.ordering, raw_position)
+            ]
+            return Cursor(position, bool(payload.get("r")))
+        except (TypeError, ValueError, KeyError, FieldDoesNotExist, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+def _invert(ordering):
+    return tuple(term[1:] if term.startswith("-") else "-" + term for term in ordering)
+
+
+def _after(ordering, position):
+    """
+    Rows strictly after `position` in `ordering`, spelled out as
+    a < x OR (a = x AND b < y) plus a leading bound on the first column
+    so the planner can use it as an index range.
+    """
+    names = [term.lstrip("-") for term in ordering]
+    lookups = ["lt" if term.startswith("-") else "gt" for term in ordering]
+
+    condition = Q()
+    for i, name in enumerate(names):
+        equal = {names[j]: position[j] for j in range(i)}
+        condition |= Q(**equal, **{f"{name}__{lookups[i]}": position[i]})
+    leading = {f"{names[0]}__{lookups[0]}e": position[0]}
+    return Q(**leading) & condition
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
@@ -0,0 +1,16 @@
+"""
+Access to the database schema as the applied migrations left it.
+"""
+
+from django.db.migrations.loader import MigrationLoader
+
+
+def applied_apps(connection):
+    """
+    Historical model registry matching the migrations applied to
+    ``connection`` – for maintenance commands that have to run before the
+    database is migrated to the current models (e.g. dedupe_reviews).
+    Model signals are not connected to these models.
+    """
+    loader = MigrationLoader(connection, ignore_no_migrations=True)
+    return loader.project_state(list(loader.applied_migrations)).apps
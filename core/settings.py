@@ -1,5 +1,6 @@
 # settings.py
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -94,3 +95,48 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
 }
+
+# Most rows a list endpoint returns without ?pagination=cursor (core/pagination.py)
+API_LIST_MAX_ROWS = 1000
+
+# Cache backend – local memory by default; point this at Redis / Memcached
+# in production so cached data and counters are shared by all workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Cache for state every worker process must see – e.g. the generations and
+# hit counters of the offer response cache and the base-info statistics. Redis when
+# REDIS_URL is set; otherwise the database cache table outside DEBUG
+# (python manage.py createcachetable) and local memory in DEBUG, which runs
+# a single process.
+if os.environ.get('REDIS_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+elif DEBUG:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    }
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'coderr_shared_cache',
+    }
+
+# Response cache for GET /api/offers/ and /api/offers/<id>/ (offers_app/api/caching.py)
+OFFER_RESPONSE_CACHE = {
+    'ALIAS': 'shared',
+    'TIMEOUT': 60,  # seconds
+}
+
+# Platform statistics of GET /api/base-info/ (base_info_app/stats.py)
+BASE_INFO_CACHE = {
+    'ALIAS': 'shared',
+    'TIMEOUT': 60,   # seconds the figures count as fresh
+    'STALE': 600,    # further seconds they are served while one worker refreshes
+}
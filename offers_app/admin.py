@@ -8,9 +8,21 @@ class OfferDetailInline(admin.TabularInline):
 
 # Custom admin configuration for the Offer model
 class OfferAdmin(admin.ModelAdmin):
-    list_display = ('title', 'user', 'created_at', 'updated_at')  # Columns to show in the Offer list view
+    list_display = ('title', 'user', 'min_price', 'min_delivery_time', 'created_at', 'updated_at')  # Columns to show in the Offer list view
+    readonly_fields = ('min_price', 'min_delivery_time')  # Maintained from the tiers, never edited by hand
     inlines = [OfferDetailInline]  # Include OfferDetails inline on the Offer edit page
 
+    def save_related(self, request, form, formsets, change):
+        # Inline tier edits are saved here – refresh the stored summary afterwards
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_tier_summary()
+
+# Admin configuration for editing a single OfferDetail directly
+class OfferDetailAdmin(admin.ModelAdmin):
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        obj.offer.refresh_tier_summary()  # Keep the parent's min_price / min_delivery_time in sync
+
 # Registering the models with their respective admin configurations
 admin.site.register(Offer, OfferAdmin)  # Use the customized admin view for Offer
-admin.site.register(OfferDetail)        # Register OfferDetail separately for direct access
+admin.site.register(OfferDetail, OfferDetailAdmin)  # Register OfferDetail separately for direct access
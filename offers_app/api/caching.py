@@ -0,0 +1,111 @@
+"""
+Response cache for the public offer list / detail endpoints.
+
+Responses are cached under a key built from the normalised query string
+and a *generation* number. Any change to an Offer, its tiers, its image
+derivatives or a creator's public name bumps the generation (after the
+transaction commits, see offers_app.signals), which orphans every cached
+response at once – nothing has to be found and deleted.
+
+The generation and the hit counters only work across workers on a shared
+backend (Redis, Memcached, database); `check --deploy` warns when the
+alias is a per-process one (offers_app.checks).
+
+Settings:
+    OFFER_RESPONSE_CACHE = {
+        "ALIAS": "shared",    # entry of CACHES to use
+        "TIMEOUT": 60,        # seconds a response may be served
+    }
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from core.caching import CacheCounter
+
+NAMESPACE = "offers:response"
+GENERATION_KEY = f"{NAMESPACE}:generation"
+
+DEFAULTS = {"ALIAS": "default", "TIMEOUT": 60}
+
+
+def cache_settings():
+    return {**DEFAULTS, **getattr(settings, "OFFER_RESPONSE_CACHE", {})}
+
+
+def get_cache():
+    return caches[cache_settings()["ALIAS"]]
+
+
+def get_counter():
+    return CacheCounter(NAMESPACE, cache_settings()["ALIAS"])
+
+
+def current_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    """Invalidates every cached offer response."""
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        cache.incr(GENERATION_KEY)
+
+
+class CachedResponseMixin:
+    """
+    Caches successful GET responses of a generic list / retrieve view.
+
+    `cache_query_params` lists the query parameters that influence the
+    response; everything else is ignored when building the key, and the
+    parameters are sorted so equivalent URLs share one entry.
+    """
+
+    cache_query_params = ()
+
+    def get_response_cache_key(self, request, generation):
+        params = sorted(
+            (name, value)
+            for name in self.cache_query_params
+            for value in request.query_params.getlist(name)
+            if value != ""
+        )
+        raw = repr((request.get_host(), request.path, params))
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"{NAMESPACE}:{generation}:{type(self).__name__}:{digest}"
+
+    def cached_response(self, request, render):
+        """
+        Returns the cached body for this request or calls ``render()`` and
+        stores its 200 response. Adds an X-Cache: HIT / MISS header.
+        """
+        cache = get_cache()
+        counter = get_counter()
+        # read the generation *before* rendering, so a concurrent write
+        # can never leave stale data under the new generation
+        key = self.get_response_cache_key(request, current_generation())
+
+        data = cache.get(key)
+        if data is not None:
+            counter.hit()
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        counter.miss()
+        response = render()
+        if response.status_code == 200:
+            cache.set(key, response.data, cache_settings()["TIMEOUT"])
+        response["X-Cache"] = "MISS"
+        return response
@@ -1,6 +1,6 @@
 # offers_app/api/serializers.py
 from rest_framework import serializers
-from django.db import models, transaction
+from django.db import transaction
 from offers_app.models import Offer, OfferDetail
 
 
@@ -70,9 +70,13 @@ class OfferSerializer(serializers.ModelSerializer):
     """
 
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    # stored on the offer (see Offer.refresh_tier_summary) – no per-row aggregate
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    min_delivery_time = serializers.IntegerField(read_only=True)
     user_details = serializers.SerializerMethodField()
+    image_derivatives = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -81,6 +85,7 @@ class OfferSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_derivatives",
             "description",
             "created_at",
             "updated_at",
@@ -97,24 +102,35 @@ class OfferSerializer(serializers.ModelSerializer):
             "min_price",
             "min_delivery_time",
             "user_details",
+            "image_derivatives",
         ]
 
 
 
-    def get_min_price(self, obj):
-        """Cheapest tier among basic/standard/premium."""
-        return obj.details.aggregate(models.Min("price"))["price__min"] or 0
-
-    def get_min_delivery_time(self, obj):
-        """Fastest delivery-time among all tiers (days)."""
-        return obj.details.aggregate(models.Min("delivery_time_in_days"))[
-            "delivery_time_in_days__min"
-        ] or 0
-
     def get_user_details(self, obj):
         u = obj.user
         return {"first_name": u.first_name, "last_name": u.last_name, "username": u.username}
 
+    def get_image_derivatives(self, obj):
+        """
+        Resized copies of `image` keyed by kind (thumbnail / card / full).
+        Empty until the image pipeline has rendered the current image.
+        """
+        if not obj.image:
+            return {}
+        request = self.context.get("request")
+        derivatives = {}
+        for derivative in obj.image_derivatives.all():
+            if derivative.source_name != obj.image.name:
+                continue  # rendered from a previous image
+            url = derivative.file.url
+            derivatives[derivative.kind] = {
+                "url": request.build_absolute_uri(url) if request else url,
+                "width": derivative.width,
+                "height": derivative.height,
+            }
+        return derivatives
+
 
 
 
@@ -192,32 +208,53 @@ class OfferCreateSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
+        """
+        One INSERT for the offer (summary columns included) and one bulk
+        INSERT for all tiers.
+        """
         details_data = validated_data.pop("details")
-        offer = Offer.objects.create(user=self.context["request"].user, **validated_data)
+        offer = Offer(user=self.context["request"].user, **validated_data)
+        offer.set_tier_summary(details_data)
+        offer.save()
 
-        for tier in details_data:
-            OfferDetail.objects.create(offer=offer, **tier)
+        OfferDetail.objects.bulk_create(
+            OfferDetail(offer=offer, **tier) for tier in details_data
+        )
         return offer
 
     @transaction.atomic
     def update(self, instance, validated_data):
+        """
+        Loads the existing tiers once, then writes all transmitted tiers with
+        at most one bulk UPDATE and one bulk INSERT, followed by a single
+        UPDATE of the offer – a fixed number of statements per PATCH.
+        """
         details_data = validated_data.pop("details", None)
 
         # scalar fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
         # tiers
         if details_data:
+            tiers = {tier.offer_type: tier for tier in instance.details.all()}
+            changed, created = [], []
             for tier_data in details_data:
-                ot = tier_data["offer_type"]
-                tier_obj = instance.details.filter(offer_type=ot).first()
+                tier_obj = tiers.get(tier_data["offer_type"])
                 if tier_obj:
                     for field, val in tier_data.items():
                         setattr(tier_obj, field, val)
-                    tier_obj.save()
+                    changed.append(tier_obj)
                 else:
-                    OfferDetail.objects.create(offer=instance, **tier_data)
+                    tier_obj = OfferDetail(offer=instance, **tier_data)
+                    tiers[tier_obj.offer_type] = tier_obj
+                    created.append(tier_obj)
+
+            if changed:
+                OfferDetail.objects.bulk_update(changed, sorted(REQUIRED_TIER_FIELDS))
+            if created:
+                OfferDetail.objects.bulk_create(created)
+            instance.set_tier_summary(tiers.values())
 
+        instance.save()
         return instance
@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     OfferListCreateView,
     OfferDetailView,
-    OfferDetailRetrieveView
+    OfferDetailRetrieveView,
+    OfferSuggestView,
 )
 
 # URL configuration for the offers_app API endpoints
@@ -11,6 +12,9 @@ urlpatterns = [
     # Endpoint to list all offers or create a new offer (GET/POST)
     path('offers/', OfferListCreateView.as_view(), name='offer-list-create'),
 
+    # Endpoint for title autocomplete, served from the in-memory prefix index (GET)
+    path('offers/suggest/', OfferSuggestView.as_view(), name='offer-suggest'),
+
     # Endpoint to retrieve, update, or delete a specific offer by ID (GET/PATCH/DELETE)
     path('offers/<int:id>/', OfferDetailView.as_view(), name='offer-detail'),
 
@@ -6,6 +6,7 @@ from rest_framework.generics import (
     RetrieveAPIView,
 )
 from rest_framework.permissions import (
+    AllowAny,
     IsAuthenticatedOrReadOnly,
     IsAuthenticated,
     BasePermission,
@@ -13,9 +14,17 @@ from rest_framework.permissions import (
 )
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter
 from rest_framework.filters import OrderingFilter, SearchFilter
-from offers_app.models import Offer, OfferDetail
+from django.db.models import Exists, OuterRef, Subquery
+from core.conditional import ConditionalRequestMixin
+from core.pagination import KeysetPagination
+from offers_app import search
+from offers_app.suggest import title_index
+from .caching import CachedResponseMixin
+from offers_app.models import Offer, OfferDetail, OfferImageDerivative
 from .serializers import OfferSerializer, OfferCreateSerializer, OfferDetailSerializer
 
 
@@ -25,21 +34,87 @@ class OfferPagination(PageNumberPagination):
     """Default page-size 1 (Postman-Tests) – overridable via ?page_size=."""
     page_size = 1
     page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class OfferCursorPagination(KeysetPagination):
+    """Opt-in keyset mode (?pagination=cursor); page numbers stay the default."""
+    fallback_class = OfferPagination
+
+
+
+
+class OfferOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that maps the public ?ordering= names onto stored columns.
+    `details__price` is kept for existing clients but sorts on the indexed
+    Offer.min_price instead of joining the tiers.
+    """
+    ordering_aliases = {"details__price": "min_price"}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = [self._resolve_alias(term) for term in fields]
+        return super().remove_invalid_fields(queryset, fields, view, request)
+
+    def _resolve_alias(self, term):
+        prefix = "-" if term.startswith("-") else ""
+        field = term.lstrip("-")
+        return prefix + self.ordering_aliases.get(field, field)
+
+
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    ?search= backed by the FTS5 index (see offers_app.search) instead of
+    LIKE '%term%' scans. Results are ranked – title hits first – unless the
+    client asked for an explicit ?ordering=. Falls back to the regular
+    SearchFilter when the index is not available (non-SQLite backends).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        if not search.is_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search.search_offers(queryset, terms)
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("search_rank", "-updated_at")
+        return queryset
 
 
 
 
 class OfferFilter(FilterSet):
-    """?min_price= & ?max_delivery_time= für verknüpfte OfferDetails"""
-    min_price = NumberFilter(field_name="details__price", lookup_expr="gte")
-    max_delivery_time = NumberFilter(
-        field_name="details__delivery_time_in_days", lookup_expr="lte"
-    )
+    """
+    ?min_price= & ?max_delivery_time= für verknüpfte OfferDetails
+
+    Both filters are correlated EXISTS subqueries on the tiers instead of
+    JOINs, so an offer is matched at most once and no DISTINCT is needed.
+    """
+    min_price = NumberFilter(method="filter_min_price")
+    max_delivery_time = NumberFilter(method="filter_max_delivery_time")
 
     class Meta:
         model = Offer
         fields = ["user", "min_price", "max_delivery_time"]
 
+    def filter_min_price(self, queryset, name, value):
+        return queryset.filter(
+            Exists(OfferDetail.objects.filter(offer=OuterRef("pk"), price__gte=value))
+        )
+
+    def filter_max_delivery_time(self, queryset, name, value):
+        return queryset.filter(
+            Exists(
+                OfferDetail.objects.filter(
+                    offer=OuterRef("pk"), delivery_time_in_days__lte=value
+                )
+            )
+        )
+
 
 
 
@@ -48,23 +123,41 @@ class IsOfferOwnerOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in SAFE_METHODS:
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 
 
-class OfferListCreateView(ListCreateAPIView):
+class OfferListCreateView(CachedResponseMixin, ListCreateAPIView):
     """
-    GET  /api/offers/          – public list  
+    GET  /api/offers/          – public list (response-cached, see .caching)
     POST /api/offers/          – only *business* users may create
     """
-    queryset = Offer.objects.all().distinct()
+    queryset = Offer.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
-    pagination_class = OfferPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    pagination_class = OfferCursorPagination
+    keyset_ordering = ("-updated_at", "-id")
+    keyset_fields = ("updated_at", "min_price")
+    filter_backends = [DjangoFilterBackend, OfferOrderingFilter, OfferSearchFilter]
     filterset_class = OfferFilter
-    ordering_fields = ["updated_at", "details__price"]
+    ordering_fields = ["updated_at", "min_price"]
     search_fields = ["title", "description"]
+    cache_query_params = (
+        "user", "min_price", "max_delivery_time", "ordering", "search",
+        "page", "page_size", "pagination", "cursor",
+    )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(OfferListCreateView, self).list(request, *args, **kwargs),
+        )
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            qs = qs.for_public_listing()
+        return qs
 
     def get_serializer_class(self):
         return OfferCreateSerializer if self.request.method == "POST" else OfferSerializer
@@ -76,16 +169,44 @@ class OfferListCreateView(ListCreateAPIView):
         serializer.save()
 
 
-class OfferDetailView(RetrieveUpdateDestroyAPIView):
+class OfferDetailView(ConditionalRequestMixin, CachedResponseMixin, RetrieveUpdateDestroyAPIView):
     """
-    GET    /api/offers/<id>/  
+    GET    /api/offers/<id>/  – response-cached, see .caching
     PATCH  /api/offers/<id>/  – creator only  
     DELETE /api/offers/<id>/  – creator only
+
+    Conditional requests: ETag / Last-Modified from the offer, its creator
+    and its image derivatives (304 on GET, 412 on a stale If-Match PATCH).
     """
     queryset = Offer.objects.all()
     permission_classes = [IsAuthenticated, IsOfferOwnerOrReadOnly]
     lookup_field = "id"
     lookup_url_kwarg = "id"
+    validator_fields = ("updated_at", "user__updated_at", "derivatives_updated_at")
+
+    def get_validator_queryset(self):
+        qs = Offer.objects.filter(pk=self.kwargs["id"]).annotate(
+            derivatives_updated_at=Subquery(
+                OfferImageDerivative.objects.filter(offer=OuterRef("pk"))
+                .order_by("-created_at")
+                .values("created_at")[:1]
+            )
+        )
+        if self.request.method not in SAFE_METHODS:
+            qs = qs.filter(user=self.request.user)
+        return qs
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(OfferDetailView, self).retrieve(request, *args, **kwargs),
+        )
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            qs = qs.for_public_listing()
+        return qs
 
     def get_serializer_class(self):
         return OfferCreateSerializer if self.request.method == "PATCH" else OfferSerializer
@@ -97,3 +218,30 @@ class OfferDetailRetrieveView(RetrieveAPIView):
     serializer_class = OfferDetailSerializer
     lookup_field = "id"
     lookup_url_kwarg = "id"
+
+
+class OfferSuggestView(APIView):
+    """
+    GET /api/offers/suggest/?q=<prefix>&limit=<k>
+
+    Autocomplete for the search box: top-k offer titles starting with the
+    prefix (at the title start or at any word). Answered from the
+    in-process index in offers_app.suggest – no authentication lookup,
+    no database query, no serializer pass.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    default_limit = 10
+    max_limit = 25
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        suggestions = title_index.suggest(query, limit=limit)
+        return Response([{"id": offer_id, "title": title} for offer_id, title in suggestions])
@@ -9,3 +9,8 @@ class OffersAppConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'  # Use BigAutoField for primary keys by default
     name = 'offers_app'  # Name of the app as used in INSTALLED_APPS and imports
+
+    def ready(self):
+        # Register model signal handlers (tier summary, search indexes, image pipeline,
+        # response cache) and the shared-cache deploy check
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,26 @@
+from django.core.checks import Tags, Warning, register
+
+from core.caching import is_per_process
+from offers_app.api.caching import cache_settings
+
+@register(Tags.caches, deploy=True)
+def check_response_cache_is_shared(app_configs, **kwargs):
+    """
+    The generation and counters of the offer response cache only work
+    across workers on a shared backend.
+    """
+    alias = cache_settings()["ALIAS"]
+    if not is_per_process(alias):
+        return []
+    return [
+        Warning(
+            f"OFFER_RESPONSE_CACHE uses the per-process cache '{alias}'.",
+            hint=(
+                "Offer writes then only invalidate the responses cached by the worker "
+                "that handled them, other workers serve stale offers until TIMEOUT, "
+                "and offer_cache_stats sees no counters. Point "
+                "OFFER_RESPONSE_CACHE['ALIAS'] at a Redis, Memcached or database cache."
+            ),
+            id="offers_app.W001",
+        )
+    ]
@@ -0,0 +1,31 @@
+"""
+Duplicate tiers per (offer, offer_type) – left over from before the
+unique_offer_tier_type constraint. Shared by migration 0005 (which refuses
+to run while any exist) and the dedupe_offer_tiers command.
+"""
+
+from django.db.models import Count, Min
+
+
+def duplicate_tiers(OfferDetail):
+    """
+    Returns ((offer_id, offer_type), kept_id, [dropped ids]) for every
+    duplicated pair. The oldest tier – the one the API has always updated –
+    is kept. Takes the model class, so historical models work as well.
+    """
+    pairs = (
+        OfferDetail.objects.values("offer_id", "offer_type")
+        .annotate(n=Count("id"), keep=Min("id"))
+        .filter(n__gt=1)
+        .order_by("offer_id", "offer_type")
+    )
+    groups = []
+    for pair in pairs:
+        dropped = list(
+            OfferDetail.objects.filter(offer_id=pair["offer_id"], offer_type=pair["offer_type"])
+            .exclude(pk=pair["keep"])
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        groups.append(((pair["offer_id"], pair["offer_type"]), pair["keep"], dropped))
+    return groups
@@ -0,0 +1,151 @@
+"""
+Offer image derivative pipeline.
+
+Uploaded offer images are served as uploaded (often multi-MB PNG
+screenshots). After an offer is committed, ``schedule_derivatives`` hands
+the offer to a small background thread pool which renders a thumbnail,
+a card and a full-size copy with Pillow: orientation applied, metadata
+(EXIF / ICC / text chunks) dropped, re-encoded as WebP (JPEG if Pillow
+lacks WebP support). Dimensions are stored on OfferImageDerivative and
+OfferSerializer exposes the URLs.
+
+Settings (all optional):
+    OFFER_IMAGE_PIPELINE_ASYNC   run in the thread pool (default True);
+                                 False renders inline after commit
+    OFFER_IMAGE_PIPELINE_WORKERS thread pool size (default 2)
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+from .models import Offer, OfferImageDerivative
+
+logger = logging.getLogger(__name__)
+
+# kind -> bounding box (width, height); images are never upscaled
+DERIVATIVE_SIZES = {
+    "thumbnail": (160, 160),
+    "card": (480, 360),
+    "full": (1600, 1600),
+}
+QUALITY = 80
+
+if features.check("webp"):
+    OUTPUT_FORMAT, OUTPUT_EXTENSION = "WEBP", "webp"
+else:  # pragma: no cover - depends on the Pillow build
+    OUTPUT_FORMAT, OUTPUT_EXTENSION = "JPEG", "jpg"
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "OFFER_IMAGE_PIPELINE_WORKERS", 2),
+            thread_name_prefix="offer-images",
+        )
+    return _executor
+
+
+def schedule_derivatives(offer_id):
+    """Queues (re)rendering of an offer's derivatives once the transaction commits."""
+    if getattr(settings, "OFFER_IMAGE_PIPELINE_ASYNC", True):
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, offer_id))
+    else:
+        transaction.on_commit(lambda: render_derivatives(offer_id))
+
+
+def _run_in_worker(offer_id):
+    close_old_connections()
+    try:
+        render_derivatives(offer_id)
+    except Exception:
+        logger.exception("Rendering image derivatives for offer %s failed", offer_id)
+    finally:
+        close_old_connections()
+
+
+def render_derivatives(offer_id, force=False):
+    """
+    Brings the derivatives of one offer in line with its current image.
+    Returns the number of files written (0 if they were already current).
+    """
+    offer = Offer.objects.filter(pk=offer_id).only("id", "image").first()
+    if offer is None:
+        return 0
+
+    existing = {d.kind: d for d in OfferImageDerivative.objects.filter(offer_id=offer_id)}
+    source_name = offer.image.name if offer.image else ""
+
+    if not source_name:
+        _delete_derivatives(existing.values())
+        return 0
+
+    if not force and set(existing) == set(DERIVATIVE_SIZES) and all(
+        d.source_name == source_name for d in existing.values()
+    ):
+        return 0
+
+    with offer.image.open("rb") as fh:
+        with Image.open(fh) as original:
+            original.load()
+            image = _prepare(original)
+
+    stem = PurePosixPath(source_name).stem
+    replaced_files = []
+    written = 0
+    with transaction.atomic():
+        for kind, size in DERIVATIVE_SIZES.items():
+            content, width, height = _encode(image, size)
+            derivative = existing.get(kind) or OfferImageDerivative(offer_id=offer_id, kind=kind)
+            if derivative.file:
+                replaced_files.append((derivative.file.storage, derivative.file.name))
+            derivative.file.save(
+                f"{offer_id}-{stem}-{kind}.{OUTPUT_EXTENSION}", content, save=False
+            )
+            derivative.width, derivative.height = width, height
+            derivative.source_name = source_name
+            derivative.save()
+            written += 1
+
+    for storage, name in replaced_files:
+        storage.delete(name)
+    return written
+
+
+def _prepare(original):
+    """Applies EXIF orientation and converts to a mode the encoder accepts."""
+    image = ImageOps.exif_transpose(original)
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    if has_alpha and OUTPUT_FORMAT == "WEBP":
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def _encode(image, size):
+    """Returns (ContentFile, width, height) for one bounding box."""
+    resized = image.copy()
+    resized.thumbnail(size, Image.Resampling.LANCZOS)
+    # a fresh image carries no info dict → no EXIF / ICC / XMP is written
+    clean = Image.new(resized.mode, resized.size)
+    clean.paste(resized)
+
+    buffer = BytesIO()
+    clean.save(buffer, OUTPUT_FORMAT, quality=QUALITY, method=6 if OUTPUT_FORMAT == "WEBP" else 0)
+    return ContentFile(buffer.getvalue()), clean.width, clean.height
+
+
+def _delete_derivatives(derivatives):
+    # files are removed by the post_delete handler in offers_app.signals
+    for derivative in derivatives:
+        derivative.delete()
@@ -0,0 +1,129 @@
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django_filters.rest_framework import FilterSet, NumberFilter
+from rest_framework.test import APIRequestFactory
+
+from auth_app.models import CustomUser
+from core.bench import format_timing, measure, scratch_database
+from offers_app.api.views import OfferListCreateView
+from offers_app.models import Offer, OfferDetail
+
+
+class LegacyOfferFilter(FilterSet):
+    """The previous JOIN-based filter, kept here only as the baseline."""
+    min_price = NumberFilter(field_name="details__price", lookup_expr="gte")
+    max_delivery_time = NumberFilter(
+        field_name="details__delivery_time_in_days", lookup_expr="lte"
+    )
+
+    class Meta:
+        model = Offer
+        fields = ["user", "min_price", "max_delivery_time"]
+
+
+class LegacyOfferListView(OfferListCreateView):
+    """OfferListCreateView as it was: JOIN filters + DISTINCT."""
+    queryset = Offer.objects.all().distinct()
+    filterset_class = LegacyOfferFilter
+
+
+class Command(BaseCommand):
+    """
+    Compares filtered /api/offers/ requests with the old JOIN + DISTINCT
+    filters against the EXISTS-based ones on a scratch database.
+
+        python manage.py bench_offer_filters --offers 100000
+
+    The offer response cache is replaced by a dummy backend for the run,
+    so every request really filters instead of timing cache hits.
+    """
+
+    help = "Benchmark JOIN+DISTINCT vs EXISTS offer filtering."
+
+    QUERIES = [
+        {"min_price": "150"},
+        {"max_delivery_time": "3"},
+        {"min_price": "150", "max_delivery_time": "5", "ordering": "details__price"},
+        {"min_price": "150", "page": "200", "page_size": "20"},
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        uncached = override_settings(
+            CACHES={
+                **settings.CACHES,
+                "bench-uncached": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+            },
+            OFFER_RESPONSE_CACHE={"ALIAS": "bench-uncached"},
+        )
+        with scratch_database(), uncached:
+            self.seed(options["offers"], random.Random(options["seed"]))
+            factory = APIRequestFactory()
+            views = [
+                ("before", LegacyOfferListView.as_view()),
+                ("after", OfferListCreateView.as_view()),
+            ]
+
+            for params in self.QUERIES:
+                self.stdout.write(f"\nGET /api/offers/?{self.describe(params)}")
+                for label, view in views:
+                    timing = measure(
+                        lambda: self.request(factory, view, params),
+                        repeat=options["repeat"],
+                    )
+                    self.stdout.write(format_timing(f"  {label}", timing))
+
+    def request(self, factory, view, params):
+        response = view(factory.get("/api/offers/", params))
+        response.render()
+        assert response.status_code == 200, response.status_code
+        assert response["X-Cache"] == "MISS", response["X-Cache"]
+        return response
+
+    def describe(self, params):
+        return "&".join(f"{key}={value}" for key, value in params.items())
+
+    def seed(self, count, rng):
+        self.stdout.write(f"Seeding {count} offers x 3 tiers ...")
+        user = CustomUser.objects.create_user(
+            username="bench-business", password="bench", type="business"
+        )
+        batch = 5_000
+        for start in range(0, count, batch):
+            size = min(batch, count - start)
+            tiers = []
+            offers = []
+            for i in range(size):
+                prices = sorted(rng.randint(5, 500) for _ in range(3))
+                days = sorted((rng.randint(1, 30) for _ in range(3)), reverse=True)
+                offers.append(
+                    Offer(
+                        user=user,
+                        title=f"Offer {start + i}",
+                        description="Benchmark offer",
+                        min_price=Decimal(prices[0]),
+                        min_delivery_time=days[-1],
+                    )
+                )
+                tiers.append(list(zip(("basic", "standard", "premium"), prices, days)))
+
+            offers = Offer.objects.bulk_create(offers)
+            OfferDetail.objects.bulk_create(
+                OfferDetail(
+                    offer=offer,
+                    title=offer_type,
+                    price=Decimal(price),
+                    delivery_time_in_days=day,
+                    offer_type=offer_type,
+                )
+                for offer, offer_tiers in zip(offers, tiers)
+                for offer_type, price, day in offer_tiers
+            )
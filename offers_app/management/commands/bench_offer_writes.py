@@ -0,0 +1,119 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from core.bench import scratch_database
+from offers_app.api.serializers import OfferCreateSerializer
+from offers_app.api.views import OfferListCreateView
+from offers_app.models import Offer, OfferDetail
+
+
+class LegacyOfferCreateSerializer(OfferCreateSerializer):
+    """Previous write path: one INSERT per tier + an aggregate refresh."""
+
+    @transaction.atomic
+    def create(self, validated_data):
+        details_data = validated_data.pop("details")
+        offer = Offer.objects.create(user=self.context["request"].user, **validated_data)
+        for tier in details_data:
+            OfferDetail.objects.create(offer=offer, **tier)
+        offer.refresh_tier_summary()
+        return offer
+
+
+class Command(BaseCommand):
+    """
+    Measures offer-creation throughput (POST /api/offers/) with several
+    concurrent clients against a file-backed scratch database, for the
+    previous per-row tier inserts and the current bulk insert.
+
+        python manage.py bench_offer_writes --clients 8 --requests 200
+    """
+
+    help = "Concurrent offer-creation throughput, per-row vs bulk tier writes."
+
+    TIERS = [
+        {
+            "title": ot.title(),
+            "revisions": idx + 1,
+            "delivery_time_in_days": 7 - idx * 2,
+            "price": str(50 * (idx + 1)),
+            "features": ["Feature"],
+            "offer_type": ot,
+        }
+        for idx, ot in enumerate(("basic", "standard", "premium"))
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200, help="per client")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            with scratch_database(
+                Path(tmp) / "bench.sqlite3", options={"transaction_mode": "IMMEDIATE"}
+            ):
+                users = [
+                    CustomUser.objects.create_user(
+                        username=f"bench-biz-{i}", password="bench", type="business"
+                    )
+                    for i in range(options["clients"])
+                ]
+                for label, serializer_class in (
+                    ("per-row tiers (before)", LegacyOfferCreateSerializer),
+                    ("bulk tiers (after)", OfferCreateSerializer),
+                ):
+                    self.run(label, serializer_class, users, options["requests"])
+
+    def run(self, label, serializer_class, users, per_client):
+        original = OfferListCreateView.get_serializer_class
+
+        def get_serializer_class(view):
+            return serializer_class if view.request.method == "POST" else original(view)
+
+        OfferListCreateView.get_serializer_class = get_serializer_class
+        errors = []
+        try:
+            barrier = threading.Barrier(len(users) + 1)
+            threads = [
+                threading.Thread(
+                    target=self.client_loop, args=(user, per_client, barrier, errors)
+                )
+                for user in users
+            ]
+            for thread in threads:
+                thread.start()
+            barrier.wait()
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            OfferListCreateView.get_serializer_class = original
+
+        total = len(users) * per_client - len(errors)
+        self.stdout.write(
+            f"{label:<24} {len(users)} clients  {total} offers in {elapsed:6.2f} s  "
+            f"→ {total / elapsed:8.1f} offers/s  ({len(errors)} errors)"
+        )
+        for error in errors[:3]:
+            self.stdout.write(self.style.WARNING(f"  {error}"))
+
+    def client_loop(self, user, count, barrier, errors):
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = {"title": "Bench offer", "description": "-", "details": self.TIERS}
+        barrier.wait()
+        try:
+            for _ in range(count):
+                response = client.post("/api/offers/", payload, format="json")
+                if response.status_code != 201:
+                    errors.append(f"{response.status_code}: {response.content[:120]!r}")
+        finally:
+            connection.close()
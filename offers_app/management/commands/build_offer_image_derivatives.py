@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.imaging import render_derivatives
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Renders missing or outdated image derivatives synchronously – for the
+    initial backfill or to retry offers the background pipeline failed on.
+
+        python manage.py build_offer_image_derivatives
+        python manage.py build_offer_image_derivatives --offer 12 --force
+    """
+
+    help = "Render thumbnail / card / full derivatives of offer images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offer",
+            action="append",
+            type=int,
+            dest="offer_ids",
+            help="Only process the given offer id (may be repeated).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render even if the derivatives are current.",
+        )
+
+    def handle(self, *args, **options):
+        qs = Offer.objects.order_by("id")
+        if options["offer_ids"]:
+            qs = qs.filter(pk__in=options["offer_ids"])
+
+        rendered = failed = 0
+        for offer_id in qs.values_list("id", flat=True).iterator():
+            try:
+                if render_derivatives(offer_id, force=options["force"]):
+                    rendered += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Offer {offer_id}: {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered {rendered} offer(s), {failed} failure(s).")
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Min
+
+from core.schema import applied_apps
+from offers_app.dedupe import duplicate_tiers
+
+
+class Command(BaseCommand):
+    """
+    Removes duplicate tiers per (offer, offer_type) so migration offers_app
+    0005 can add its unique constraint. Keeps the oldest tier of each pair,
+    lists every tier it removes and refreshes the stored summary of the
+    touched offers.
+
+        python manage.py dedupe_offer_tiers [--dry-run]
+
+    Works on the schema as currently migrated, so it can run before
+    `migrate`.
+    """
+
+    help = "Remove duplicate offer tiers that block the unique_offer_tier_type constraint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        apps = applied_apps(connection)
+        Offer = apps.get_model("offers_app", "Offer")
+        OfferDetail = apps.get_model("offers_app", "OfferDetail")
+
+        with transaction.atomic():
+            groups = duplicate_tiers(OfferDetail)
+            for (offer_id, offer_type), kept, dropped in groups:
+                self.stdout.write(
+                    f"offer {offer_id} / {offer_type}: keeping tier {kept}, "
+                    f"removing {', '.join(map(str, dropped))}"
+                )
+            removed = [pk for _key, _kept, dropped in groups for pk in dropped]
+            if removed and not dry_run:
+                OfferDetail.objects.filter(pk__in=removed).delete()
+                for offer_id in {offer_id for (offer_id, _type), _kept, _dropped in groups}:
+                    summary = OfferDetail.objects.filter(offer_id=offer_id).aggregate(
+                        min_price=Min("price"), min_delivery_time=Min("delivery_time_in_days")
+                    )
+                    Offer.objects.filter(pk=offer_id).update(
+                        min_price=summary["min_price"] or 0,
+                        min_delivery_time=summary["min_delivery_time"] or 0,
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {len(removed)} duplicate tier(s) across {len(groups)} pair(s)"
+                + (" (dry run)." if dry_run else ".")
+            )
+        )
@@ -0,0 +1,65 @@
+import os
+import re
+
+from django.core.management.base import BaseCommand
+
+from offers_app.models import ImageBlob, Offer
+from offers_app.storage import offer_image_storage
+
+BLOB_NAME = re.compile(r"^[0-9a-f]{64}(\.[A-Za-z0-9]+)?$")
+
+
+class Command(BaseCommand):
+    """
+    Repairs the content-addressed offer image storage:
+      * recounts every blob's references from Offer.image,
+      * deletes blobs nobody references any more,
+      * removes blob files that have no ImageBlob row (e.g. left behind by
+        a rolled-back upload) and stale temp files.
+
+        python manage.py gc_image_blobs [--dry-run]
+    """
+
+    help = "Recount and garbage-collect deduplicated offer image blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        storage = offer_image_storage()
+
+        recounted = removed = orphans = 0
+        for blob in ImageBlob.objects.iterator():
+            refs = Offer.objects.filter(image=blob.name).count()
+            if refs == blob.ref_count and refs > 0:
+                continue
+            recounted += 1
+            if dry_run:
+                continue
+            if refs == 0:
+                blob.delete()
+                storage.delete_file(blob.name)
+                removed += 1
+            else:
+                ImageBlob.objects.filter(pk=blob.pk).update(ref_count=refs)
+
+        known = set(ImageBlob.objects.values_list("name", flat=True))
+        root = storage.path("offer_images")
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                full = os.path.join(dirpath, filename)
+                name = os.path.relpath(full, storage.location).replace(os.sep, "/")
+                is_temp = filename.startswith(".upload-")
+                if (is_temp or BLOB_NAME.match(filename)) and name not in known:
+                    orphans += 1
+                    if not dry_run:
+                        os.unlink(full)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recounted {recounted} blob(s), removed {removed} unreferenced "
+                f"blob(s), {orphans} orphaned file(s)"
+                + (" (dry run)." if dry_run else ".")
+            )
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.caching import is_per_process
+from offers_app.api.caching import cache_settings, current_generation, get_counter
+
+
+class Command(BaseCommand):
+    """
+    Prints hit / miss counters of the offer response cache.
+
+        python manage.py offer_cache_stats [--reset]
+    """
+
+    help = "Show (or reset) offer response cache statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true")
+
+    def handle(self, *args, **options):
+        alias = cache_settings()["ALIAS"]
+        if is_per_process(alias):
+            self.stderr.write(self.style.WARNING(
+                f"OFFER_RESPONSE_CACHE uses the per-process cache '{alias}' – this command "
+                "only sees its own generation and counters, not those of the server workers."
+            ))
+        counter = get_counter()
+        stats = counter.snapshot()
+        self.stdout.write(
+            f"generation {current_generation()}  hits {stats['hit']}  "
+            f"misses {stats['miss']}  hit ratio {stats['hit_ratio']:.2%}"
+        )
+        if options["reset"]:
+            counter.reset()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from offers_app.search import install_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    (Re)creates the FTS5 offer search index and its triggers, then
+    re-tokenises every offer.
+
+        python manage.py rebuild_offer_search_index
+    """
+
+    help = "Rebuild the full-text search index for offers."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The offer search index requires SQLite (FTS5).")
+
+        with transaction.atomic():
+            install_search_index(connection)
+            rebuild_search_index(connection)
+
+        self.stdout.write(self.style.SUCCESS("Offer search index rebuilt."))
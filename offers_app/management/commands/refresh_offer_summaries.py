@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Backfills / repairs Offer.min_price and Offer.min_delivery_time from the
+    tiers. Runs as one UPDATE with correlated subqueries, so it is safe to
+    re-run at any time.
+
+        python manage.py refresh_offer_summaries
+        python manage.py refresh_offer_summaries --offer 12 --offer 15
+    """
+
+    help = "Recompute the stored min_price / min_delivery_time of offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offer",
+            action="append",
+            type=int,
+            dest="offer_ids",
+            help="Only refresh the given offer id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        tiers = OfferDetail.objects.filter(offer=OuterRef("pk")).order_by()
+
+        qs = Offer.objects.all()
+        if options["offer_ids"]:
+            qs = qs.filter(pk__in=options["offer_ids"])
+
+        with transaction.atomic():
+            updated = qs.update(
+                min_price=Coalesce(
+                    Subquery(tiers.order_by("price").values("price")[:1]),
+                    Value(0),
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                ),
+                min_delivery_time=Coalesce(
+                    Subquery(
+                        tiers.order_by("delivery_time_in_days").values(
+                            "delivery_time_in_days"
+                        )[:1]
+                    ),
+                    Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {updated} offer(s)."))
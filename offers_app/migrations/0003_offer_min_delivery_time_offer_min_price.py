@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:51
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def backfill_tier_summary(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    for offer in Offer.objects.all().iterator():
+        summary = offer.details.aggregate(
+            min_price=Min('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+        )
+        Offer.objects.filter(pk=offer.pk).update(
+            min_price=summary['min_price'] or 0,
+            min_delivery_time=summary['min_delivery_time'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_remove_offerdetail_delivery_time_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_tier_summary, migrations.RunPython.noop),
+    ]
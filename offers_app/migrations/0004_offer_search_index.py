@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# The DDL is frozen here on purpose: offers_app.search may change later,
+# this migration must keep creating the index as it was at this point.
+OFFER_TABLE = "offers_app_offer"
+SEARCH_TABLE = "offers_app_offer_fts"
+
+CREATE_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title,
+        description,
+        content='{OFFER_TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+CREATE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF title, description
+    ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CREATE_TABLE)
+        for trigger in CREATE_TRIGGERS:
+            cursor.execute(trigger)
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for suffix in ("ai", "ad", "au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_min_delivery_time_offer_min_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:57
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+
+from offers_app.dedupe import duplicate_tiers
+
+
+def refuse_duplicate_tiers(apps, schema_editor):
+    """
+    The constraint cannot be added while duplicates exist. Removing them is
+    left to the operator (dedupe_offer_tiers lists what goes) instead of
+    deleting tiers silently here.
+    """
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    groups = duplicate_tiers(OfferDetail)
+    if groups:
+        extra = sum(len(dropped) for _key, _kept, dropped in groups)
+        raise CommandError(
+            f"{extra} duplicate tier(s) across {len(groups)} offer/tier type "
+            "pair(s) block unique_offer_tier_type. Review them with "
+            "`python manage.py dedupe_offer_tiers --dry-run`, remove them with "
+            "`python manage.py dedupe_offer_tiers`, then migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(refuse_duplicate_tiers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='offerdetail',
+            constraint=models.UniqueConstraint(fields=('offer', 'offer_type'), name='unique_offer_tier_type'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offerdetail_unique_offer_tier_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferImageDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('thumbnail', 'Thumbnail'), ('card', 'Card'), ('full', 'Full')], max_length=20)),
+                ('file', models.FileField(max_length=255, upload_to='offer_images/derivatives/')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('source_name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_derivatives', to='offers_app.offer')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('offer', 'kind'), name='unique_offer_image_derivative')],
+            },
+        ),
+    ]
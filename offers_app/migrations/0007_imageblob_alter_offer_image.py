@@ -0,0 +1,68 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:01
+
+import offers_app.storage
+from django.db import migrations, models
+
+SEARCH_TABLE = "offers_app_offer_fts"
+OFFER_TABLE = "offers_app_offer"
+
+SEARCH_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF title, description
+    ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    # Altering Offer.image rebuilds the offer table on SQLite, which drops
+    # the full-text index triggers.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for trigger in SEARCH_TRIGGERS:
+            cursor.execute(trigger)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0006_offerimagederivative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='offer',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=offers_app.storage.offer_image_storage, upload_to='offer_images/'),
+        ),
+        migrations.RunPython(reinstall_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_imageblob_alter_offer_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+        ),
+    ]
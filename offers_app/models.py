@@ -1,5 +1,47 @@
 from django.db import models
+from django.db.models import Min, Prefetch
+from django.utils import timezone
 from auth_app.models import CustomUser
+from .storage import offer_image_storage
+
+
+class OfferQuerySet(models.QuerySet):
+    """
+    Query helpers for Offer.
+    """
+
+    def for_public_listing(self):
+        """
+        Read path for OfferSerializer: creator joined in, tiers prefetched,
+        and only the columns the serializer emits. Costs a constant number
+        of queries no matter how many offers are fetched.
+        """
+        return self.select_related("user").only(
+            "id",
+            "user",
+            "title",
+            "image",
+            "description",
+            "created_at",
+            "updated_at",
+            "min_price",
+            "min_delivery_time",
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+        ).prefetch_related(
+            Prefetch(
+                "details",
+                queryset=OfferDetail.objects.only("id", "offer_id").order_by("id"),
+            ),
+            Prefetch(
+                "image_derivatives",
+                queryset=OfferImageDerivative.objects.only(
+                    "id", "offer_id", "kind", "file", "width", "height", "source_name"
+                ),
+            ),
+        )
+
 
 class Offer(models.Model):
     """
@@ -14,16 +56,81 @@ class Offer(models.Model):
     title = models.CharField(max_length=255)  # Title of the offer
     image = models.ImageField(
         upload_to='offer_images/',
+        storage=offer_image_storage,
         null=True,
         blank=True
-    )  # Optional image representing the offer
+    )  # Optional image representing the offer (deduplicated by content)
     description = models.TextField()  # Description of the offer
     created_at = models.DateTimeField(auto_now_add=True)  # Auto-set on creation
     updated_at = models.DateTimeField(auto_now=True)      # Auto-updated on changes
 
+    # Denormalised tier summary – kept in sync whenever the tiers change,
+    # so list views and ordering never have to aggregate over OfferDetail.
+    min_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        db_index=True
+    )  # Cheapest tier price
+    min_delivery_time = models.IntegerField(
+        default=0,
+        db_index=True
+    )  # Fastest tier delivery time (days)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Default list order and keyset pagination key: (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+        ]
+
     def __str__(self):
         return self.title  # String representation of the offer
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image so a replaced blob can be released on save
+        instance._loaded_image_name = instance.__dict__.get("image") or ""
+        return instance
+
+    def set_tier_summary(self, tiers):
+        """
+        Sets min_price / min_delivery_time from tiers that are already in
+        memory (OfferDetail objects or validated tier dicts). Nothing is
+        written – the values go out with the next save().
+        """
+        tiers = list(tiers)
+        self.min_price = min((_tier_value(t, "price") for t in tiers), default=0)
+        self.min_delivery_time = min(
+            (_tier_value(t, "delivery_time_in_days") for t in tiers), default=0
+        )
+
+    def refresh_tier_summary(self):
+        """
+        Recomputes min_price / min_delivery_time from the current tiers and
+        writes them with a single UPDATE (touching updated_at, since the
+        public representation changed). Call inside the transaction that
+        changed the tiers.
+        """
+        summary = self.details.aggregate(
+            min_price=Min("price"),
+            min_delivery_time=Min("delivery_time_in_days"),
+        )
+        self.min_price = summary["min_price"] or 0
+        self.min_delivery_time = summary["min_delivery_time"] or 0
+        self.updated_at = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(
+            min_price=self.min_price,
+            min_delivery_time=self.min_delivery_time,
+            updated_at=self.updated_at,
+        )
+
+
+def _tier_value(tier, field):
+    return tier[field] if isinstance(tier, dict) else getattr(tier, field)
+
 
 class OfferDetail(models.Model):
     """
@@ -51,5 +158,58 @@ class OfferDetail(models.Model):
         choices=OFFER_TYPE_CHOICES
     )  # Type of offer: basic/standard/premium
 
+    class Meta:
+        constraints = [
+            # One tier per type and offer – also the index behind (offer, offer_type) lookups
+            models.UniqueConstraint(fields=['offer', 'offer_type'], name='unique_offer_tier_type'),
+        ]
+
     def __str__(self):
         return f"{self.offer.title} - {self.title}"  # String representation
+
+
+class ImageBlob(models.Model):
+    """
+    One physical file in the content-addressed image storage
+    (offers_app.storage) and the number of fields referencing it.
+    """
+    name = models.CharField(max_length=255, unique=True)  # Storage path of the blob
+    sha256 = models.CharField(max_length=64)  # Content digest
+    size = models.PositiveBigIntegerField()  # Size in bytes
+    ref_count = models.IntegerField(default=0)  # Number of stored references
+    created_at = models.DateTimeField(auto_now_add=True)  # First upload of this content
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class OfferImageDerivative(models.Model):
+    """
+    A resized, re-encoded copy of Offer.image (thumbnail / card / full),
+    produced off the request path by offers_app.imaging.
+    """
+    KIND_CHOICES = [
+        ('thumbnail', 'Thumbnail'),
+        ('card', 'Card'),
+        ('full', 'Full'),
+    ]
+
+    offer = models.ForeignKey(
+        Offer,
+        on_delete=models.CASCADE,
+        related_name='image_derivatives'
+    )  # Offer whose image was rendered
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)  # Target size class
+    file = models.FileField(upload_to='offer_images/derivatives/', max_length=255)  # Encoded image
+    width = models.PositiveIntegerField()   # Pixel width of the stored file
+    height = models.PositiveIntegerField()  # Pixel height of the stored file
+    source_name = models.CharField(max_length=255)  # Offer.image name it was rendered from
+    created_at = models.DateTimeField(auto_now_add=True)  # Render time
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['offer', 'kind'], name='unique_offer_image_derivative'),
+        ]
+
+    def __str__(self):
+        return f"{self.offer_id} - {self.kind} ({self.width}x{self.height})"
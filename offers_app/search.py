@@ -0,0 +1,149 @@
+"""
+SQLite FTS5 full-text index over Offer.title / Offer.description.
+
+The index is an external-content FTS5 table (it stores only the token
+index, the text stays in offers_app_offer) kept in sync by triggers on
+the offer table. Triggers are dropped whenever a migration rebuilds the
+offer table on SQLite, so ``install_search_index`` is idempotent and is
+re-run after every ``migrate`` (see offers_app.signals).
+"""
+
+from django.db import connection as default_connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+OFFER_TABLE = "offers_app_offer"
+SEARCH_TABLE = "offers_app_offer_fts"
+
+# bm25() column weights – a title hit outranks a description hit
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF title, description
+    ON {OFFER_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+# alias -> bool, so the per-request check does not hit sqlite_master
+_supported = {}
+
+
+def is_supported(connection=None):
+    """True if the database is SQLite and the FTS5 index table exists."""
+    connection = connection or default_connection
+    if connection.alias not in _supported:
+        _supported[connection.alias] = (
+            connection.vendor == "sqlite"
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _supported[connection.alias]
+
+
+def install_search_index(connection=None):
+    """
+    Creates the FTS5 table and its sync triggers if they are missing.
+    A freshly created table is filled from the existing offers.
+    Returns False when the backend is not SQLite (nothing to do).
+    """
+    connection = connection or default_connection
+    if connection.vendor != "sqlite":
+        return False
+
+    created = SEARCH_TABLE not in connection.introspection.table_names()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+                title,
+                description,
+                content='{OFFER_TABLE}',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        for trigger in _TRIGGERS:
+            cursor.execute(trigger)
+    _supported.pop(connection.alias, None)
+    if created:
+        rebuild_search_index(connection)
+    return True
+
+
+def drop_search_index(connection=None):
+    """Removes the FTS5 table and triggers (migration rollback)."""
+    connection = connection or default_connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for suffix in ("ai", "ad", "au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    _supported.pop(connection.alias, None)
+
+
+def rebuild_search_index(connection=None):
+    """Re-tokenises every offer (FTS5 'rebuild' command)."""
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def build_match_query(terms):
+    """
+    Turns free-text search terms into an FTS5 MATCH expression.
+    Every term is quoted (so user input can never inject FTS syntax) and
+    prefix-matched, all terms must match: 'log des' → "log"* "des"*
+    """
+    phrases = []
+    for term in terms:
+        term = term.strip()
+        if term:
+            phrases.append('"{}"*'.format(term.replace('"', '""')))
+    return " ".join(phrases)
+
+
+def search_offers(queryset, terms):
+    """
+    Restricts an Offer queryset to full-text matches and annotates
+    ``search_rank`` (lower is better, as returned by bm25()).
+
+    The MATCH runs once, as an ``id IN (SELECT rowid ...)`` filter; the rank
+    is a correlated subquery per matched offer that FTS5 answers by rowid.
+    """
+    match = build_match_query(terms)
+    if not match:
+        return queryset
+    offer_id = f'"{OFFER_TABLE}"."id"'
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", (match,))
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT bm25({SEARCH_TABLE}, %s, %s) FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND {SEARCH_TABLE}.rowid = {offer_id}",
+            (TITLE_WEIGHT, DESCRIPTION_WEIGHT, match),
+            output_field=FloatField(),
+        )
+    )
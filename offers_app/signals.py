@@ -0,0 +1,131 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+
+from .api.caching import bump_generation
+from .imaging import schedule_derivatives
+from .models import Offer, OfferDetail, OfferImageDerivative
+from .search import install_search_index
+from .suggest import title_index
+
+
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_after_tier_delete(sender, instance, origin=None, **kwargs):
+    """
+    Keeps Offer.min_price / min_delivery_time correct when a tier is removed
+    on its own (admin, shell, ...). Skipped when the whole offer is being
+    deleted – the cascade would only update a row that is about to vanish.
+    """
+    if isinstance(origin, Offer) or (
+        isinstance(origin, QuerySet) and origin.model is Offer
+    ):
+        return
+    Offer(pk=instance.offer_id).refresh_tier_summary()
+
+
+@receiver(post_migrate)
+def ensure_offer_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    SQLite drops triggers when a migration rebuilds the offer table, so the
+    full-text index triggers are (re)installed after every migrate run.
+    """
+    if sender.name != "offers_app":
+        return
+    install_search_index(connections[using])
+
+
+@receiver(post_save, sender=Offer)
+def index_offer_title(sender, instance, **kwargs):
+    """Updates the autocomplete index once the offer is committed."""
+    offer_id, title = instance.pk, instance.title
+    transaction.on_commit(lambda: title_index.upsert(offer_id, title))
+
+
+@receiver(post_delete, sender=Offer)
+def unindex_offer_title(sender, instance, **kwargs):
+    offer_id = instance.pk
+    transaction.on_commit(lambda: title_index.remove(offer_id))
+
+
+@receiver(post_save, sender=Offer)
+def render_offer_image(sender, instance, created, **kwargs):
+    """
+    Queues the image derivative pipeline after the offer is committed.
+    The worker itself skips offers whose derivatives are already current;
+    offers that neither have nor had an image are not queued at all.
+    """
+    if not instance.image and not getattr(instance, "_loaded_image_name", ""):
+        return
+    schedule_derivatives(instance.pk)
+
+
+@receiver(post_delete, sender=OfferImageDerivative)
+def delete_derivative_file(sender, instance, **kwargs):
+    """Removes the rendered file once its row is gone (e.g. offer deleted)."""
+    if instance.file:
+        storage, name = instance.file.storage, instance.file.name
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+@receiver(pre_save, sender=Offer)
+def note_image_upload(sender, instance, **kwargs):
+    """Remembers whether this save stores a new upload (which adds a reference)."""
+    instance._image_uploaded = bool(instance.image) and not instance.image._committed
+
+
+@receiver(post_save, sender=Offer)
+def release_replaced_image(sender, instance, **kwargs):
+    """
+    Drops the reference to a replaced image blob once the save commits.
+    Re-uploading identical content maps to the same blob but still added
+    a reference, so the old one is released then as well.
+    """
+    old_name = getattr(instance, "_loaded_image_name", "")
+    new_name = instance.image.name or ""
+    uploaded = getattr(instance, "_image_uploaded", False)
+    instance._loaded_image_name = new_name
+    instance._image_uploaded = False
+    if old_name and (old_name != new_name or uploaded):
+        storage = instance.image.storage
+        transaction.on_commit(lambda: storage.delete(old_name))
+
+
+@receiver(post_delete, sender=Offer)
+def release_deleted_image(sender, instance, **kwargs):
+    """Drops the offer's reference to its image blob once the delete commits."""
+    if instance.image:
+        storage, name = instance.image.storage, instance.image.name
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+@receiver(post_save, sender=OfferImageDerivative)
+@receiver(post_delete, sender=OfferImageDerivative)
+def invalidate_offer_responses(sender, **kwargs):
+    """Any offer-side change invalidates the cached offer responses on commit."""
+    transaction.on_commit(bump_generation)
+
+
+# CustomUser fields that appear in OfferSerializer.user_details
+PUBLIC_NAME_FIELDS = ("username", "first_name", "last_name")
+
+
+@receiver(pre_save, sender=CustomUser)
+def invalidate_offer_responses_on_name_change(sender, instance, update_fields=None, **kwargs):
+    """A creator's renamed public profile invalidates cached offer responses."""
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(PUBLIC_NAME_FIELDS):
+        return
+    previous = (
+        CustomUser.objects.filter(pk=instance.pk).values_list(*PUBLIC_NAME_FIELDS).first()
+    )
+    current = tuple(getattr(instance, field) for field in PUBLIC_NAME_FIELDS)
+    if previous is not None and previous != current:
+        transaction.on_commit(bump_generation)
@@ -0,0 +1,115 @@
+"""
+Content-addressed, deduplicated file storage for uploaded offer images.
+
+Every upload is streamed chunk by chunk into a temporary file next to its
+final location while being hashed (SHA-256) – the upload is never held in
+memory as a whole. The blob is then stored once under its digest:
+
+    offer_images/3f/3f2a…9c.png
+
+An ImageBlob row reference-counts each blob. Saving a file adds a
+reference, ``delete()`` releases one, and the file is only removed when
+the last reference is gone. Files that were stored before this backend
+existed (no ImageBlob row) are never deleted by it.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import PurePosixPath
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct upload exactly once."""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save(); identical
+        # content must map to the identical name, so no suffixing here.
+        return name
+
+    def _save(self, name, content):
+        from offers_app.models import ImageBlob
+
+        directory = PurePosixPath(name).parent
+        extension = PurePosixPath(name).suffix.lower()
+        staging_dir = self.path(str(directory))
+        os.makedirs(staging_dir, exist_ok=True)
+
+        digest, size, temp_path = self._stream_to_temp(content, staging_dir)
+        blob_name = str(directory / digest[:2] / f"{digest}{extension}")
+        blob_path = self.path(blob_name)
+
+        try:
+            with transaction.atomic():
+                blob, created = ImageBlob.objects.get_or_create(
+                    name=blob_name,
+                    defaults={"sha256": digest, "size": size, "ref_count": 1},
+                )
+                if not created:
+                    ImageBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+                if os.path.exists(blob_path):
+                    os.unlink(temp_path)
+                else:
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.replace(temp_path, blob_path)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(blob_path, self.file_permissions_mode)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+        return blob_name
+
+    def _stream_to_temp(self, content, directory):
+        """Copies ``content`` into a temp file while hashing it."""
+        hasher = hashlib.sha256()
+        size = 0
+        if hasattr(content, "seek") and content.seekable():
+            content.seek(0)
+        with tempfile.NamedTemporaryFile(
+            dir=directory, prefix=".upload-", delete=False
+        ) as temp:
+            for chunk in content.chunks(CHUNK_SIZE):
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                hasher.update(chunk)
+                temp.write(chunk)
+                size += len(chunk)
+        return hasher.hexdigest(), size, temp.name
+
+    def delete(self, name):
+        """
+        Releases one reference to ``name``; the file is removed together with
+        the last reference. Unknown (pre-existing) files are left alone.
+        """
+        from offers_app.models import ImageBlob
+
+        if not name:
+            return
+        with transaction.atomic():
+            released = ImageBlob.objects.filter(name=name).update(
+                ref_count=F("ref_count") - 1
+            )
+            if not released:
+                return
+            deleted, _ = ImageBlob.objects.filter(name=name, ref_count__lte=0).delete()
+            if deleted:
+                self.delete_file(name)
+
+    def delete_file(self, name):
+        """Removes the physical file, bypassing reference counting."""
+        super().delete(name)
+
+
+def offer_image_storage():
+    """Storage used by Offer.image (callable, so migrations stay stable)."""
+    return ContentAddressedStorage()
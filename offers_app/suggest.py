@@ -0,0 +1,150 @@
+"""
+In-process prefix index over offer titles for the autocomplete endpoint.
+
+Two sorted arrays are searched with bisect:
+  * full normalised titles  → matches at the start of a title
+  * every later word suffix → matches at the start of any other word
+so "des" finds both "Design logos" and "Logo design". The index is built
+lazily from the database on first use and then updated incrementally
+from Offer save/delete signals (see offers_app.signals). Each worker
+process holds its own copy, so it is rebuilt after
+OFFER_SUGGEST_INDEX_MAX_AGE seconds to pick up writes from other workers.
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+DEFAULT_MAX_AGE = 300  # seconds
+
+
+def normalize(text):
+    """Case- and accent-insensitive form used for keys and queries."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+def _word_suffixes(key):
+    """Suffixes of ``key`` starting at its 2nd, 3rd, ... word."""
+    suffixes = []
+    for idx in range(1, len(key)):
+        if key[idx - 1].isspace() and not key[idx].isspace():
+            suffixes.append(key[idx:])
+    return suffixes
+
+
+class TitlePrefixIndex:
+    """Thread-safe sorted-array prefix index: offer id → title."""
+
+    def __init__(self, max_age=None):
+        self._lock = threading.RLock()
+        self._max_age = max_age
+        self.reset()
+
+    def reset(self):
+        """Drops all entries; the next lookup rebuilds from the database."""
+        with self._lock:
+            self._titles = []   # (normalised title, offer id)
+            self._words = []    # (normalised word suffix, offer id)
+            self._by_id = {}    # offer id -> original title
+            self._built_at = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def _is_stale(self):
+        max_age = self._max_age
+        if max_age is None:
+            max_age = getattr(settings, "OFFER_SUGGEST_INDEX_MAX_AGE", DEFAULT_MAX_AGE)
+        return max_age is not None and time.monotonic() - self._built_at > max_age
+
+    def build(self, rows):
+        """Replaces the index content with ``rows`` of (offer id, title)."""
+        titles, words, by_id = [], [], {}
+        for offer_id, title in rows:
+            key = normalize(title)
+            by_id[offer_id] = title
+            titles.append((key, offer_id))
+            words.extend((suffix, offer_id) for suffix in _word_suffixes(key))
+        titles.sort()
+        words.sort()
+        with self._lock:
+            self._titles, self._words, self._by_id = titles, words, by_id
+            self._built_at = time.monotonic()
+
+    def ensure_built(self):
+        """Loads the index from the database on first use / when stale."""
+        if self.is_built and not self._is_stale():
+            return
+        with self._lock:
+            if self.is_built and not self._is_stale():
+                return
+            from offers_app.models import Offer
+
+            self.build(Offer.objects.values_list("id", "title").iterator())
+
+    def upsert(self, offer_id, title):
+        """Adds an offer or replaces its title. No-op before the first build."""
+        with self._lock:
+            if not self.is_built:
+                return
+            if self._by_id.get(offer_id) == title:
+                return
+            self._remove_locked(offer_id)
+            key = normalize(title)
+            self._by_id[offer_id] = title
+            insort(self._titles, (key, offer_id))
+            for suffix in _word_suffixes(key):
+                insort(self._words, (suffix, offer_id))
+
+    def remove(self, offer_id):
+        with self._lock:
+            if self.is_built:
+                self._remove_locked(offer_id)
+
+    def _remove_locked(self, offer_id):
+        title = self._by_id.pop(offer_id, None)
+        if title is None:
+            return
+        key = normalize(title)
+        self._discard(self._titles, (key, offer_id))
+        for suffix in _word_suffixes(key):
+            self._discard(self._words, (suffix, offer_id))
+
+    @staticmethod
+    def _discard(entries, entry):
+        idx = bisect_left(entries, entry)
+        if idx < len(entries) and entries[idx] == entry:
+            del entries[idx]
+
+    def suggest(self, query, limit=10):
+        """
+        Up to ``limit`` (offer id, title) pairs whose title – or one of its
+        words – starts with ``query``. Title-start matches come first.
+        """
+        prefix = normalize(query)
+        if not prefix or limit <= 0:
+            return []
+
+        self.ensure_built()
+        results, seen = [], set()
+        with self._lock:
+            for entries in (self._titles, self._words):
+                idx = bisect_left(entries, (prefix,))
+                while idx < len(entries) and len(results) < limit:
+                    key, offer_id = entries[idx]
+                    if not key.startswith(prefix):
+                        break
+                    if offer_id not in seen:
+                        seen.add(offer_id)
+                        results.append((offer_id, self._by_id[offer_id]))
+                    idx += 1
+        return results
+
+
+# the per-process index used by the API and kept current by signals
+title_index = TitlePrefixIndex()
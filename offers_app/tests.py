@@ -1,3 +1,650 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib import admin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from core.schema import applied_apps
+from offers_app import checks, search
+from offers_app.admin import OfferAdmin, OfferDetailAdmin
+from offers_app.api import caching as response_cache
+from offers_app.imaging import DERIVATIVE_SIZES, OUTPUT_FORMAT, render_derivatives
+from offers_app.models import ImageBlob, Offer, OfferDetail
+from offers_app.suggest import title_index
+
+
+class OfferReadQueryBudgetTests(TestCase):
+    """
+    The public offer read path must cost a fixed number of queries,
+    independent of how many offers / tiers end up on the page.
+    """
+
+    OFFER_COUNT = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business",
+            first_name="Ada", last_name="Lovelace",
+        )
+        offers = Offer.objects.bulk_create(
+            Offer(
+                user=cls.business,
+                title=f"Offer {i}",
+                description="Description",
+                min_price=Decimal("10.00"),
+                min_delivery_time=3,
+            )
+            for i in range(cls.OFFER_COUNT)
+        )
+        OfferDetail.objects.bulk_create(
+            OfferDetail(
+                offer=offer,
+                title=offer_type,
+                price=Decimal("10.00") * (idx + 1),
+                delivery_time_in_days=3 + idx,
+                offer_type=offer_type,
+            )
+            for offer in offers
+            for idx, offer_type in enumerate(("basic", "standard", "premium"))
+        )
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.client = APIClient()
+
+    def test_list_query_count_is_constant(self):
+        # COUNT for the paginator + offers/users + prefetched tiers + derivatives
+        for page_size in (1, 50, 500):
+            with self.subTest(page_size=page_size):
+                with self.assertNumQueries(4):
+                    response = self.client.get(
+                        "/api/offers/", {"page_size": page_size}
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["X-Cache"], "MISS")
+                results = response.data["results"]
+                self.assertEqual(len(results), page_size)
+                self.assertEqual(len(results[0]["details"]), 3)
+                self.assertEqual(results[0]["user_details"]["first_name"], "Ada")
+
+    def test_detail_query_count_is_constant(self):
+        self.client.force_authenticate(self.business)
+        offer = Offer.objects.first()
+        # validators + offer/user + prefetched tiers + derivatives
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/offers/{offer.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["details"]), 3)
+
+        # a revalidation only costs the narrow validator query
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/api/offers/{offer.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+
+
+class OfferWriteQueryBudgetTests(TestCase):
+    """Offer create / tier updates cost a fixed number of statements."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+
+    def tier(self, offer_type, price, days):
+        return {
+            "title": offer_type.title(), "revisions": 1, "delivery_time_in_days": days,
+            "price": price, "features": ["Logo"], "offer_type": offer_type,
+        }
+
+    def create_offer(self):
+        return self.client.post(
+            "/api/offers/",
+            {
+                "title": "Logo", "description": "-",
+                "details": [
+                    self.tier("basic", "100.00", 7),
+                    self.tier("standard", "200.00", 5),
+                    self.tier("premium", "300.00", 3),
+                ],
+            },
+            format="json",
+        )
+
+    def stored_tiers(self, offer_id):
+        return {
+            tier.offer_type: (tier.price, tier.delivery_time_in_days)
+            for tier in OfferDetail.objects.filter(offer_id=offer_id)
+        }
+
+    def summary(self, offer_id):
+        offer = Offer.objects.get(pk=offer_id)
+        return offer.min_price, offer.min_delivery_time
+
+    def test_create_query_count(self):
+        # savepoint pair + INSERT offer + bulk INSERT tiers + tiers for the response
+        with self.assertNumQueries(5):
+            response = self.create_offer()
+        self.assertEqual(response.status_code, 201)
+        offer_id = response.data["id"]
+        self.assertEqual(self.stored_tiers(offer_id), {
+            "basic": (Decimal("100.00"), 7),
+            "standard": (Decimal("200.00"), 5),
+            "premium": (Decimal("300.00"), 3),
+        })
+        self.assertEqual(self.summary(offer_id), (Decimal("100.00"), 3))
+
+    def test_patch_query_count_does_not_grow_with_tiers(self):
+        offer_id = self.create_offer().data["id"]
+        patches = [
+            [self.tier("premium", "50.00", 1)],
+            [
+                self.tier("basic", "60.00", 9),
+                self.tier("standard", "70.00", 8),
+                self.tier("premium", "80.00", 6),
+            ],
+        ]
+        expected = [
+            ({"basic": (Decimal("100.00"), 7), "standard": (Decimal("200.00"), 5),
+              "premium": (Decimal("50.00"), 1)}, (Decimal("50.00"), 1)),
+            ({"basic": (Decimal("60.00"), 9), "standard": (Decimal("70.00"), 8),
+              "premium": (Decimal("80.00"), 6)}, (Decimal("60.00"), 6)),
+        ]
+        for details, (tiers, summary) in zip(patches, expected):
+            with self.subTest(tiers=len(details)):
+                # savepoints (2 pairs) + validators (before and after) + offer
+                # + tiers + one bulk UPDATE + offer UPDATE + tiers for the response
+                with self.assertNumQueries(11):
+                    response = self.client.patch(
+                        f"/api/offers/{offer_id}/", {"details": details}, format="json"
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.stored_tiers(offer_id), tiers)
+                self.assertEqual(self.summary(offer_id), summary)
+
+
+class OfferTierSummaryTests(TestCase):
+    """Offer.min_price / min_delivery_time follow tier writes outside the API too."""
+
+    def setUp(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business", is_staff=True, is_superuser=True
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="-")
+        self.tiers = OfferDetail.objects.bulk_create(
+            OfferDetail(
+                offer=self.offer, title=offer_type, price=Decimal(price),
+                delivery_time_in_days=days, offer_type=offer_type,
+            )
+            for offer_type, price, days in (("basic", 10, 9), ("standard", 20, 5), ("premium", 30, 2))
+        )
+        self.offer.refresh_tier_summary()
+        self.request = RequestFactory().post("/admin/")
+        self.request.user = self.business
+
+    def summary(self):
+        offer = Offer.objects.get(pk=self.offer.pk)
+        return offer.min_price, offer.min_delivery_time
+
+    def test_refresh_reads_the_tiers(self):
+        self.assertEqual(self.summary(), (Decimal("10.00"), 2))
+
+    def test_deleting_a_tier_refreshes_the_offer(self):
+        self.tiers[0].delete()
+        self.assertEqual(self.summary(), (Decimal("20.00"), 2))
+        OfferDetail.objects.filter(pk=self.tiers[2].pk).first().delete()
+        self.assertEqual(self.summary(), (Decimal("20.00"), 5))
+
+        # deleting the whole offer cascades without touching the vanishing row
+        self.offer.delete()
+        self.assertFalse(OfferDetail.objects.exists())
+
+    def test_admin_tier_edits_refresh_the_offer(self):
+        tier = OfferDetail.objects.get(pk=self.tiers[2].pk)
+        tier.price, tier.delivery_time_in_days = Decimal("5.00"), 1
+        OfferDetailAdmin(OfferDetail, admin.site).save_model(self.request, tier, None, True)
+        self.assertEqual(self.summary(), (Decimal("5.00"), 1))
+
+        # inline edits are saved by the formsets, then save_related refreshes
+        OfferDetail.objects.filter(pk=tier.pk).update(price=Decimal("50.00"), delivery_time_in_days=4)
+        form = SimpleNamespace(instance=self.offer, save_m2m=lambda: None)
+        OfferAdmin(Offer, admin.site).save_related(self.request, form, [], True)
+        self.assertEqual(self.summary(), (Decimal("10.00"), 4))
+
+
+class OfferFilterTests(TestCase):
+    """?min_price= / ?max_delivery_time= match on any tier, each offer once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        cls.all_tiers = cls.offer("All tiers match", prices=(50, 60, 70), days=(1, 2, 3))
+        cls.one_tier = cls.offer("One tier matches", prices=(10, 20, 50), days=(3, 7, 9))
+        cls.no_tier = cls.offer("No tier matches", prices=(10, 20, 30), days=(8, 9, 10))
+
+    @classmethod
+    def offer(cls, title, prices, days):
+        offer = Offer.objects.create(user=cls.business, title=title, description="-")
+        OfferDetail.objects.bulk_create(
+            OfferDetail(
+                offer=offer, title=offer_type, price=Decimal(price),
+                delivery_time_in_days=delivery, offer_type=offer_type,
+            )
+            for offer_type, price, delivery in zip(("basic", "standard", "premium"), prices, days)
+        )
+        return offer
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.client = APIClient()
+
+    def ids(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/offers/", {"page_size": 10, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any("DISTINCT" in query["sql"] for query in queries.captured_queries))
+        ids = [offer["id"] for offer in response.data["results"]]
+        self.assertEqual(response.data["count"], len(ids))
+        return sorted(ids)
+
+    def test_offers_matching_on_several_tiers_appear_once(self):
+        self.assertEqual(self.ids(min_price=50), sorted([self.all_tiers.id, self.one_tier.id]))
+        self.assertEqual(self.ids(max_delivery_time=3), sorted([self.all_tiers.id, self.one_tier.id]))
+        self.assertEqual(self.ids(min_price=50, max_delivery_time=2), [self.all_tiers.id])
+        self.assertEqual(self.ids(min_price=100), [])
+
+
+class OfferSearchTests(TestCase):
+    """?search= goes through the FTS5 index and ranks title hits first."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+        self.in_description = Offer.objects.create(
+            user=business, title="Logo", description="Logos for any website"
+        )
+        self.in_title = Offer.objects.create(
+            user=business, title="Website design", description="Shops"
+        )
+        Offer.objects.create(user=business, title="Other", description="Nothing")
+        self.client = APIClient()
+
+    def search(self, term):
+        response = self.client.get("/api/offers/", {"search": term, "page_size": 10})
+        self.assertEqual(response.status_code, 200)
+        return [offer["id"] for offer in response.data["results"]]
+
+    def test_title_hits_rank_above_description_hits(self):
+        self.assertEqual(self.search("web"), [self.in_title.id, self.in_description.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.in_title.title = "Shop design"
+            self.in_title.description = "Shops"
+            self.in_title.save()
+        self.assertEqual(self.search("website"), [self.in_description.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.in_description.delete()
+        self.assertEqual(self.search("website"), [])
+        self.assertEqual(self.search("shop"), [self.in_title.id])
+
+
+class OfferSuggestTests(TestCase):
+    """/api/offers/suggest/ answers from the in-memory title index."""
+
+    def setUp(self):
+        title_index.reset()
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+        self.logo = Offer.objects.create(
+            user=self.business, title="Logo Design", description="-"
+        )
+        self.design = Offer.objects.create(
+            user=self.business, title="Design für Cafés", description="-"
+        )
+        self.client = APIClient()
+
+    def suggest(self, query):
+        response = self.client.get("/api/offers/suggest/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data]
+
+    def test_title_start_matches_come_first_without_queries(self):
+        self.suggest("x")  # first lookup builds the index
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest("des"), [self.design.id, self.logo.id])
+        self.assertEqual(self.suggest("cafe"), [self.design.id])
+
+    def test_index_follows_offer_signals(self):
+        self.suggest("x")
+        with self.captureOnCommitCallbacks(execute=True):
+            created = Offer.objects.create(
+                user=self.business, title="Desktop apps", description="-"
+            )
+            self.logo.delete()
+        self.assertEqual(self.suggest("des"), [self.design.id, created.id])
+
+
+class OfferImagePipelineTests(TestCase):
+    """Derivatives are resized, re-encoded, stripped and exposed by the API."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+
+    def make_upload(self, size=(2000, 1000)):
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x010F] = "CameraMaker"
+        Image.new("RGB", size, "navy").save(buffer, "JPEG", exif=exif)
+        return SimpleUploadedFile("photo.jpg", buffer.getvalue(), "image/jpeg")
+
+    def test_render_and_expose_derivatives(self):
+        offer = Offer.objects.create(
+            user=self.business, title="Photo", description="-", image=self.make_upload()
+        )
+        self.assertEqual(render_derivatives(offer.id), len(DERIVATIVE_SIZES))
+        self.assertEqual(render_derivatives(offer.id), 0)  # already current
+
+        for derivative in offer.image_derivatives.all():
+            max_width, max_height = DERIVATIVE_SIZES[derivative.kind]
+            self.assertLessEqual(derivative.width, max_width)
+            self.assertLessEqual(derivative.height, max_height)
+            with derivative.file.open("rb") as fh, Image.open(fh) as image:
+                self.assertEqual(image.format, OUTPUT_FORMAT)
+                self.assertEqual(image.size, (derivative.width, derivative.height))
+                self.assertFalse(image.getexif())
+
+        client = APIClient()
+        client.force_authenticate(self.business)
+        derivatives = client.get(f"/api/offers/{offer.id}/").data["image_derivatives"]
+        self.assertEqual(set(derivatives), set(DERIVATIVE_SIZES))
+        self.assertEqual(derivatives["thumbnail"]["width"], 160)
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Identical uploads share one blob; it disappears with its last reference."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root, OFFER_IMAGE_PIPELINE_ASYNC=False
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+
+    def upload(self, name, color="red"):
+        buffer = BytesIO()
+        Image.new("RGB", (8, 8), color).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+    def create_offer(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Offer.objects.create(
+                user=self.business, title="Offer", description="-", image=upload
+            )
+
+    def test_duplicate_uploads_are_stored_once(self):
+        first = self.create_offer(self.upload("a.png"))
+        second = self.create_offer(self.upload("b.PNG"))
+
+        self.assertEqual(first.image.name, second.image.name)
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertTrue(first.image.storage.exists(blob.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(second.image.storage.exists(blob.name))
+
+        # replacing the image releases the old blob
+        with self.captureOnCommitCallbacks(execute=True):
+            second = Offer.objects.get(pk=second.pk)
+            second.image = self.upload("c.png", "blue")
+            second.save()
+        self.assertFalse(ImageBlob.objects.filter(name=blob.name).exists())
+        self.assertFalse(second.image.storage.exists(blob.name))
+        self.assertEqual(ImageBlob.objects.get().name, second.image.name)
+
+    def test_reuploading_identical_content_keeps_one_reference(self):
+        offer = self.create_offer(self.upload("a.png"))
+        for name in ("again.png", "once-more.png"):
+            with self.captureOnCommitCallbacks(execute=True):
+                offer = Offer.objects.get(pk=offer.pk)
+                offer.image = self.upload(name)
+                offer.save()
+            self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+
+        # saving without a new upload leaves the reference alone
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.title = "Renamed"
+            offer.save()
+        self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.delete()
+        self.assertFalse(ImageBlob.objects.exists())
+
+
+class OfferResponseCacheTests(TestCase):
+    """Offer list / detail responses are cached until an offer-side write commits."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business", first_name="Ada"
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="-")
+        self.client = APIClient()
+
+    def test_equivalent_queries_share_one_entry(self):
+        first = self.client.get("/api/offers/?page_size=5&ordering=-updated_at")
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/offers/?ordering=-updated_at&page_size=5&foo=1")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+    def test_writes_invalidate_on_commit(self):
+        self.client.get("/api/offers/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.title = "Logo design"
+            self.offer.save()
+        response = self.client.get("/api/offers/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["title"], "Logo design")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business.first_name = "Grace"
+            self.business.save()
+        response = self.client.get("/api/offers/")
+        self.assertEqual(response.data["results"][0]["user_details"]["first_name"], "Grace")
+
+    def test_per_process_cache_alias_is_flagged(self):
+        shared = {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "test_shared_cache"}
+        with override_settings(CACHES={"default": shared}, OFFER_RESPONSE_CACHE={"ALIAS": "default"}):
+            self.assertEqual(checks.check_response_cache_is_shared(None), [])
+
+        with override_settings(OFFER_RESPONSE_CACHE={"ALIAS": "default"}):
+            self.assertEqual(
+                [message.id for message in checks.check_response_cache_is_shared(None)], ["offers_app.W001"]
+            )
+            err = StringIO()
+            call_command("offer_cache_stats", stdout=StringIO(), stderr=err)
+        self.assertIn("per-process cache 'default'", err.getvalue())
+
+
+class OfferConditionalRequestTests(TestCase):
+    """Detail responses carry validators; stale If-Match writes are refused."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="-")
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+        self.url = f"/api/offers/{self.offer.id}/"
+
+    def test_if_match_guards_against_lost_updates(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.offer.title = "Changed elsewhere"
+        self.offer.save()
+        response = self.client.patch(
+            self.url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 412)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Changed elsewhere")
+
+        current = self.client.get(self.url)["ETag"]
+        self.assertNotEqual(current, etag)
+        response = self.client.patch(
+            self.url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=current
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], current)
+
+    def test_profile_name_change_changes_offer_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.business.first_name = "Grace"
+        self.business.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class OfferKeysetPaginationTests(TestCase):
+    """?pagination=cursor walks the list by (updated_at, id) without repeats."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = CustomUser.objects.create_user(
+            username="biz", password="pw", type="business"
+        )
+        Offer.objects.bulk_create(
+            Offer(user=cls.business, title=f"Offer {i}", description="-", min_price=i % 3)
+            for i in range(25)
+        )
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.client = APIClient()
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [offer["id"] for offer in response.data["results"]]
+            url, pages = response.data["next"], pages + 1
+        return ids, pages
+
+    def test_pages_follow_the_key_order(self):
+        ids, pages = self.walk("/api/offers/?pagination=cursor&page_size=10")
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            ids, list(Offer.objects.order_by("-updated_at", "-id").values_list("id", flat=True))
+        )
+
+        ids, _ = self.walk("/api/offers/?pagination=cursor&page_size=4&ordering=details__price")
+        self.assertEqual(
+            ids, list(Offer.objects.order_by("min_price", "id").values_list("id", flat=True))
+        )
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        first = self.client.get("/api/offers/?pagination=cursor&page_size=10")
+        second = self.client.get(first.data["next"])
+        # no COUNT(*): page rows + tiers + derivatives
+        with self.assertNumQueries(3):
+            third = self.client.get(second.data["next"])
+        self.assertEqual(len(third.data["results"]), 5)
+        self.assertIsNone(third.data["next"])
+        self.assertNotIn("count", third.data)
+
+        with self.settings(API_KEYSET_PAGINATION_DEFAULT=True):
+            response = self.client.get("/api/offers/?page_size=1000")
+        self.assertEqual(len(response.data["results"]), 25)
+        self.assertIsNone(response.data["next"])
+
+
+class DuplicateTierMigrationTests(TransactionTestCase):
+    """Migration 0005 refuses duplicate tiers; dedupe_offer_tiers removes them."""
+
+    target = [("offers_app", "0005_offerdetail_unique_offer_tier_type")]
+
+    def tearDown(self):
+        call_command("migrate", verbosity=0)
+        # offers inserted while the rollback had dropped the FTS triggers
+        search.rebuild_search_index()
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return applied_apps(connection)
+
+    def test_duplicates_block_the_migration_until_deduped(self):
+        apps = self.migrate([("offers_app", "0004_offer_search_index")])
+        User = apps.get_model("auth_app", "CustomUser")
+        Offer = apps.get_model("offers_app", "Offer")
+        OfferDetail = apps.get_model("offers_app", "OfferDetail")
+        business = User.objects.create(username="biz", type="business")
+        offer = Offer.objects.create(user=business, title="Logo", description="-", min_price=1)
+        kept, extra = (
+            OfferDetail.objects.create(
+                offer=offer, title="Basic", price=Decimal(price),
+                delivery_time_in_days=days, offer_type="basic",
+            )
+            for price, days in (("20.00", 5), ("1.00", 1))
+        )
+
+        with self.assertRaisesMessage(CommandError, "dedupe_offer_tiers"):
+            self.migrate(self.target)
+
+        out = StringIO()
+        call_command("dedupe_offer_tiers", "--dry-run", stdout=out)
+        self.assertIn(f"keeping tier {kept.pk}, removing {extra.pk}", out.getvalue())
+        self.assertEqual(OfferDetail.objects.count(), 2)
+
+        call_command("dedupe_offer_tiers", stdout=StringIO())
+        self.assertEqual(list(OfferDetail.objects.values_list("pk", flat=True)), [kept.pk])
+        offer = Offer.objects.get(pk=offer.pk)
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (Decimal("20.00"), 5))
+        self.migrate(self.target)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from orders_app.models import Order
+from orders_app.models import ArchivedOrder, Order
 
 class OrderSerializer(serializers.ModelSerializer):
     """
@@ -23,5 +23,19 @@ class OrderSerializer(serializers.ModelSerializer):
             'offer_type',           # Type of offer (e.g. basic, premium)
             'status',               # Status of the order (e.g. in_progress, completed)
             'created_at',           # Timestamp when the order was created
-            'updated_at'            # Timestamp when the order was last updated
+            'updated_at',           # Timestamp when the order was last updated
+            'due_at',               # created_at + delivery_time_in_days
         ]
+        read_only_fields = ['due_at']
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of an archived order – the OrderSerializer
+    fields plus the time it was moved to the archive.
+    """
+
+    class Meta:
+        model = ArchivedOrder
+        fields = OrderSerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
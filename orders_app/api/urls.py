@@ -4,15 +4,23 @@ from .views import (
     OrderStatusUpdateView,
     OrderDeleteView,
     CompletedOrderCountView,
-    OrderCountView  
+    OrderCountView,
+    OrderCountBatchView,
+    OrderExportView,
+    OrderEventTicketView,
+    order_event_stream,
 )
 
 urlpatterns = [
     path("orders/", OrderListCreateView.as_view()),
+    path("orders/events/", order_event_stream),
+    path("orders/events/ticket/", OrderEventTicketView.as_view()),
+    path("orders/export/", OrderExportView.as_view()),
     path("orders/<int:id>/", OrderStatusUpdateView.as_view()),        
     path("orders/<int:id>/status/", OrderStatusUpdateView.as_view()), 
     path("orders/<int:id>/delete/", OrderDeleteView.as_view()),
     path("completed-order-count/<int:business_user_id>/", CompletedOrderCountView.as_view()),
     path("order-count/<int:business_user_id>/", OrderCountView.as_view()),   
+    path("order-counts/", OrderCountBatchView.as_view()),
 ]
 
@@ -1,5 +1,14 @@
-from django.db.models import Q
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.authtoken.models import Token
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateAPIView,
@@ -17,38 +26,136 @@ from rest_framework.exceptions import (
 from rest_framework.response import Response
 from rest_framework import status
 
-from orders_app.models import Order
+from core.conditional import ConditionalRequestMixin
+from core.pagination import KeysetPagination
+from orders_app.counters import count_created, get_counter, get_counters
+from orders_app import events, export
+from orders_app.idempotency import idempotent_response
+from orders_app.models import ArchivedOrder, Order, OrderEvent
 from offers_app.models import OfferDetail
-from .serializers import OrderSerializer
-
-User = get_user_model()
+from .serializers import ArchivedOrderSerializer, OrderSerializer
 
 
 class OrderListCreateView(ListCreateAPIView):
     """
     GET  /api/orders/
         Return every order where the requester is customer_user OR business_user.
+        ?role=customer|business|both (default both) picks the side(s),
+        ?status=in_progress|completed|cancelled narrows further.
+        ?overdue=true – in-progress orders past their due_at;
+        ?due_within=<days> – in-progress orders due in the next <days> days.
+        ?pagination=cursor pages through it newest first by (created_at, id);
+        otherwise the list stops after API_LIST_MAX_ROWS rows and the
+        `Link: rel="next"` header continues it with ?offset=.
+        ?include_archived=true adds archived (finished, old) orders, each
+        with its `archived_at`; live rows carry `archived_at: null` then.
 
     POST /api/orders/
         Customer creates an order from an OfferDetail snapshot.
+        {"offer_detail_ids": [..]} creates several orders at once (checkout),
+        all or nothing; the response is then a list.
+        An Idempotency-Key header makes retries safe (see orders_app.idempotency).
 
     Expected errors
-        400 invalid JSON / missing or non-integer offer_detail_id
+        400 invalid JSON / missing or non-integer offer_detail_id(s)
+            (GET: unknown role / status, invalid due_within)
         401 unauthenticated
         403 requester is not a customer profile
-        404 offer detail not found
+        404 offer detail(s) not found
+        409 / 422 Idempotency-Key still in progress / reused for another request
     """
 
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+    max_bulk_orders = 50
+
+    ROLES = ("customer", "business", "both")
 
     # ------- LIST ----------------------------------------------------------
     def get_queryset(self):
+        return self.get_side_queryset(Order)
+
+    def get_side_queryset(self, model):
+        """
+        Each side is an index lookup on its own FK column; the two id sets
+        are combined with UNION. A single `customer OR business` WHERE
+        clause cannot use either index and scans the whole orders table.
+        Works for Order and ArchivedOrder alike.
+        """
         user = self.request.user
-        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+        params = self.request.query_params
+
+        role = params.get("role", "both")
+        if role not in self.ROLES:
+            raise ValidationError({"role": f"Must be one of: {', '.join(self.ROLES)}."})
+
+        sides = []
+        if role in ("customer", "both"):
+            sides.append(model.objects.filter(customer_user=user))
+        if role in ("business", "both"):
+            sides.append(model.objects.filter(business_user=user))
+
+        order_status = params.get("status")
+        if order_status is not None:
+            if order_status not in dict(Order.STATUS_CHOICES):
+                raise ValidationError({"status": "Unknown order status."})
+            sides = [side.filter(status=order_status) for side in sides]
+
+        due = self.get_due_filter(params)
+        if due:
+            # (business_user, status, due_at) makes this a range scan
+            sides = [side.filter(status="in_progress", **due) for side in sides]
+
+        if len(sides) == 1:
+            return sides[0].order_by("id")
+        ids = sides[0].values("pk").union(sides[1].values("pk"))
+        return model.objects.filter(pk__in=ids).order_by("id")
+
+    def get_due_filter(self, params):
+        now = timezone.now()
+        overdue = params.get("overdue", "").lower() in ("1", "true", "yes")
+        raw_days = params.get("due_within")
+        if raw_days is None:
+            return {"due_at__lt": now} if overdue else {}
+        if overdue:
+            raise ValidationError({"due_within": "Cannot be combined with overdue."})
+        try:
+            days = int(raw_days)
+            if days < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({"due_within": "Must be a positive number of days."})
+        return {"due_at__gte": now, "due_at__lt": now + timedelta(days=days)}
+
+    def include_archived(self):
+        return self.request.query_params.get("include_archived", "").lower() in ("1", "true", "yes")
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+
+        live = self.get_queryset()
+        archived = self.get_side_queryset(ArchivedOrder)
+        # without ?pagination=cursor: both tables in id order, as the live list alone
+        page = self.paginator.paginate_querysets([live, archived], request, self)
+        return self.get_paginated_response(self.serialize_mixed(page))
+
+    def serialize_mixed(self, rows):
+        data = []
+        for row in rows:
+            if isinstance(row, ArchivedOrder):
+                data.append(ArchivedOrderSerializer(row).data)
+            else:
+                data.append({**OrderSerializer(row).data, "archived_at": None})
+        return data
 
     # ------- CREATE --------------------------------------------------------
     def create(self, request, *args, **kwargs):
+        return idempotent_response(request, lambda: self.create_orders(request))
+
+    def create_orders(self, request):
         # Content-Type must be application/json
         if request.content_type != "application/json":
             return Response(
@@ -71,6 +178,9 @@ class OrderListCreateView(ListCreateAPIView):
                 "Only users of type 'customer' are allowed to create orders."
             )
 
+        if "offer_detail_ids" in data:
+            return self.create_many(user, data["offer_detail_ids"])
+
         raw_id = data.get("offer_detail_id")
         if raw_id is None:
             raise ValidationError({"offer_detail_id": "This field is required."})
@@ -91,24 +201,71 @@ class OrderListCreateView(ListCreateAPIView):
         except OfferDetail.DoesNotExist:
             raise NotFound("Offer detail not found.")
 
-        order = Order.objects.create(
+        # the business counters move in the same transaction (orders_app.signals)
+        with transaction.atomic():
+            order = self.snapshot(user, offer_detail)
+            order.save()
+
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+    def create_many(self, user, raw_ids):
+        """
+        One query for all referenced tiers, one bulk INSERT for the orders.
+        Any unknown id fails the whole request before anything is written.
+        """
+        if not isinstance(raw_ids, list) or not raw_ids:
+            raise ValidationError({"offer_detail_ids": "Must be a non-empty list of IDs."})
+        if len(raw_ids) > self.max_bulk_orders:
+            raise ValidationError(
+                {"offer_detail_ids": f"At most {self.max_bulk_orders} orders per request."}
+            )
+        try:
+            ids = [int(raw_id) for raw_id in raw_ids]
+        except (TypeError, ValueError):
+            raise ValidationError({"offer_detail_ids": "Must be a list of valid integer IDs."})
+
+        details = OfferDetail.objects.select_related("offer__user").in_bulk(set(ids))
+        missing = sorted({pk for pk in ids if pk not in details})
+        if missing:
+            raise NotFound(f"Offer details not found: {', '.join(map(str, missing))}.")
+
+        # bulk_create sends no signals – counters and events are written explicitly
+        with transaction.atomic():
+            orders = Order.objects.bulk_create(
+                self.snapshot(user, details[pk]) for pk in ids
+            )
+            count_created(orders)
+            events.record(OrderEvent.CREATED, orders)
+
+        return Response(
+            OrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+    @staticmethod
+    def snapshot(user, offer_detail):
+        """An unsaved order copying the tier as it is right now."""
+        created_at = timezone.now()
+        return Order(
             customer_user=user,
             business_user=offer_detail.offer.user,
             title=offer_detail.title,
             revisions=offer_detail.revisions,
             delivery_time_in_days=offer_detail.delivery_time_in_days,
+            created_at=created_at,
+            due_at=Order.compute_due_at(created_at, offer_detail.delivery_time_in_days),
             price=offer_detail.price,
             features=offer_detail.features,
             offer_type=offer_detail.offer_type,
             status="in_progress",
         )
 
-        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
 
-
-class OrderStatusUpdateView(RetrieveUpdateAPIView):
+class OrderStatusUpdateView(ConditionalRequestMixin, RetrieveUpdateAPIView):
     """
     PATCH /api/orders/<id>/ – business partner updates only 'status'
+
+    Supports ETag / Last-Modified: 304 on conditional GET, 412 on a PATCH
+    whose If-Match no longer matches.
     """
 
     queryset = Order.objects.all()
@@ -116,13 +273,18 @@ class OrderStatusUpdateView(RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
 
+    def get_validator_queryset(self):
+        # only the business partner may see the order – anyone else falls
+        # through to get_object() and its 403
+        return Order.objects.filter(pk=self.kwargs["id"], business_user=self.request.user)
+
     def get_object(self):
         order = super().get_object()
         if self.request.user != order.business_user:
             raise PermissionDenied("Only the business partner can update the status.")
         return order
 
-    def patch(self, request, *args, **kwargs):
+    def partial_update(self, request, *args, **kwargs):
         if "status" not in request.data:
             return Response(
                 {"detail": "Only the 'status' field can be updated."},
@@ -145,6 +307,11 @@ class OrderDeleteView(DestroyAPIView):
         except Order.DoesNotExist:
             raise NotFound("The order was not found.")
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # delete + counter decrement commit together
+        instance.delete()
+
 
 class OrdersForBusinessView(ListAPIView):
     """GET /api/orders/business/ – orders where requester is business_user"""
@@ -160,37 +327,213 @@ class OrderCountView(APIView):
     """
     GET /api/order-count/<business_user_id>/  
     Authenticated users see number of in_progress orders for that business user.
+    Read from the materialised BusinessOrderCounter row (one PK lookup).
     """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        try:
-            biz = User.objects.get(pk=business_user_id, type="business")
-        except User.DoesNotExist:
+        counter = get_counter(business_user_id)
+        if counter is None:
             return Response(
                 {"detail": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
             )
-
-        cnt = Order.objects.filter(business_user=biz, status="in_progress").count()
-        return Response({"order_count": cnt}, status=status.HTTP_200_OK)
+        return Response({"order_count": counter.in_progress}, status=status.HTTP_200_OK)
 
 
 class CompletedOrderCountView(APIView):
     """
     GET /api/completed-order-count/<business_user_id>/  
     Public endpoint – number of completed orders for a business profile.
+    Read from the materialised BusinessOrderCounter row (one PK lookup).
     """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        try:
-            biz = User.objects.get(pk=business_user_id, type="business")
-        except User.DoesNotExist:
+        counter = get_counter(business_user_id)
+        if counter is None:
             return Response(
                 {"detail": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
             )
+        return Response(
+            {"completed_order_count": counter.completed}, status=status.HTTP_200_OK
+        )
+
+
+class OrderCountBatchView(APIView):
+    """
+    GET /api/order-counts/?business_user_ids=1,2,3
+    in_progress and completed counts for many business profiles in one
+    request (and one counter-table read), e.g. for the business directory.
+
+    Ids that are unknown or not business users are listed in `not_found`
+    – the per-id endpoints answer 404 for them.
+    """
 
-        cnt = Order.objects.filter(business_user=biz, status="completed").count()
-        return Response({"completed_order_count": cnt}, status=status.HTTP_200_OK)
+    permission_classes = [IsAuthenticated]
+    max_ids = 300
+
+    def get(self, request):
+        raw = request.query_params.get("business_user_ids", "")
+        try:
+            ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+        except ValueError:
+            raise ValidationError(
+                {"business_user_ids": "Must be a comma-separated list of integer IDs."}
+            )
+        if not ids:
+            raise ValidationError({"business_user_ids": "This field is required."})
+        if len(ids) > self.max_ids:
+            raise ValidationError(
+                {"business_user_ids": f"At most {self.max_ids} IDs per request."}
+            )
+
+        counters = get_counters(ids)
+        return Response(
+            {
+                "results": [
+                    {
+                        "business_user_id": pk,
+                        "order_count": counters[pk].in_progress,
+                        "completed_order_count": counters[pk].completed,
+                    }
+                    for pk in ids
+                    if pk in counters
+                ],
+                "not_found": [pk for pk in ids if pk not in counters],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ExportFormatNegotiation(DefaultContentNegotiation):
+    """`?format=` picks the export format here, not a DRF renderer."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class OrderExportView(APIView):
+    """
+    GET /api/orders/export/?format=csv|ndjson&since=<date or datetime>
+    The requester's complete order history (live and archived) for
+    accounting: business users get the orders they fulfil, customers the
+    ones they placed. `since` limits it to orders changed since then.
+
+    Streamed straight from a chunked database cursor (see
+    orders_app.export), so memory stays flat regardless of row count –
+    under ASGI as an async iterator, under WSGI as a generator.
+    """
+
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = ExportFormatNegotiation
+
+    def get(self, request):
+        fmt = request.query_params.get("format", "csv")
+        if fmt not in export.FORMATS:
+            raise ValidationError({"format": f"Must be one of: {', '.join(export.FORMATS)}."})
+
+        since = self.parse_since(request.query_params.get("since"))
+        side = "business_user" if request.user.type == "business" else "customer_user"
+        rows = export.export_rows({side: request.user}, since=since)
+
+        stream = export.STREAMERS[fmt](rows)
+        if isinstance(request._request, ASGIRequest):
+            stream = export.async_chunks(stream)
+        response = StreamingHttpResponse(stream, content_type=export.FORMATS[fmt])
+        filename = f"orders-{timezone.localdate():%Y-%m-%d}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def parse_since(self, raw):
+        if raw is None:
+            return None
+        value = parse_datetime(raw)
+        if value is None:
+            day = parse_date(raw)
+            if day is None:
+                raise ValidationError({"since": "Must be an ISO 8601 date or datetime."})
+            value = datetime.combine(day, time.min)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+
+class OrderEventTicketView(APIView):
+    """
+    POST /api/orders/events/ticket/ – a short-lived ticket for opening the
+    event stream with EventSource: `new EventSource(".../events/?ticket=" + t)`.
+    It only opens the stream and expires after ORDER_EVENTS_TICKET_SECONDS;
+    fetch a new one when the stream fails to reconnect.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": events.issue_ticket(request.user),
+                "expires_in": getattr(settings, "ORDER_EVENTS_TICKET_SECONDS", 60),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+async def stream_user(request):
+    """The active user behind the Authorization header or ?ticket=, else None."""
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Token "):
+        token = await Token.objects.select_related("user").filter(key=header[6:].strip()).afirst()
+        user = token.user if token is not None else None
+    else:
+        user_id = events.read_ticket(request.GET.get("ticket", ""))
+        user = await get_user_model().objects.filter(pk=user_id).afirst() if user_id else None
+    return user if user is not None and user.is_active else None
+
+
+async def order_event_stream(request):
+    """
+    GET /api/orders/events/ – text/event-stream of the requester's order
+    events (created / status_changed / deleted), see orders_app.events.
+
+    A plain async Django view, not DRF. Authenticated by the DRF token in
+    `Authorization: Token <key>`, or – for browsers' EventSource, which
+    cannot set headers – by `?ticket=` from POST /api/orders/events/ticket/.
+    The API token itself is never accepted in the URL, where it would end
+    up in access logs and browser history. Resume with the `Last-Event-ID`
+    header (sent by EventSource automatically) or `?last_event_id=`;
+    without either the stream starts with the next event.
+    `?role=customer|business|both`.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+
+    user = await stream_user(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    role = request.GET.get("role", "both")
+    if role not in OrderListCreateView.ROLES:
+        return JsonResponse({"role": f"Must be one of: {', '.join(OrderListCreateView.ROLES)}."}, status=400)
+
+    raw_last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    if raw_last_id is None:
+        last_id = await events.latest_event_id()
+    else:
+        try:
+            last_id = int(raw_last_id)
+        except ValueError:
+            return JsonResponse({"detail": "Last-Event-ID must be an integer."}, status=400)
+
+    if isinstance(request, ASGIRequest):
+        stream = events.stream_events(user.pk, role, last_id)
+    else:
+        # WSGI cannot serve an async iterator lazily – answer one poll
+        stream = [
+            frame async for frame in events.stream_events(user.pk, role, last_id, once=True)
+        ]
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: do not buffer the stream
+    return response
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class OrdersAppConfig(AppConfig):
+    """
+    Configuration class for the orders_app Django application.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'  # Use BigAutoField for primary keys by default
+    name = 'orders_app'  # Name of the app as used in INSTALLED_APPS and imports
+
+    def ready(self):
+        # Register model signal handlers (per-business order counters)
+        from . import signals  # noqa: F401
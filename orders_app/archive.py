@@ -0,0 +1,81 @@
+"""
+Hot / cold archival of finished orders.
+
+Completed and cancelled orders whose last change is older than the
+cut-off move from Order to ArchivedOrder in batches. Every batch is its
+own transaction (copy + delete), so a run can be interrupted at any
+point and simply started again – it continues with what is left.
+
+The move is not an order *change*: the rows are deleted with a plain
+DELETE, so neither the counters (which keep counting archived orders)
+nor the event outbox see it.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from orders_app.models import ArchivedOrder, Order
+
+FINISHED = ("completed", "cancelled")
+DEFAULT_AFTER_DAYS = 180
+
+COPIED_FIELDS = [
+    field.attname for field in ArchivedOrder._meta.concrete_fields if field.name != "archived_at"
+]
+
+
+def default_cutoff():
+    days = getattr(settings, "ORDER_ARCHIVE_AFTER_DAYS", DEFAULT_AFTER_DAYS)
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    return Order.objects.filter(status__in=FINISHED, updated_at__lt=cutoff)
+
+
+def row_bytes(values):
+    """Approximate payload size of one row (sum of its encoded values)."""
+    return sum(len(str(value).encode()) for value in values if value is not None)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Moves up to `batch_size` archivable orders. Returns (rows, bytes).
+    """
+    with transaction.atomic():
+        rows = list(
+            archivable(cutoff)
+            .order_by("id")
+            .select_for_update(skip_locked=connection.features.has_select_for_update_skip_locked)
+            .values_list(*COPIED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+
+        ArchivedOrder.objects.bulk_create(
+            (ArchivedOrder(**dict(zip(COPIED_FIELDS, row))) for row in rows),
+            ignore_conflicts=True,  # a row copied by an earlier, half-finished run
+        )
+        ids = [row[0] for row in rows]
+        table = connection.ops.quote_name(Order._meta.db_table)
+        placeholders = ", ".join(["%s"] * len(ids))
+        with connection.cursor() as cursor:
+            # plain DELETE on purpose: no post_delete → counters / events untouched
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+
+    return len(rows), sum(row_bytes(row) for row in rows)
+
+
+def archive_finished_orders(cutoff=None, batch_size=1000, max_batches=None):
+    """Yields (rows, bytes) per batch until nothing is left (or max_batches)."""
+    cutoff = cutoff or default_cutoff()
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved[0]:
+            return
+        batches += 1
+        yield moved
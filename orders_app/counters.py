@@ -0,0 +1,142 @@
+"""
+Per-business order counters (BusinessOrderCounter).
+
+Every order write moves the counts with a single
+UPDATE ... SET col = col ± 1 in the caller's transaction, so concurrent
+writes never lose an increment. Decrements stop at 0, so a count that
+drifted low (e.g. through a bulk path that skipped the signals) cannot make
+the order write fail. A missing counter row is rebuilt from the live and
+archived orders on demand; `reconcile_order_counters` does the same for all
+business users and corrects drift.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import Signal
+
+from orders_app.models import ArchivedOrder, BusinessOrderCounter, Order
+
+STATUSES = tuple(status for status, _ in Order.STATUS_CHOICES)
+
+# Sent (on commit) with `business_user_ids` whenever counts may have changed
+counters_changed = Signal()
+
+
+def apply_change(old=None, new=None, rebuild_missing=True):
+    """
+    Moves one order from `old` to `new`; both are (business_user_id, status)
+    tuples or None (created / deleted).
+    """
+    if old == new:
+        return
+    deltas = {}
+    if old is not None and old[1] in STATUSES:
+        deltas.setdefault(old[0], {})[old[1]] = -1
+    if new is not None and new[1] in STATUSES:
+        changes = deltas.setdefault(new[0], {})
+        changes[new[1]] = changes.get(new[1], 0) + 1
+    apply_deltas(deltas, rebuild_missing=rebuild_missing)
+
+
+def count_created(orders):
+    """Counts freshly bulk-created orders (bulk_create sends no signals)."""
+    deltas = {}
+    for order in orders:
+        changes = deltas.setdefault(order.business_user_id, {})
+        changes[order.status] = changes.get(order.status, 0) + 1
+    apply_deltas(deltas)
+
+
+def apply_deltas(deltas, rebuild_missing=True):
+    """
+    `deltas` maps business_user_id → {status: delta}. Used directly by
+    bulk writes, which bypass the model signals.
+    """
+    touched = []
+    for business_user_id, changes in deltas.items():
+        changes = {status: delta for status, delta in changes.items() if delta}
+        if not changes:
+            continue
+        updated = BusinessOrderCounter.objects.filter(pk=business_user_id).update(
+            **{status: _moved(status, delta) for status, delta in changes.items()}
+        )
+        if not updated and rebuild_missing:
+            # no row yet – count from the orders, which already include this write
+            recount([business_user_id])
+        touched.append(business_user_id)
+
+    if touched:
+        # robust: see reviews_app.summaries._notify
+        transaction.on_commit(
+            lambda: counters_changed.send_robust(sender=BusinessOrderCounter, business_user_ids=touched)
+        )
+
+
+def _moved(status, delta):
+    # PositiveIntegerField has a CHECK (>= 0) – never decrement below it
+    return F(status) + delta if delta > 0 else Greatest(F(status) + delta, 0)
+
+
+def recount(business_user_ids=None):
+    """
+    Rebuilds the counter rows of the given business users (all business
+    users if None) from the live and the archived orders. Returns the
+    number of rows written.
+    """
+    users = get_user_model().objects.filter(type="business")
+    if business_user_ids is not None:
+        users = users.filter(pk__in=business_user_ids)
+    counts = users.values("pk").annotate(
+        **{
+            status: Count("business_orders", filter=Q(business_orders__status=status))
+            + _archived_count(status)
+            for status in STATUSES
+        }
+    ).values_list("pk", *STATUSES)
+
+    written = 0
+    with transaction.atomic():
+        for pk, *values in counts.iterator():
+            BusinessOrderCounter.objects.update_or_create(
+                business_user_id=pk, defaults=dict(zip(STATUSES, values))
+            )
+            written += 1
+    return written
+
+
+def _archived_count(status):
+    # correlated subquery – a second JOIN would multiply the live counts
+    archived = (
+        ArchivedOrder.objects.filter(business_user=OuterRef("pk"), status=status)
+        .order_by()
+        .values("business_user")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(archived), 0)
+
+
+def get_counters(business_user_ids):
+    """
+    Counter rows for many business users – one `pk IN (...)` read, plus a
+    rebuild for ids without a row. Returns {business_user_id: counter};
+    ids that are not business users are absent.
+    """
+    counters = BusinessOrderCounter.objects.in_bulk(business_user_ids)
+    missing = [pk for pk in business_user_ids if pk not in counters]
+    if missing and recount(missing):
+        counters.update(BusinessOrderCounter.objects.in_bulk(missing))
+    return counters
+
+
+def get_counter(business_user_id):
+    """
+    The counter row of a business user – one primary-key read. Rebuilt
+    from the orders if missing; None if the user is not a business user.
+    """
+    counter = BusinessOrderCounter.objects.filter(pk=business_user_id).first()
+    if counter is None and recount([business_user_id]):
+        counter = BusinessOrderCounter.objects.filter(pk=business_user_id).first()
+    return counter
@@ -0,0 +1,150 @@
+"""
+Order event outbox and its server-sent-event (SSE) stream.
+
+`record()` is called from the order signals (and from bulk writes, which
+send none), always inside the transaction of the change itself – an event
+exists exactly when its change was committed.
+
+`stream_events()` tails the outbox for one user. Served through ASGI
+(core/asgi.py) it is a long-lived response: one indexed "id > last seen"
+query per poll interval, keep-alive comments in between, and after
+ORDER_EVENTS_STREAM_SECONDS the stream ends and the browser reconnects
+with Last-Event-ID. Under WSGI a single poll is answered and the client
+reconnects after the `retry` delay, so it degrades to long-ish polling
+instead of tying up a worker thread.
+
+"id > last seen" relies on events becoming visible in id order. SQLite
+serialises writers, so they do; on PostgreSQL / MySQL a transaction can
+commit a lower id after a higher one was already streamed. There the
+stream only hands out events older than ORDER_EVENTS_COMMIT_LAG_SECONDS
+(default 5 s on those backends, 0 on SQLite) – an event whose transaction
+stays open longer than that after writing it can still be missed, so the
+order writes keep their transactions short.
+
+EventSource cannot send an Authorization header, so browsers open the
+stream with a stream ticket (`issue_ticket`): a signed, single-purpose
+token that expires after ORDER_EVENTS_TICKET_SECONDS, instead of the
+long-lived API token in the URL.
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from orders_app.models import OrderEvent
+
+BATCH_SIZE = 100
+TICKET_SALT = "orders_app.events.stream-ticket"
+
+
+def issue_ticket(user):
+    """A signed ticket that opens the event stream of `user` for a short while."""
+    return signing.TimestampSigner(salt=TICKET_SALT).sign(str(user.pk))
+
+
+def read_ticket(ticket):
+    """The user id of a valid, unexpired ticket, else None."""
+    max_age = getattr(settings, "ORDER_EVENTS_TICKET_SECONDS", 60)
+    try:
+        return int(signing.TimestampSigner(salt=TICKET_SALT).unsign(ticket, max_age=max_age))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def commit_lag():
+    default = 0 if connection.vendor == "sqlite" else 5
+    return timedelta(seconds=getattr(settings, "ORDER_EVENTS_COMMIT_LAG_SECONDS", default))
+
+
+def settled(queryset):
+    """Events old enough that no lower id can still be committed."""
+    lag = commit_lag()
+    if not lag:
+        return queryset
+    return queryset.filter(created_at__lte=timezone.now() - lag)
+
+
+def snapshot(order, previous_status=None):
+    return {
+        "order_id": order.pk,
+        "status": order.status,
+        "previous_status": previous_status,
+        "title": order.title,
+        "price": order.price,
+        "offer_type": order.offer_type,
+        "business_user": order.business_user_id,
+        "customer_user": order.customer_user_id,
+        "updated_at": order.updated_at,
+    }
+
+
+def record(kind, orders, previous_status=None):
+    """Writes one event per order (a single INSERT for many)."""
+    OrderEvent.objects.bulk_create(
+        OrderEvent(
+            kind=kind,
+            order_id=order.pk,
+            business_user_id=order.business_user_id,
+            customer_user_id=order.customer_user_id,
+            payload=snapshot(order, previous_status),
+        )
+        for order in orders
+    )
+
+
+def events_for(user_id, role="both"):
+    sides = Q()
+    if role in ("business", "both"):
+        sides |= Q(business_user_id=user_id)
+    if role in ("customer", "both"):
+        sides |= Q(customer_user_id=user_id)
+    return OrderEvent.objects.filter(sides)
+
+
+def format_event(event):
+    data = json.dumps(
+        {"id": event.pk, "type": event.kind, **event.payload}, cls=DjangoJSONEncoder
+    )
+    return f"id: {event.pk}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+async def latest_event_id():
+    last = await settled(OrderEvent.objects.order_by("-id")).values_list("id", flat=True).afirst()
+    return last or 0
+
+
+async def stream_events(user_id, role, last_id, once=False):
+    """Async generator of SSE frames for `user_id`, starting after `last_id`."""
+    poll = getattr(settings, "ORDER_EVENTS_POLL_SECONDS", 1.0)
+    keepalive = getattr(settings, "ORDER_EVENTS_KEEPALIVE_SECONDS", 15.0)
+    duration = 0 if once else getattr(settings, "ORDER_EVENTS_STREAM_SECONDS", 300)
+    retry_ms = int(getattr(settings, "ORDER_EVENTS_RETRY_SECONDS", 3) * 1000)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    quiet_since = loop.time()
+    queryset = events_for(user_id, role).order_by("id")
+
+    yield f"retry: {retry_ms}\n\n"
+    while True:
+        events = [event async for event in settled(queryset.filter(id__gt=last_id))[:BATCH_SIZE]]
+        for event in events:
+            last_id = event.pk
+            yield format_event(event)
+        if len(events) == BATCH_SIZE:
+            continue  # catching up – no pause
+        if events:
+            quiet_since = loop.time()
+        if loop.time() >= deadline:
+            return
+        if loop.time() - quiet_since >= keepalive:
+            quiet_since = loop.time()
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(poll)
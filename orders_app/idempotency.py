@@ -0,0 +1,100 @@
+"""
+`Idempotency-Key` support for write endpoints.
+
+The first request with a key runs normally. If it succeeds (2xx), its
+response is stored in the same transaction as the write itself. Any retry
+with that key inside the retention window then gets the stored response
+replayed, marked with `Idempotent-Replayed: true`, and nothing is written
+again. Failed requests are not stored, so they can simply be retried.
+
+Reusing a key for a different request returns 422. A retry that races
+the still-running original returns 409.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.response import Response
+
+from orders_app.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+
+# How long a stored response is replayed (seconds); default 24 hours
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def retention():
+    return timedelta(seconds=getattr(settings, "ORDER_IDEMPOTENCY_TTL", DEFAULT_TTL))
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def idempotent_response(request, handler):
+    """
+    Runs `handler()` (which performs the write and returns a Response)
+    at most once per user and `Idempotency-Key`. Requests without the
+    header go straight to the handler.
+    """
+    key = request.headers.get(HEADER)
+    if key is None:
+        return handler()
+    if not key or len(key) > 255:
+        raise ValidationError({HEADER: "Must be between 1 and 255 characters."})
+    try:
+        fingerprint = request_fingerprint(request)
+    except ParseError:
+        # malformed body – the handler reports it and nothing is written
+        return handler()
+
+    keys = IdempotencyKey.objects.filter(user=request.user, key=key)
+    keys.filter(created_at__lt=timezone.now() - retention()).delete()
+    stored = keys.first()
+    if stored is not None:
+        return replay(stored, fingerprint)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=request.user, key=key, request_hash=fingerprint, status_code=0
+                )
+        except IntegrityError:
+            # a concurrent request with the same key got there first
+            stored = keys.first()
+            if stored is None:
+                return Response(
+                    {"detail": "A request with this Idempotency-Key is still in progress."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            return replay(stored, fingerprint)
+
+        response = handler()
+        if not status.is_success(response.status_code):
+            transaction.set_rollback(True)
+            return response
+        record.status_code = response.status_code
+        record.response_body = response.data
+        record.save(update_fields=["status_code", "response_body"])
+    return response
+
+
+def replay(stored, fingerprint):
+    if stored.request_hash != fingerprint:
+        return Response(
+            {"detail": "This Idempotency-Key was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(stored.response_body, status=stored.status_code)
+    response[REPLAY_HEADER] = "true"
+    return response
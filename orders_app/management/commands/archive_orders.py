@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders_app.archive import archivable, archive_finished_orders, default_cutoff
+
+
+class Command(BaseCommand):
+    """
+    Moves completed / cancelled orders whose last change is older than the
+    cut-off into the archive table, in batches of one transaction each.
+    Interrupt it at any time; the next run continues where it stopped.
+
+        python manage.py archive_orders                      # ORDER_ARCHIVE_AFTER_DAYS (180)
+        python manage.py archive_orders --older-than-days 90 --batch-size 5000
+        python manage.py archive_orders --dry-run
+    """
+
+    help = "Archive finished orders older than the configured age."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        days = options["older_than_days"]
+        cutoff = timezone.now() - timedelta(days=days) if days is not None else default_cutoff()
+
+        if options["dry_run"]:
+            count = archivable(cutoff).count()
+            self.stdout.write(f"{count} order(s) last changed before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        rows = size = batches = 0
+        for moved_rows, moved_bytes in archive_finished_orders(
+            cutoff, options["batch_size"], options["max_batches"]
+        ):
+            rows += moved_rows
+            size += moved_bytes
+            batches += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  batch {batches}: {moved_rows} rows, {moved_bytes} bytes")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {rows} order(s), ≈{size / 1024:.1f} KiB of row data, in {batches} batch(es)."
+            )
+        )
@@ -0,0 +1,142 @@
+import gc
+import random
+import threading
+import time
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth_app.models import CustomUser
+from core.bench import rss_bytes, scratch_database
+from orders_app import export
+from orders_app.api.views import OrderExportView, OrderListCreateView
+from orders_app.models import Order
+
+
+class RssSampler:
+    """Samples the process RSS in a background thread; `peak` is the maximum seen."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+class Command(BaseCommand):
+    """
+    Exports one business user's order history through
+    /api/orders/export/ and reports duration, output size and the RSS the
+    export added on top of the seeded process. The CSV export is run a
+    second time through the async iterator an ASGI server gets. --compare-json
+    also runs the /api/orders/ JSON list for the same rows, with the
+    API_LIST_MAX_ROWS cap lifted (the list as it was before the cap).
+
+        python manage.py bench_order_export --orders 1000000
+        python manage.py bench_order_export --orders 100000 --compare-json
+    """
+
+    help = "Streaming order export: throughput and peak RSS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--compare-json", action="store_true")
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            business = self.seed(options["orders"], random.Random(options["seed"]))
+            factory = APIRequestFactory()
+
+            for fmt in ("csv", "ndjson"):
+                self.run(f"export ?format={fmt}", lambda: self.export(factory, business, fmt))
+            self.run("export ?format=csv (ASGI)", lambda: self.export_async(business, "csv"))
+            if options["compare_json"]:
+                with override_settings(API_LIST_MAX_ROWS=options["orders"]):
+                    self.run("GET /api/orders/ (JSON list)", lambda: self.json_list(factory, business))
+
+    def run(self, label, fn):
+        gc.collect()
+        baseline = rss_bytes()
+        started = time.perf_counter()
+        with RssSampler() as sampler:
+            size = fn()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label:<32} {elapsed:7.2f} s  {size / 2**20:8.1f} MiB out  "
+            f"RSS baseline {baseline / 2**20:7.1f} MiB  peak {sampler.peak / 2**20:7.1f} MiB  "
+            f"(+{(sampler.peak - baseline) / 2**20:.1f} MiB)"
+        )
+
+    def export(self, factory, user, fmt):
+        request = factory.get("/api/orders/export/", {"format": fmt})
+        force_authenticate(request, user=user)
+        response = OrderExportView.as_view()(request)
+        assert response.status_code == 200, response.status_code
+        return sum(len(chunk) for chunk in response.streaming_content)
+
+    def export_async(self, user, fmt):
+        # async_to_sync keeps the thread_sensitive steps in this thread,
+        # as the ASGI handler does for a request
+        chunks = export.STREAMERS[fmt](export.export_rows({"business_user": user}))
+
+        async def consume():
+            size = 0
+            async for chunk in export.async_chunks(chunks):
+                size += len(chunk)
+            return size
+
+        return async_to_sync(consume)()
+
+    def json_list(self, factory, user):
+        request = factory.get("/api/orders/", {"role": "business"})
+        force_authenticate(request, user=user)
+        response = OrderListCreateView.as_view()(request)
+        response.render()
+        return len(response.content)
+
+    def seed(self, count, rng):
+        self.stdout.write(f"Seeding {count:,} orders ...")
+        customer = CustomUser.objects.create_user(username="bench-customer", type="customer")
+        business = CustomUser.objects.create_user(username="bench-business", type="business")
+        statuses = [status for status, _ in Order.STATUS_CHOICES]
+        batch = 10_000
+        now = timezone.now()
+        for start in range(0, count, batch):
+            Order.objects.bulk_create(
+                Order(
+                    customer_user=customer,
+                    business_user=business,
+                    title=f"Order {start + i}",
+                    revisions=rng.randint(1, 5),
+                    delivery_time_in_days=7,
+                    created_at=now,
+                    due_at=Order.compute_due_at(now, 7),
+                    price=Decimal(rng.randint(500, 50_000)) / 100,
+                    features=["Logo Design", "Flyer"],
+                    offer_type=rng.choice(("basic", "standard", "premium")),
+                    status=rng.choice(statuses),
+                )
+                for i in range(min(batch, count - start))
+            )
+        connection.close_if_unusable_or_obsolete()
+        return business
@@ -0,0 +1,145 @@
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth_app.models import CustomUser
+from core.bench import capture_plans, format_timing, measure, scratch_database
+from orders_app.api.views import OrderListCreateView
+from orders_app.models import Order
+
+
+class LegacyOrderListView(OrderListCreateView):
+    """OrderListCreateView as it was: one OR across both FK columns."""
+
+    def get_queryset(self):
+        user = self.request.user
+        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+
+
+class Command(BaseCommand):
+    """
+    Per-user GET /api/orders/ latency while the orders table grows, for the
+    previous OR query and the current UNION of two index lookups. The probe
+    users keep the same number of orders at every size, so a flat line
+    means the cost does not depend on the table size.
+
+        python manage.py bench_order_list --orders 1000000
+    """
+
+    help = "Per-user order list latency vs. table size, OR vs UNION."
+
+    STATUSES = [status for status, _ in Order.STATUS_CHOICES]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=2_000, help="per role")
+        parser.add_argument("--probe-orders", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--plans", action="store_true", help="print EXPLAIN plans")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        total = options["orders"]
+        checkpoints = sorted({max(total // 100, 1), max(total // 10, 1), total})
+
+        with scratch_database():
+            customers, businesses = self.create_users(options["users"])
+            probe_customer, probe_business = customers[0], businesses[0]
+            self.seed_probe(probe_customer, probe_business, businesses, customers, options["probe_orders"])
+
+            factory = APIRequestFactory()
+            views = [
+                ("OR (before)", LegacyOrderListView.as_view()),
+                ("UNION (after)", OrderListCreateView.as_view()),
+            ]
+            requests = [
+                ("customer, all", probe_customer, {}),
+                ("business, role=business&status=in_progress", probe_business,
+                 {"role": "business", "status": "in_progress"}),
+                ("business, cursor page 2", probe_business, {"pagination": "cursor", "page_size": 10}),
+            ]
+
+            seeded = Order.objects.count()
+            for checkpoint in checkpoints:
+                self.seed(checkpoint - seeded, customers[1:], businesses[1:], rng)
+                seeded = checkpoint
+                self.stdout.write(f"\n{seeded:,} orders")
+                for label, user, params in requests:
+                    self.stdout.write(f"  {label}")
+                    for view_label, view in views:
+                        timing = measure(
+                            lambda: self.request(factory, view, user, params),
+                            repeat=options["repeat"],
+                        )
+                        self.stdout.write(format_timing(f"    {view_label}", timing))
+
+            if options["plans"]:
+                for view_label, view in views:
+                    self.stdout.write(f"\nPlans – {view_label}")
+                    for sql, plan in capture_plans(
+                        lambda: self.request(factory, view, probe_business, {})
+                    ):
+                        self.stdout.write(f"  {sql[:120]}…")
+                        for line in plan:
+                            self.stdout.write(f"    {line}")
+
+    def request(self, factory, view, user, params):
+        request = factory.get("/api/orders/", params)
+        force_authenticate(request, user=user)
+        response = view(request)
+        if params.get("pagination") == "cursor" and response.data["next"]:
+            request = factory.get(response.data["next"])
+            force_authenticate(request, user=user)
+            response = view(request)
+        response.render()
+        assert response.status_code == 200, response.status_code
+        return response
+
+    def create_users(self, count):
+        customers = CustomUser.objects.bulk_create(
+            CustomUser(username=f"bench-customer-{i}", type="customer") for i in range(count)
+        )
+        businesses = CustomUser.objects.bulk_create(
+            CustomUser(username=f"bench-business-{i}", type="business") for i in range(count)
+        )
+        return customers, businesses
+
+    def seed_probe(self, customer, business, businesses, customers, count):
+        Order.objects.bulk_create(
+            [self.order(customer, businesses[1 + i % (len(businesses) - 1)], self.STATUSES[i % 3])
+             for i in range(count)]
+            + [self.order(customers[1 + i % (len(customers) - 1)], business, self.STATUSES[i % 3])
+               for i in range(count)]
+        )
+
+    def seed(self, count, customers, businesses, rng):
+        if count <= 0:
+            return
+        self.stdout.write(f"\nSeeding {count:,} orders ...")
+        batch = 10_000
+        for start in range(0, count, batch):
+            Order.objects.bulk_create(
+                self.order(rng.choice(customers), rng.choice(businesses), rng.choice(self.STATUSES))
+                for _ in range(min(batch, count - start))
+            )
+
+    def order(self, customer, business, status):
+        now = timezone.now()
+        return Order(
+            customer_user=customer,
+            business_user=business,
+            title="Bench order",
+            revisions=1,
+            delivery_time_in_days=5,
+            created_at=now,
+            due_at=Order.compute_due_at(now, 5),
+            price=Decimal("100.00"),
+            features=["Feature"],
+            offer_type="basic",
+            status=status,
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders_app.idempotency import retention
+from orders_app.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Deletes stored Idempotency-Key responses older than the retention
+    window (settings.ORDER_IDEMPOTENCY_TTL, default 24 h). Expired keys are
+    already ignored by the API; this only keeps the table small.
+
+        python manage.py purge_idempotency_keys
+    """
+
+    help = "Delete expired Idempotency-Key records."
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(
+            created_at__lt=timezone.now() - retention()
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired key(s)."))
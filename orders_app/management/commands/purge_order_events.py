@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders_app.models import OrderEvent
+
+
+class Command(BaseCommand):
+    """
+    Trims the order event outbox. Clients that were offline for longer
+    than the kept window resume from the oldest remaining event and
+    should reload their order list.
+
+        python manage.py purge_order_events --days 7
+    """
+
+    help = "Delete order events older than --days (default 7)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = OrderEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} order event(s)."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from orders_app.counters import STATUSES, recount
+from orders_app.models import BusinessOrderCounter
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds BusinessOrderCounter from the orders table and reports rows
+    that had drifted (e.g. after raw SQL or bulk writes that bypassed the
+    counter updates). Safe to re-run at any time.
+
+        python manage.py reconcile_order_counters
+        python manage.py reconcile_order_counters --business-user 7
+    """
+
+    help = "Recompute the per-business order counters from the orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--business-user",
+            action="append",
+            type=int,
+            dest="business_user_ids",
+            help="Only reconcile the given business user id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        ids = options["business_user_ids"]
+        counters = BusinessOrderCounter.objects.all()
+        if ids:
+            counters = counters.filter(pk__in=ids)
+
+        with transaction.atomic():
+            before = {row[0]: row[1:] for row in counters.values_list("pk", *STATUSES)}
+            written = recount(ids)
+            # rows of users that are no longer business users
+            removed, _ = counters.exclude(business_user__type="business").delete()
+            after = {row[0]: row[1:] for row in counters.values_list("pk", *STATUSES)}
+
+        drifted = [pk for pk, values in after.items() if before.get(pk) != values]
+        for pk in drifted[:20]:
+            self.stdout.write(f"  business user {pk}: {before.get(pk)} → {after[pk]}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {written} counter(s): {len(drifted)} corrected, {removed} removed."
+            )
+        )
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+STATUSES = ('in_progress', 'completed', 'cancelled')
+
+
+def backfill_order_counters(apps, schema_editor):
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+    BusinessOrderCounter = apps.get_model('orders_app', 'BusinessOrderCounter')
+    counts = CustomUser.objects.filter(type='business').values('pk').annotate(
+        **{
+            status: Count('business_orders', filter=Q(business_orders__status=status))
+            for status in STATUSES
+        }
+    ).values_list('pk', *STATUSES)
+    BusinessOrderCounter.objects.bulk_create(
+        BusinessOrderCounter(business_user_id=pk, **dict(zip(STATUSES, values)))
+        for pk, *values in counts.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0009_customuser_customuser_type_created_idx'),
+        ('orders_app', '0003_order_order_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_order_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0006_orderevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('revisions', models.IntegerField()),
+                ('delivery_time_in_days', models.IntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('features', models.JSONField(default=list)),
+                ('offer_type', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='business_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_business_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='customer_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['business_user', 'status'], name='archived_business_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['customer_user', 'status'], name='archived_customer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['created_at', 'id'], name='archived_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_due_at(apps, schema_editor):
+    for name in ("Order", "ArchivedOrder"):
+        model = apps.get_model("orders_app", name)
+        batch = []
+        for order in model.objects.only("created_at", "delivery_time_in_days").iterator(chunk_size=2000):
+            order.due_at = order.created_at + timedelta(days=order.delivery_time_in_days)
+            batch.append(order)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ["due_at"])
+                batch = []
+        model.objects.bulk_update(batch, ["due_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0007_archivedorder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='due_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='due_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_due_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='order',
+            name='due_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='archivedorder',
+            name='due_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status', 'due_at'], name='order_business_due_idx'),
+        ),
+    ]
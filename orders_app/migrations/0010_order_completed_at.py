@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_completed_at(apps, schema_editor):
+    """
+    Completed orders get the time of their last transition to 'completed'
+    from the event outbox; orders whose events were already purged fall
+    back to updated_at (what the rollups used so far).
+    """
+    OrderEvent = apps.get_model('orders_app', 'OrderEvent')
+    completion = (
+        OrderEvent.objects.filter(
+            order_id=OuterRef('pk'),
+            kind__in=('created', 'status_changed'),
+            payload__status='completed',
+        )
+        .order_by('-id')
+        .values('created_at')[:1]
+    )
+    for name in ('Order', 'ArchivedOrder'):
+        model = apps.get_model('orders_app', name)
+        model.objects.filter(status='completed').update(
+            completed_at=Coalesce(Subquery(completion), 'updated_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0009_order_created_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorder',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_completed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['completed_at'], name='archived_completed_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['completed_at'], name='order_completed_at_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 
 class Order(models.Model):
     """
@@ -53,12 +57,238 @@ class Order(models.Model):
     )
     # Current status of the order (progress tracking)
 
-    created_at = models.DateTimeField(auto_now_add=True)
-    # Timestamp when the order was created
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Timestamp when the order was created – set on instantiation (not by
+    # auto_now_add at insert time) so due_at can be derived from it exactly
 
     updated_at = models.DateTimeField(auto_now=True)
     # Timestamp when the order was last updated
 
+    due_at = models.DateTimeField()
+    # created_at + delivery_time_in_days, stored so overdue / due-soon
+    # lookups are an index range instead of date arithmetic per row
+
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set when the status turns 'completed', cleared when it leaves it –
+    # later edits move updated_at but not this (daily rollups count by it)
+
+    class Meta:
+        indexes = [
+            # Order counts / dashboards: WHERE business_user_id = ? AND status = ?
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            # Same access pattern from the customer side
+            models.Index(fields=['customer_user', 'status'], name='order_customer_status_idx'),
+            # Keyset pagination key of the order list
+            models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+            # Archival: finished orders by age
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+            # Overdue / due-soon orders of a business: status = ? AND due_at < ?
+            models.Index(fields=['business_user', 'status', 'due_at'], name='order_business_due_idx'),
+            # Daily rollups: completed orders by completion time
+            models.Index(fields=['completed_at'], name='order_completed_at_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.due_at is None:
+            self.due_at = self.compute_due_at(self.created_at, self.delivery_time_in_days)
+        if self.status != "completed":
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def compute_due_at(created_at, delivery_time_in_days):
+        return created_at + timedelta(days=delivery_time_in_days)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored side / status so counters can move on save
+        instance._loaded_counter_key = (
+            instance.__dict__.get("business_user_id"),
+            instance.__dict__.get("status"),
+        )
+        return instance
+
     def __str__(self):
         return self.title
         # Human-readable representation of the order (mainly used in Django admin)
+
+
+class ArchivedOrder(models.Model):
+    """
+    Cold storage for finished (completed / cancelled) orders, moved out of
+    Order by `archive_orders` so live dashboard queries only touch open
+    and recent orders.
+
+    Rows keep their original Order id, so ids stay unique across both
+    tables and clients can merge them (GET /api/orders/?include_archived=true).
+    They still count in BusinessOrderCounter.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    # The id the order had in the live table
+
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_customer_orders'
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_business_orders'
+    )
+
+    # Snapshot of the order, same meaning as on Order
+    title = models.CharField(max_length=255)
+    revisions = models.IntegerField()
+    delivery_time_in_days = models.IntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    due_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+    # When the order was moved here
+
+    class Meta:
+        indexes = [
+            # The same per-side lookups as the live table
+            models.Index(fields=['business_user', 'status'], name='archived_business_status_idx'),
+            models.Index(fields=['customer_user', 'status'], name='archived_customer_status_idx'),
+            models.Index(fields=['created_at', 'id'], name='archived_created_id_idx'),
+            models.Index(fields=['completed_at'], name='archived_completed_at_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class BusinessOrderCounter(models.Model):
+    """
+    Materialised order counts per business user and status.
+
+    Kept in step with Order inside the same transaction (see
+    orders_app.counters), so the order-count endpoints are a single
+    primary-key read instead of a COUNT(*) over the orders table.
+    `reconcile_order_counters` rebuilds the table from the orders.
+    """
+
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='order_counter'
+    )
+    # The business user these counts belong to
+
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    # One column per Order.STATUS_CHOICES value
+
+    updated_at = models.DateTimeField(auto_now=True)
+    # Timestamp of the last counter change
+
+    def __str__(self):
+        return (
+            f"{self.business_user_id}: {self.in_progress} in progress, "
+            f"{self.completed} completed, {self.cancelled} cancelled"
+        )
+
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a write sent with an `Idempotency-Key` header.
+
+    A retry with the same key (and the same request) within the retention
+    window gets this response replayed instead of repeating the write.
+    See orders_app.idempotency.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    # Keys are scoped per user – two clients may pick the same key
+
+    key = models.CharField(max_length=255)
+    # The client-chosen Idempotency-Key header value
+
+    request_hash = models.CharField(max_length=64)
+    # SHA-256 of method, path and body – a reused key with a different request is refused
+
+    status_code = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    # The successful response to replay
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Start of the retention window; also drives purge_idempotency_keys
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key} ({self.status_code})"
+
+
+class OrderEvent(models.Model):
+    """
+    Outbox of order changes, written in the same transaction as the change.
+
+    Streamed to the two parties of the order by the SSE endpoint
+    (/api/orders/events/); the auto-increment id doubles as the SSE event
+    id, so clients resume with Last-Event-ID. Rows outlive their order and
+    are trimmed by purge_order_events.
+    """
+
+    CREATED = 'created'
+    STATUS_CHANGED = 'status_changed'
+    DELETED = 'deleted'
+    KIND_CHOICES = [
+        (CREATED, 'Created'),
+        (STATUS_CHANGED, 'Status changed'),
+        (DELETED, 'Deleted'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    order_id = models.BigIntegerField()
+    # Plain id – the event must survive the deletion of its order
+
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    # Recipients; no FK constraint so a deleted user does not block the outbox
+
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    # Order snapshot (status, previous_status, title, price, ...)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # "events of user X after id N" from either side
+            models.Index(fields=['business_user', 'id'], name='orderevent_business_id_idx'),
+            models.Index(fields=['customer_user', 'id'], name='orderevent_customer_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} order {self.order_id}"
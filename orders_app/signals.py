@@ -0,0 +1,62 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+from orders_app import counters, events
+from orders_app.models import BusinessOrderCounter, Order, OrderEvent
+
+
+# Registered before the counter handlers, which reset _loaded_counter_key.
+@receiver(post_save, sender=Order)
+def record_saved_order_event(sender, instance, created, raw=False, **kwargs):
+    """Outbox entry for a new order or a status change (other edits are silent)."""
+    if raw:
+        return
+    if created:
+        events.record(OrderEvent.CREATED, [instance])
+        return
+    loaded = getattr(instance, "_loaded_counter_key", None)
+    previous_status = loaded[1] if loaded else None
+    if previous_status != instance.status:
+        events.record(OrderEvent.STATUS_CHANGED, [instance], previous_status=previous_status)
+
+
+@receiver(post_delete, sender=Order)
+def record_deleted_order_event(sender, instance, **kwargs):
+    events.record(OrderEvent.DELETED, [instance])
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, raw=False, **kwargs):
+    """Moves the business counters along with a created / re-statused order."""
+    if raw:
+        return
+    old = None if created else getattr(instance, "_loaded_counter_key", None)
+    new = (instance.business_user_id, instance.status)
+    if old is None and not created:
+        # loaded without from_db (e.g. constructed by hand) – be safe
+        counters.recount([instance.business_user_id])
+    else:
+        counters.apply_change(old, new)
+    instance._loaded_counter_key = new
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, origin=None, **kwargs):
+    old = getattr(instance, "_loaded_counter_key", None) or (
+        instance.business_user_id, instance.status
+    )
+    # When a user is deleted its counter row may already be gone – do not
+    # rebuild a row that would point at the user being removed.
+    from_user_delete = isinstance(origin, CustomUser) or (
+        isinstance(origin, QuerySet) and origin.model is CustomUser
+    )
+    counters.apply_change(old, None, rebuild_missing=not from_user_delete)
+
+
+@receiver(post_save, sender=CustomUser)
+def create_order_counter(sender, instance, created, raw=False, **kwargs):
+    """New business users start with an all-zero counter row."""
+    if created and not raw and instance.type == "business":
+        BusinessOrderCounter.objects.get_or_create(business_user=instance)
@@ -0,0 +1,420 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from rest_framework.authtoken.models import Token
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from orders_app import export
+from orders_app.models import (
+    ArchivedOrder, BusinessOrderCounter, IdempotencyKey, Order, OrderEvent,
+)
+
+
+def make_order(customer, business, status="in_progress"):
+    return Order.objects.create(
+        customer_user=customer,
+        business_user=business,
+        title="Logo",
+        revisions=1,
+        delivery_time_in_days=5,
+        price=Decimal("100.00"),
+        features=["Logo"],
+        offer_type="basic",
+        status=status,
+    )
+
+
+class OrderListTests(TestCase):
+    """GET /api/orders/ returns both sides of the requester, filterable by role / status."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        cls.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        cls.other = CustomUser.objects.create_user(username="other", password="pw", type="business")
+        cls.bought = make_order(cls.customer, cls.other)
+        cls.sold = make_order(cls.other, cls.business, status="completed")
+        cls.own = make_order(cls.customer, cls.business)
+        make_order(cls.other, cls.other)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def ids(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/orders/", params)
+        self.assertEqual(response.status_code, 200)
+        return [order["id"] for order in response.data]
+
+    def test_role_and_status_filters(self):
+        self.assertEqual(self.ids(self.customer), [self.bought.id, self.own.id])
+        self.assertEqual(self.ids(self.business), [self.sold.id, self.own.id])
+        self.assertEqual(self.ids(self.business, role="customer"), [])
+        self.assertEqual(self.ids(self.business, role="business", status="completed"), [self.sold.id])
+        self.assertEqual(self.ids(self.customer, status="in_progress"), [self.bought.id, self.own.id])
+
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get("/api/orders/", {"role": "admin"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/orders/", {"status": "lost"}).status_code, 400)
+
+    def test_due_filters(self):
+        self.assertEqual(self.own.due_at, self.own.created_at + timedelta(days=5))
+        self.own.refresh_from_db()
+        self.assertEqual(self.own.due_at, self.own.created_at + timedelta(days=5))
+        Order.objects.filter(pk=self.own.pk).update(due_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(self.ids(self.business, overdue="true"), [self.own.id])
+        self.assertEqual(self.ids(self.customer, overdue="true"), [self.own.id])
+        self.assertEqual(self.ids(self.customer, due_within="6"), [self.bought.id])
+        self.assertEqual(self.ids(self.customer, due_within="1"), [])
+
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get("/api/orders/", {"due_within": "0"}).status_code, 400)
+        self.assertEqual(
+            self.client.get("/api/orders/", {"due_within": "3", "overdue": "true"}).status_code, 400
+        )
+
+    @override_settings(API_LIST_MAX_ROWS=1)
+    def test_plain_list_is_capped_with_a_next_link(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get("/api/orders/")
+        self.assertEqual([order["id"] for order in response.data], [self.bought.id])
+        self.assertEqual(response["Link"], '<http://testserver/api/orders/?offset=1>; rel="next"')
+
+        response = self.client.get("/api/orders/", {"offset": 1})
+        self.assertEqual([order["id"] for order in response.data], [self.own.id])
+        self.assertFalse(response.has_header("Link"))
+
+
+class BusinessOrderCounterTests(TestCase):
+    """Order writes move the counters; the count endpoints read one row."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def counts(self):
+        counter = BusinessOrderCounter.objects.get(pk=self.business.pk)
+        return counter.in_progress, counter.completed, counter.cancelled
+
+    def test_writes_keep_counters_in_step(self):
+        self.assertEqual(self.counts(), (0, 0, 0))
+        first = make_order(self.customer, self.business)
+        second = make_order(self.customer, self.business)
+        self.assertEqual(self.counts(), (2, 0, 0))
+
+        business_client = APIClient()
+        business_client.force_authenticate(self.business)
+        response = business_client.patch(
+            f"/api/orders/{first.id}/", {"status": "completed"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counts(), (1, 1, 0))
+
+        second.delete()
+        self.assertEqual(self.counts(), (0, 1, 0))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/completed-order-count/{self.business.pk}/")
+        self.assertEqual(response.data, {"completed_order_count": 1})
+        response = self.client.get(f"/api/order-count/{self.customer.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_or_drifted_rows_are_rebuilt(self):
+        make_order(self.customer, self.business, status="cancelled")
+        BusinessOrderCounter.objects.filter(pk=self.business.pk).update(cancelled=7)
+        call_command("reconcile_order_counters", stdout=StringIO())
+        self.assertEqual(self.counts(), (0, 0, 1))
+
+        BusinessOrderCounter.objects.all().delete()
+        response = self.client.get(f"/api/order-count/{self.business.pk}/")
+        self.assertEqual(response.data, {"order_count": 0})
+        self.assertEqual(self.counts(), (0, 0, 1))
+
+    def test_decrement_of_a_drifted_count_stops_at_zero(self):
+        order = make_order(self.customer, self.business)
+        BusinessOrderCounter.objects.filter(pk=self.business.pk).update(in_progress=0)
+
+        business_client = APIClient()
+        business_client.force_authenticate(self.business)
+        response = business_client.patch(
+            f"/api/orders/{order.id}/", {"status": "completed"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counts(), (0, 1, 0))
+
+    def test_batch_endpoint_reports_unknown_ids(self):
+        other = CustomUser.objects.create_user(username="biz2", password="pw", type="business")
+        make_order(self.customer, self.business)
+        make_order(self.customer, other, status="completed")
+
+        ids = f"{other.pk},{self.business.pk},{self.customer.pk},999"
+        # counter rows + one GROUP BY recount (in a savepoint) for the two misses
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/order-counts/", {"business_user_ids": ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"business_user_id": other.pk, "order_count": 0, "completed_order_count": 1},
+                {"business_user_id": self.business.pk, "order_count": 1, "completed_order_count": 0},
+            ],
+        )
+        self.assertEqual(response.data["not_found"], [self.customer.pk, 999])
+
+        response = self.client.get("/api/order-counts/", {"business_user_ids": "1,x"})
+        self.assertEqual(response.status_code, 400)
+        too_many = ",".join(str(i) for i in range(301))
+        response = self.client.get("/api/order-counts/", {"business_user_ids": too_many})
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderCreateTests(TestCase):
+    """Bulk checkout is all-or-nothing; Idempotency-Key retries are replayed."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        offer = Offer.objects.create(user=self.business, title="Logo", description="-")
+        self.tiers = OfferDetail.objects.bulk_create(
+            OfferDetail(
+                offer=offer, title=offer_type, revisions=1, delivery_time_in_days=5,
+                price=Decimal("100.00") * (i + 1), features=["Logo"], offer_type=offer_type,
+            )
+            for i, offer_type in enumerate(("basic", "standard", "premium"))
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def post(self, payload, **headers):
+        return self.client.post("/api/orders/", payload, format="json", headers=headers)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        ids = [tier.id for tier in self.tiers]
+        # tiers, savepoint, order INSERT, counter UPDATE, event INSERT, release
+        with self.assertNumQueries(6):
+            response = self.post({"offer_detail_ids": ids + [ids[0]]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([order["price"] for order in response.data], ["100.00", "200.00", "300.00", "100.00"])
+        self.assertEqual(BusinessOrderCounter.objects.get(pk=self.business.pk).in_progress, 4)
+        for order in Order.objects.all():
+            self.assertEqual(order.due_at, order.created_at + timedelta(days=5))
+
+        response = self.post({"offer_detail_ids": [ids[1], 999]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Order.objects.count(), 4)
+        self.assertEqual(self.post({"offer_detail_ids": ["x"]}).status_code, 400)
+
+    def test_idempotency_key_replays_the_first_response(self):
+        payload = {"offer_detail_id": self.tiers[0].id}
+        first = self.post(payload, **{"Idempotency-Key": "checkout-1"})
+        retry = self.post(payload, **{"Idempotency-Key": "checkout-1"})
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+        reused = self.post({"offer_detail_id": self.tiers[1].id}, **{"Idempotency-Key": "checkout-1"})
+        self.assertEqual(reused.status_code, 422)
+
+        # failures are not stored; an expired key runs again
+        self.assertEqual(self.post({"offer_detail_id": 999}, **{"Idempotency-Key": "k2"}).status_code, 404)
+        self.assertEqual(self.post(payload, **{"Idempotency-Key": "k2"}).status_code, 201)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.assertNotIn("Idempotent-Replayed", self.post(payload, **{"Idempotency-Key": "checkout-1"}))
+        self.assertEqual(Order.objects.count(), 3)
+
+
+@override_settings(ORDER_EVENTS_STREAM_SECONDS=0)
+class OrderEventStreamTests(TestCase):
+    """Order writes land in the outbox; the SSE stream replays them per user."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.token = Token.objects.create(user=self.business).key
+        order = make_order(self.customer, self.business)
+        order.status = "completed"
+        order.save()
+        self.first_id = OrderEvent.objects.earliest("id").id
+        make_order(self.customer, self.customer)  # not visible to the business user
+        order.delete()
+
+    async def read(self, **params):
+        response = await self.async_client.get(
+            "/api/orders/events/", params, headers={"Authorization": f"Token {self.token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        return [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+
+    async def test_stream_resumes_after_last_event_id(self):
+        self.assertEqual(
+            await self.read(last_event_id=0), ["created", "status_changed", "deleted"]
+        )
+        self.assertEqual(
+            await self.read(last_event_id=self.first_id), ["status_changed", "deleted"]
+        )
+        self.assertEqual(await self.read(), [])  # no id: only what happens next
+        self.assertEqual(await self.read(last_event_id=0, role="customer"), [])
+
+        response = await self.async_client.get("/api/orders/events/", {"token": self.token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_ticket_opens_the_stream_instead_of_the_token(self):
+        response = await self.async_client.post(
+            "/api/orders/events/ticket/", headers={"Authorization": f"Token {self.token}"}
+        )
+        self.assertEqual(response.status_code, 201)
+        ticket = response.json()["ticket"]
+        self.assertNotIn(self.token, ticket)
+
+        response = await self.async_client.get("/api/orders/events/", {"ticket": ticket, "last_event_id": 0})
+        self.assertEqual(response.status_code, 200)
+        for bad in (ticket + "x", "nope"):
+            response = await self.async_client.get("/api/orders/events/", {"ticket": bad})
+            self.assertEqual(response.status_code, 401)
+        with self.settings(ORDER_EVENTS_TICKET_SECONDS=-1):  # already expired
+            response = await self.async_client.get("/api/orders/events/", {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_commit_lag_holds_back_recent_events(self):
+        with self.settings(ORDER_EVENTS_COMMIT_LAG_SECONDS=60):
+            self.assertEqual(await self.read(last_event_id=0), [])
+            await OrderEvent.objects.filter(id=self.first_id).aupdate(
+                created_at=timezone.now() - timedelta(minutes=2)
+            )
+            self.assertEqual(await self.read(last_event_id=0), ["created"])
+
+
+class OrderArchiveTests(TestCase):
+    """Old finished orders move to the archive without changing counts."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.old = [make_order(self.customer, self.business, status) for status in ("completed", "cancelled")]
+        self.open = make_order(self.customer, self.business)
+        self.recent = make_order(self.customer, self.business, "completed")
+        Order.objects.filter(pk__in=[o.pk for o in self.old] + [self.open.pk]).update(
+            updated_at=timezone.now() - timedelta(days=400)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+
+    def test_archive_moves_finished_orders_only(self):
+        events = OrderEvent.objects.count()
+        out = StringIO()
+        call_command("archive_orders", "--batch-size", "1", stdout=out)
+        self.assertIn("Archived 2 order(s)", out.getvalue())
+
+        self.assertEqual(
+            sorted(Order.objects.values_list("pk", flat=True)), [self.open.pk, self.recent.pk]
+        )
+        self.assertEqual(ArchivedOrder.objects.get(pk=self.old[0].pk).status, "completed")
+        self.assertEqual(OrderEvent.objects.count(), events)
+
+        call_command("reconcile_order_counters", stdout=StringIO())
+        counter = BusinessOrderCounter.objects.get(pk=self.business.pk)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (1, 2, 1))
+
+        live = [order["id"] for order in self.client.get("/api/orders/").data]
+        self.assertEqual(live, [self.open.pk, self.recent.pk])
+        response = self.client.get("/api/orders/", {"include_archived": "true"})
+        self.assertEqual(
+            [(order["id"], order["archived_at"] is not None) for order in response.data],
+            [(self.old[0].pk, True), (self.old[1].pk, True), (self.open.pk, False), (self.recent.pk, False)],
+        )
+
+        with override_settings(API_LIST_MAX_ROWS=3):
+            response = self.client.get("/api/orders/", {"include_archived": "true", "offset": 2})
+        self.assertEqual([order["id"] for order in response.data], [self.open.pk, self.recent.pk])
+        self.assertFalse(response.has_header("Link"))
+
+        ids, url = [], "/api/orders/?include_archived=true&pagination=cursor&page_size=3"
+        while url:
+            page = self.client.get(url).data
+            ids += [order["id"] for order in page["results"]]
+            url = page["next"]
+        self.assertEqual(ids, [self.recent.pk, self.open.pk, self.old[1].pk, self.old[0].pk])
+
+
+class OrderExportTests(TestCase):
+    """/api/orders/export/ streams live and archived orders of the business user."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        other = CustomUser.objects.create_user(username="other", password="pw", type="business")
+        self.old = make_order(self.customer, self.business, "completed")
+        self.order = make_order(self.customer, self.business)
+        make_order(self.customer, other)
+        Order.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(days=400))
+        call_command("archive_orders", stdout=StringIO())
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_includes_archived_orders(self):
+        response = self.client.get("/api/orders/export/", {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        lines = self.read(response).splitlines()
+        self.assertTrue(lines[0].startswith("id,created_at,updated_at,status,"))
+        self.assertEqual([line.split(",")[0] for line in lines[1:]], [str(self.old.pk), str(self.order.pk)])
+        self.assertTrue(lines[1].endswith(",1"))
+
+    def test_ndjson_since_filter(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        response = self.client.get("/api/orders/export/", {"format": "ndjson", "since": since})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([(row["id"], row["archived"]) for row in rows], [(self.order.pk, False)])
+
+    def test_formula_like_titles_are_quoted(self):
+        titles = ["=1+1", "\tcmd", "\rcmd", "-x", "Logo - Flyer"]
+        Order.objects.filter(pk=self.order.pk).delete()
+        for title in titles:
+            order = make_order(self.customer, self.business)
+            Order.objects.filter(pk=order.pk).update(title=title)
+        rows = list(csv.reader(io.StringIO(self.read(self.client.get("/api/orders/export/")), newline="")))
+        self.assertEqual(
+            [row[4] for row in rows[2:]], ["'=1+1", "'\tcmd", "'\rcmd", "'-x", "Logo - Flyer"]
+        )
+
+    async def test_asgi_response_streams_in_chunks(self):
+        token = await Token.objects.acreate(user=self.business)
+        with mock.patch.object(export, "ROWS_PER_WRITE", 1):
+            response = await self.async_client.get(
+                "/api/orders/export/", {"format": "ndjson"}, headers={"Authorization": f"Token {token.key}"}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(
+            [json.loads(chunk)["id"] for chunk in chunks], [self.old.pk, self.order.pk]
+        )
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/api/orders/export/", {"format": "xml"}).status_code, 400)
+        self.assertEqual(
+            self.client.get("/api/orders/export/", {"format": "csv", "since": "soon"}).status_code, 400
+        )
@@ -1,6 +1,9 @@
 # profiles_app/api/serializers.py
 from rest_framework import serializers
 from auth_app.models import CustomUser
+from profiles_app.models import BusinessRanking
+from reviews_app.api.serializers import BusinessRatingSummarySerializer
+from reviews_app.summaries import get_summary
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -11,6 +14,8 @@ class ProfileSerializer(serializers.ModelSerializer):
       are never null – they fall back to an empty string.
     • email is writable (PATCH) but always returned.
     • created_at is always included (ISO 8601).
+    • rating is the BusinessRatingSummary of business users, null for
+      customers; list views select_related("rating_summary").
     """
 
     user = serializers.IntegerField(source="id", read_only=True)
@@ -24,6 +29,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     description    = serializers.CharField(allow_blank=True, default="")
     working_hours  = serializers.CharField(allow_blank=True, default="")
     email = serializers.EmailField(required=False)
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model  = CustomUser
@@ -40,9 +46,20 @@ class ProfileSerializer(serializers.ModelSerializer):
             "type",
             "email",
             "created_at",
+            "rating",
         ]
         read_only_fields = ["user", "username", "type", "created_at"]
 
+    def get_rating(self, instance):
+        if instance.type != "business":
+            return None
+        summary = getattr(instance, "rating_summary", None) or get_summary(instance.pk)
+        if summary is None:
+            return None
+        data = BusinessRatingSummarySerializer(summary).data
+        del data["business_user"]
+        return data
+
     # never return null strings
     def to_representation(self, instance):
         rep = super().to_representation(instance)
@@ -59,3 +76,34 @@ class ProfileSerializer(serializers.ModelSerializer):
         if rep["created_at"] is None:
             rep["created_at"] = ""
         return rep
+
+
+class BusinessRankingSerializer(serializers.ModelSerializer):
+    """
+    One leaderboard entry: the rank within the requested page sequence,
+    a short profile of the business and the precomputed score inputs.
+    """
+
+    rank = serializers.IntegerField(read_only=True)
+    user = serializers.IntegerField(source="business_user_id", read_only=True)
+    username = serializers.CharField(source="business_user.username", read_only=True)
+    first_name = serializers.CharField(source="business_user.first_name", read_only=True, default="")
+    last_name = serializers.CharField(source="business_user.last_name", read_only=True, default="")
+    file = serializers.CharField(source="business_user.file", read_only=True)
+
+    class Meta:
+        model = BusinessRanking
+        fields = [
+            "rank",
+            "user",
+            "username",
+            "first_name",
+            "last_name",
+            "file",
+            "score",
+            "bayesian_rating",
+            "average_rating",
+            "review_count",
+            "completed_orders",
+        ]
+        read_only_fields = fields
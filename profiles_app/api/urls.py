@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import UserProfileView, BusinessUserListView, CustomerUserListView
+from .views import UserProfileView, BusinessUserListView, CustomerUserListView, TopBusinessListView
 
 urlpatterns = [
     path('profile/<int:pk>/', UserProfileView.as_view(), name='user-profile'),
     path('profiles/business/', BusinessUserListView.as_view(), name='business-users'),
+    path('profiles/business/top/', TopBusinessListView.as_view(), name='business-top'),
     path('profiles/customer/', CustomerUserListView.as_view(), name='customer-users'),
 ]
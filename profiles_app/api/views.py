@@ -1,13 +1,17 @@
 # profiles_app/api/views.py
 from rest_framework.generics import RetrieveUpdateAPIView, ListAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.pagination import PageNumberPagination
 from auth_app.models import CustomUser
-from .serializers import ProfileSerializer
+from core.conditional import ConditionalRequestMixin
+from core.pagination import KeysetPagination
+from profiles_app.models import BusinessRanking
+from .serializers import BusinessRankingSerializer, ProfileSerializer
 from .permissions import IsProfileOwnerOrReadOnly       
 
 
-class UserProfileView(RetrieveUpdateAPIView):
+class UserProfileView(ConditionalRequestMixin, RetrieveUpdateAPIView):
     """
     • **GET   /api/profile/<id>/**  
       Any authenticated user can read every profile.
@@ -17,11 +21,22 @@ class UserProfileView(RetrieveUpdateAPIView):
 
     The object-level permission `IsProfileOwnerOrReadOnly` enforces the rule,
     but we add an explicit check in `update()` as an extra guard.
+
+    ETag / Last-Modified come from CustomUser.updated_at and the rating
+    summary: 304 on conditional GET, 412 on a PATCH whose If-Match no
+    longer matches.
     """
-    queryset           = CustomUser.objects.all()
+    queryset           = CustomUser.objects.select_related("rating_summary")
     serializer_class   = ProfileSerializer
     permission_classes = [IsAuthenticated, IsProfileOwnerOrReadOnly]
     lookup_field       = "pk"
+    validator_fields   = ("updated_at", "rating_summary__updated_at")
+
+    def get_validator_queryset(self):
+        qs = CustomUser.objects.filter(pk=self.kwargs["pk"])
+        if self.request.method not in SAFE_METHODS:
+            qs = qs.filter(pk=self.request.user.pk)
+        return qs
 
     def update(self, request, *args, **kwargs):
         """Refuse updates on foreign profiles before DRF hits the serializer."""
@@ -33,20 +48,54 @@ class UserProfileView(RetrieveUpdateAPIView):
 class BusinessUserListView(ListAPIView):
     """
     GET /api/profiles/business/ – list all business accounts (auth required)
+    ?pagination=cursor pages through them by (created_at, id).
     """
     serializer_class   = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class   = KeysetPagination
+    keyset_ordering    = ("created_at", "id")
+
+    def get_queryset(self):
+        return CustomUser.objects.filter(type="business").select_related("rating_summary")
+
+
+class LeaderboardPagination(PageNumberPagination):
+    """20 entries per page – ?page=, ?page_size= (max 100)."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class TopBusinessListView(ListAPIView):
+    """
+    GET /api/profiles/business/top/ – business accounts by leaderboard score
+    (auth required). Reads the precomputed BusinessRanking table in index
+    order; equal scores are ordered by business user id (longest registered
+    first). Each entry carries its 1-based `rank`.
+    """
+    serializer_class   = BusinessRankingSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class   = LeaderboardPagination
 
     def get_queryset(self):
-        return CustomUser.objects.filter(type="business")
+        return BusinessRanking.objects.select_related("business_user").order_by("-score", "business_user_id")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        for rank, entry in enumerate(page, start=self.paginator.page.start_index()):
+            entry.rank = rank
+        return page
 
 
 class CustomerUserListView(ListAPIView):
     """
     GET /api/profiles/customer/ – list all customer accounts (auth required)
+    ?pagination=cursor pages through them by (created_at, id).
     """
     serializer_class   = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class   = KeysetPagination
+    keyset_ordering    = ("created_at", "id")
 
     def get_queryset(self):
         return CustomUser.objects.filter(type="customer")
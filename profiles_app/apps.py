@@ -6,3 +6,7 @@ class ProfilesAppConfig(AppConfig):
 
     # Defines the name of the app used by Django
     name = 'profiles_app'
+
+    def ready(self):
+        # Register signal handlers (business leaderboard refresh)
+        from . import signals  # noqa: F401
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from profiles_app import rankings
+from profiles_app.models import BusinessRanking
+
+
+class Command(BaseCommand):
+    """
+    Re-scores every business against the current site-wide mean rating.
+    Incremental refreshes only touch the businesses whose reviews or
+    orders changed; run this periodically (e.g. nightly) so the others
+    follow the drifting mean.
+
+        python manage.py refresh_business_rankings
+    """
+
+    help = "Recompute the business leaderboard."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = rankings.refresh()
+            # rows of users that are no longer business users
+            removed, _ = BusinessRanking.objects.exclude(business_user__type="business").delete()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {written} ranking(s), {removed} removed."))
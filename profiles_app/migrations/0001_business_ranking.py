@@ -0,0 +1,74 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:38
+
+import math
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def compute_scores(review_count, rating_sum, completed_orders, mean_rating):
+    # the scoring of profiles_app.rankings as of this migration
+    prior = getattr(settings, 'BUSINESS_RANKING_PRIOR_REVIEWS', 5)
+    weight = getattr(settings, 'BUSINESS_RANKING_ORDER_WEIGHT', 0.05)
+    if prior + review_count:
+        bayesian = (prior * mean_rating + rating_sum) / (prior + review_count)
+    else:
+        bayesian = 0.0
+    return bayesian, bayesian * (1 + weight * math.log1p(completed_orders))
+
+
+def backfill_rankings(apps, schema_editor):
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    BusinessRanking = apps.get_model('profiles_app', 'BusinessRanking')
+    totals = BusinessRatingSummary.objects.aggregate(ratings=Sum('rating_sum'), reviews=Sum('review_count'))
+    mean = totals['ratings'] / totals['reviews'] if totals['reviews'] else 0.0
+    rows = CustomUser.objects.filter(type='business').values_list(
+        'pk', 'rating_summary__review_count', 'rating_summary__rating_sum', 'order_counter__completed'
+    )
+    rankings = []
+    for pk, review_count, rating_sum, completed in rows.iterator():
+        review_count, rating_sum, completed = review_count or 0, rating_sum or 0, completed or 0
+        bayesian, score = compute_scores(review_count, rating_sum, completed, mean)
+        rankings.append(BusinessRanking(
+            business_user_id=pk,
+            score=score,
+            bayesian_rating=bayesian,
+            review_count=review_count,
+            average_rating=round(rating_sum / review_count, 1) if review_count else 0,
+            completed_orders=completed,
+        ))
+    BusinessRanking.objects.bulk_create(rankings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('orders_app', '0004_business_order_counter'),
+        ('reviews_app', '0004_business_rating_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('bayesian_rating', models.FloatField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('average_rating', models.FloatField(default=0)),
+                ('completed_orders', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ranking', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['score', 'id'], name='ranking_score_id_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_rankings, migrations.RunPython.noop),
+    ]
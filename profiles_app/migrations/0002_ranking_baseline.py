@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def store_baseline(apps, schema_editor):
+    # the mean the rows written by 0001 were scored against
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    RankingBaseline = apps.get_model('profiles_app', 'RankingBaseline')
+    totals = BusinessRatingSummary.objects.aggregate(ratings=Sum('rating_sum'), reviews=Sum('review_count'))
+    mean = totals['ratings'] / totals['reviews'] if totals['reviews'] else 0.0
+    RankingBaseline.objects.create(pk=1, mean_rating=mean)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0001_business_ranking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean_rating', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='businessranking',
+            name='ranking_score_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='businessranking',
+            index=models.Index(fields=['-score', 'business_user'], name='ranking_score_user_idx'),
+        ),
+        migrations.RunPython(store_baseline, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,60 @@
 from django.db import models
+from auth_app.models import CustomUser
 
-# Create your models here.
+
+class BusinessRanking(models.Model):
+    """
+    Precomputed leaderboard entry of a business user.
+
+    `score` blends a Bayesian average of the reviews with the number of
+    completed orders (see profiles_app.rankings). The row is refreshed
+    whenever the business's rating summary or order counters change, so
+    GET /api/profiles/business/top/ only reads this table in score order.
+    """
+
+    # The ranked business user
+    business_user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='ranking'
+    )
+
+    # Ranking key – higher is better
+    score = models.FloatField(default=0)
+
+    # Average rating pulled towards the site-wide mean for few reviews
+    bayesian_rating = models.FloatField(default=0)
+
+    # Inputs of the score, copied for display
+    review_count = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    completed_orders = models.PositiveIntegerField(default=0)
+
+    # Timestamp of the last refresh
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Leaderboard order: ORDER BY score DESC, business_user_id ASC –
+            # on equal scores the longer-registered business ranks first
+            models.Index(fields=['-score', 'business_user'], name='ranking_score_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.score:.3f}"
+
+
+class RankingBaseline(models.Model):
+    """
+    The site-wide mean rating the leaderboard scores are computed against.
+
+    Written by full refreshes (`refresh_business_rankings`), read by the
+    incremental ones, so re-scoring one business is a primary-key read
+    instead of an aggregate over all rating summaries. Single row, pk 1.
+    """
+
+    mean_rating = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"mean rating {self.mean_rating:.3f}"
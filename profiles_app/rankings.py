@@ -0,0 +1,99 @@
+"""
+Business leaderboard (BusinessRanking).
+
+    bayesian_rating = (C * m + rating_sum) / (C + review_count)
+    score           = bayesian_rating * (1 + W * ln(1 + completed_orders))
+
+m is the site-wide mean rating, C (BUSINESS_RANKING_PRIOR_REVIEWS) the
+number of "virtual" mean reviews every business starts with, so a single
+5-star review does not outrank fifty 4.8-star ones. W
+(BUSINESS_RANKING_ORDER_WEIGHT) adds order volume with diminishing returns.
+
+Rows are refreshed after commit whenever a business's rating summary or
+order counters change, against the m stored in RankingBaseline – one
+primary-key read, not an aggregate over every business. m drifts slowly as
+reviews come in; `refresh_business_rankings` (run nightly) owns it: it
+stores the current mean and recomputes every row against it.
+"""
+
+import math
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from auth_app.models import CustomUser
+from profiles_app.models import BusinessRanking, RankingBaseline
+from reviews_app.models import BusinessRatingSummary
+
+DEFAULT_PRIOR_REVIEWS = 5
+DEFAULT_ORDER_WEIGHT = 0.05
+
+
+def compute_scores(review_count, rating_sum, completed_orders, mean_rating):
+    """Returns (bayesian_rating, score)."""
+    prior = getattr(settings, "BUSINESS_RANKING_PRIOR_REVIEWS", DEFAULT_PRIOR_REVIEWS)
+    weight = getattr(settings, "BUSINESS_RANKING_ORDER_WEIGHT", DEFAULT_ORDER_WEIGHT)
+    if prior + review_count:
+        bayesian = (prior * mean_rating + rating_sum) / (prior + review_count)
+    else:
+        bayesian = 0.0
+    return bayesian, bayesian * (1 + weight * math.log1p(completed_orders))
+
+
+BASELINE_PK = 1
+
+
+def current_mean_rating():
+    """Site-wide mean rating – one SUM over the rating summaries."""
+    totals = BusinessRatingSummary.objects.aggregate(
+        ratings=Sum("rating_sum"), reviews=Sum("review_count")
+    )
+    return totals["ratings"] / totals["reviews"] if totals["reviews"] else 0.0
+
+
+def store_mean_rating():
+    """Stores the current site-wide mean as the scoring baseline and returns it."""
+    mean = current_mean_rating()
+    RankingBaseline.objects.update_or_create(pk=BASELINE_PK, defaults={"mean_rating": mean})
+    return mean
+
+
+def mean_rating():
+    """The stored baseline mean; computed and stored once if there is none yet."""
+    mean = RankingBaseline.objects.filter(pk=BASELINE_PK).values_list("mean_rating", flat=True).first()
+    return store_mean_rating() if mean is None else mean
+
+
+def refresh(business_user_ids=None):
+    """
+    Recomputes the ranking rows of the given business users from their
+    rating summaries and order counters, against the stored mean. None
+    refreshes all business users and first moves the stored mean to the
+    current one. Returns the number of rows written.
+    """
+    users = CustomUser.objects.filter(type="business")
+    if business_user_ids is not None:
+        users = users.filter(pk__in=business_user_ids)
+    rows = users.values_list(
+        "pk", "rating_summary__review_count", "rating_summary__rating_sum", "order_counter__completed"
+    )
+
+    mean = store_mean_rating() if business_user_ids is None else mean_rating()
+    written = 0
+    for pk, review_count, rating_sum, completed in rows.iterator():
+        review_count, rating_sum, completed = review_count or 0, rating_sum or 0, completed or 0
+        bayesian, score = compute_scores(review_count, rating_sum, completed, mean)
+        values = {
+            "score": score,
+            "bayesian_rating": bayesian,
+            "review_count": review_count,
+            "average_rating": round(rating_sum / review_count, 1) if review_count else 0,
+            "completed_orders": completed,
+            "updated_at": timezone.now(),
+        }
+        # one UPDATE for the common case, INSERT only for a new business
+        if not BusinessRanking.objects.filter(business_user_id=pk).update(**values):
+            BusinessRanking.objects.create(business_user_id=pk, **values)
+        written += 1
+    return written
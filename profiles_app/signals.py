@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+from orders_app.counters import counters_changed
+from profiles_app import rankings
+from reviews_app.summaries import summaries_changed
+
+
+@receiver(counters_changed)
+@receiver(summaries_changed)
+def refresh_rankings(sender, business_user_ids, **kwargs):
+    """Re-scores the businesses whose reviews or order counts moved."""
+    rankings.refresh(business_user_ids)
+
+
+@receiver(post_save, sender=CustomUser)
+def rank_new_business(sender, instance, created, raw=False, **kwargs):
+    """New business users enter the leaderboard at the prior score."""
+    if created and not raw and instance.type == "business":
+        transaction.on_commit(lambda: rankings.refresh([instance.pk]))
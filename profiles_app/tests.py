@@ -1,3 +1,108 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from orders_app.models import Order
+from profiles_app import rankings
+from profiles_app.models import BusinessRanking, RankingBaseline
+
+
+@override_settings(BUSINESS_RANKING_PRIOR_REVIEWS=2, BUSINESS_RANKING_ORDER_WEIGHT=0.5)
+class TopBusinessTests(TestCase):
+    """The leaderboard follows reviews and completed orders without aggregating per request."""
+
+    def setUp(self):
+        cache.clear()
+        self.customers = [
+            CustomUser.objects.create_user(username=f"cus{i}", password="pw", type="customer")
+            for i in range(3)
+        ]
+        self.steady = CustomUser.objects.create_user(username="steady", password="pw", type="business")
+        self.lucky = CustomUser.objects.create_user(username="lucky", password="pw", type="business")
+        self.newcomer = CustomUser.objects.create_user(
+            username="new", password="pw", type="business", file="profile_pictures/new.png"
+        )
+        self.client = APIClient()
+
+    def review(self, customer, business, rating):
+        self.client.force_authenticate(customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/reviews/",
+                {"business_user": business.pk, "rating": rating, "description": "Fine"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def top(self, **params):
+        self.client.force_authenticate(self.customers[0])
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/profiles/business/top/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_bayesian_score_ranks_many_good_reviews_above_one_great(self):
+        for customer in self.customers:
+            self.review(customer, self.steady, 4)
+        self.review(self.customers[0], self.lucky, 5)
+        call_command("refresh_business_rankings", stdout=StringIO())
+
+        # mean 4.25: steady (2*4.25 + 12) / 5 = 4.1, lucky (2*4.25 + 5) / 3 = 4.5,
+        # newcomer sits at the mean – the prior outweighs a single review
+        data = self.top()
+        self.assertEqual(
+            [(entry["rank"], entry["username"]) for entry in data["results"]],
+            [(1, "lucky"), (2, "new"), (3, "steady")],
+        )
+        self.assertAlmostEqual(data["results"][2]["bayesian_rating"], 4.1)
+        self.assertEqual(data["results"][1]["file"], "profile_pictures/new.png")
+
+        page = self.top(page=2, page_size=2)["results"]
+        self.assertEqual([(entry["rank"], entry["username"]) for entry in page], [(3, "steady")])
+
+    def test_completed_orders_refresh_the_ranking(self):
+        self.review(self.customers[0], self.newcomer, 3)
+        order = Order.objects.create(
+            customer_user=self.customers[0],
+            business_user=self.newcomer,
+            title="Logo",
+            revisions=1,
+            delivery_time_in_days=5,
+            price=Decimal("100.00"),
+            offer_type="basic",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = "completed"
+            order.save()
+
+        ranking = BusinessRanking.objects.get(business_user=self.newcomer)
+        self.assertEqual((ranking.review_count, ranking.completed_orders), (1, 1))
+        self.assertGreater(ranking.score, ranking.bayesian_rating)
+
+    def test_equal_scores_rank_the_longer_registered_business_first(self):
+        call_command("refresh_business_rankings", stdout=StringIO())
+        data = self.top()
+        self.assertEqual(
+            [(entry["rank"], entry["username"]) for entry in data["results"]],
+            [(1, "steady"), (2, "lucky"), (3, "new")],
+        )
+
+    def test_incremental_refresh_reuses_the_stored_mean(self):
+        self.review(self.customers[0], self.steady, 4)
+        call_command("refresh_business_rankings", stdout=StringIO())
+        self.assertEqual(RankingBaseline.objects.get().mean_rating, 4.0)
+
+        self.review(self.customers[1], self.lucky, 1)
+        # scored against the stored 4.0, not the current 2.5: (2*4 + 1) / 3
+        self.assertAlmostEqual(BusinessRanking.objects.get(business_user=self.lucky).bayesian_rating, 3.0)
+        # baseline read, the business's inputs, one UPDATE – no aggregate
+        with self.assertNumQueries(3):
+            rankings.refresh([self.lucky.pk])
+
+        call_command("refresh_business_rankings", stdout=StringIO())
+        self.assertEqual(RankingBaseline.objects.get().mean_rating, 2.5)
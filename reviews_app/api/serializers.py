@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 
 class ReviewSerializer(serializers.ModelSerializer):
     """
@@ -17,3 +17,24 @@ class ReviewSerializer(serializers.ModelSerializer):
             'created_at',    
             'updated_at'      
         ]
+
+
+class BusinessRatingSummarySerializer(serializers.ModelSerializer):
+    """
+    Read-only rating aggregate of one business user: number of reviews,
+    rating sum, average (one decimal) and reviews per rating.
+    """
+
+    average_rating = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = BusinessRatingSummary
+        fields = [
+            'business_user',
+            'review_count',
+            'rating_sum',
+            'average_rating',
+            'histogram',
+            'updated_at',
+        ]
+        read_only_fields = fields
@@ -1,8 +1,9 @@
 # reviews_app/api/urls.py
 from django.urls import path
-from .views import ReviewListCreateView, ReviewDetailView
+from .views import ReviewListCreateView, ReviewDetailView, RatingSummaryView
 
 urlpatterns = [
     path("reviews/",          ReviewListCreateView.as_view(), name="review-list-create"),
     path("reviews/<int:id>/", ReviewDetailView.as_view(),    name="review-detail"),
+    path("reviews/summary/<int:business_user_id>/", RatingSummaryView.as_view(), name="review-summary"),
 ]
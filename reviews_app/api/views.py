@@ -1,14 +1,20 @@
 # reviews_app/api/views.py
+from django.db import IntegrityError, transaction
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
+from rest_framework.views import APIView
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework import status
 
+from core.conditional import ConditionalRequestMixin
+from core.pagination import KeysetPagination
 from reviews_app.models import Review
-from .serializers import ReviewSerializer
+from reviews_app import summaries
+from reviews_app.summaries import get_summary
+from .serializers import BusinessRatingSummarySerializer, ReviewSerializer
 
 
 class ReviewListCreateView(ListCreateAPIView):
@@ -18,16 +24,26 @@ class ReviewListCreateView(ListCreateAPIView):
            ?business_user=<id> **oder** ?business_user_id=<id>  
            ?reviewer=<id>       **oder** ?reviewer_id=<id>  
          • Optional ordering: ?ordering=updated_at | -rating
+         • Optional keyset pagination: ?pagination=cursor (&page_size=)
 
     POST /api/reviews/
          • Only 'customer' profiles may create exactly **one** review
-           per business_user.
+           per business_user (unique constraint; a second one → 400).
+         • ?upsert=true updates the requester's existing review of that
+           business_user instead (INSERT ... ON CONFLICT DO UPDATE) and
+           answers 200 with the stored review – 201 if there was none.
+
+    Review writes update the business's BusinessRatingSummary in the
+    same transaction (reviews_app.signals).
     """
     serializer_class   = ReviewSerializer
     permission_classes = [IsAuthenticated]
     filter_backends    = [DjangoFilterBackend, OrderingFilter]
     filterset_fields   = ["business_user", "reviewer"]
     ordering_fields    = ["updated_at", "rating"]
+    pagination_class   = KeysetPagination
+    keyset_ordering    = ("-updated_at", "-id")
+    keyset_fields      = ("updated_at", "rating")
 
     def get_queryset(self):
         """
@@ -48,7 +64,18 @@ class ReviewListCreateView(ListCreateAPIView):
         return qs
 
 
-    def perform_create(self, serializer):
+    def create(self, request, *args, **kwargs):
+        if request.query_params.get("upsert", "").lower() not in ("1", "true", "yes"):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        review, created = self.perform_upsert(serializer)
+        return Response(
+            self.get_serializer(review).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def check_reviewer(self):
         user = self.request.user
 
         if user.type != "customer":
@@ -57,30 +84,112 @@ class ReviewListCreateView(ListCreateAPIView):
         business_user = self.request.data.get("business_user")
         if not business_user:
             raise ValidationError({"business_user": "This field is required."})
+        return user
 
-        if Review.objects.filter(reviewer=user, business_user_id=business_user).exists():
+    def perform_create(self, serializer):
+        user = self.check_reviewer()
+        # unique_review_per_business decides – no check-then-insert race
+        try:
+            with transaction.atomic():
+                serializer.save(reviewer=user)
+        except IntegrityError:
             raise ValidationError({"detail": "You have already reviewed this business user."})
 
-        serializer.save(reviewer=user)
-
-
-class ReviewDetailView(RetrieveUpdateDestroyAPIView):
+    def perform_upsert(self, serializer):
+        """
+        One INSERT ... ON CONFLICT (reviewer, business_user) DO UPDATE.
+        The existing review is locked (SELECT ... FOR UPDATE) first, so its
+        previous rating is known; bulk_create sends no signals, so the
+        summary is moved here like the signal path does. Returns
+        (review, created).
+        """
+        user = self.check_reviewer()
+        data = serializer.validated_data
+        business_user_id = data["business_user"].pk
+        with transaction.atomic():
+            previous = (
+                Review.objects.select_for_update()
+                .filter(reviewer=user, business_user_id=business_user_id)
+                .values_list("rating", flat=True)
+                .first()
+            )
+            upserted = Review(reviewer=user, **data)
+            Review.objects.bulk_create(
+                [upserted],
+                update_conflicts=True,
+                unique_fields=["reviewer", "business_user"],
+                update_fields=["rating", "description", "updated_at"],
+            )
+            # created_at is the stored one, not the value of the discarded insert
+            review = Review.objects.get(pk=upserted.pk)
+            created = review.created_at == upserted.created_at
+            if created or previous is not None:
+                old = None if created else (business_user_id, previous)
+                summaries.apply_change(old, (business_user_id, review.rating))
+            else:
+                # a concurrent submit inserted the row after our lookup –
+                # the rating it had is gone, count from the reviews
+                summaries.recount([business_user_id])
+        return review, created
+
+
+class ReviewDetailView(ConditionalRequestMixin, RetrieveUpdateDestroyAPIView):
     """
     GET     /api/reviews/<id>/        – retrieve  
     PATCH   /api/reviews/<id>/        – update (author only)  
     DELETE  /api/reviews/<id>/delete/ – delete (author only → returns 204)
+
+    ETag / Last-Modified: 304 on conditional GET, 412 on a stale If-Match.
     """
     queryset            = Review.objects.all()
     serializer_class    = ReviewSerializer
     permission_classes  = [IsAuthenticated]
     lookup_field        = "id"
 
+    def get_validator_queryset(self):
+        # mirrors get_object(): only the author may access the review
+        return Review.objects.filter(pk=self.kwargs["id"], reviewer=self.request.user)
+
     def get_object(self):
         obj = super().get_object()
         if obj.reviewer != self.request.user:
             raise PermissionDenied("Only the author of this review can modify or delete it.")
         return obj
 
+    def perform_update(self, serializer):
+        # moving the review to an already reviewed business_user hits
+        # unique_review_per_business – same 400 as a second POST
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise ValidationError({"detail": "You have already reviewed this business user."})
+
     def destroy(self, request, *args, **kwargs):
         super().destroy(request, *args, **kwargs)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # delete + rating summary update commit together
+        instance.delete()
+
+
+class RatingSummaryView(APIView):
+    """
+    GET /api/reviews/summary/<business_user_id>/
+        Review count, rating sum, average and per-rating histogram of a
+        business user – a single primary-key read.
+
+    Expected errors
+        401 unauthenticated
+        404 user does not exist or is not a business user
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, business_user_id):
+        summary = get_summary(business_user_id)
+        if summary is None:
+            raise NotFound("Business user not found.")
+        return Response(BusinessRatingSummarySerializer(summary).data)
@@ -7,3 +7,7 @@ class ReviewsAppConfig(AppConfig):
 
     # Name of the app — used by Django to identify it
     name = 'reviews_app'
+
+    def ready(self):
+        # Register model signal handlers (per-business rating summaries)
+        from . import signals  # noqa: F401
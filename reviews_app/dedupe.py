@@ -0,0 +1,32 @@
+"""
+Duplicate reviews per (reviewer, business_user) – left over from before
+the unique_review_per_business constraint. Shared by migration 0002 (which
+refuses to run while any exist) and the dedupe_reviews command.
+"""
+
+from django.db.models import Count
+
+
+def duplicate_reviews(Review):
+    """
+    Returns ((reviewer_id, business_user_id), kept_id, [dropped ids]) for
+    every duplicated pair. The most recently updated review is kept.
+    Takes the model class, so historical models work as well.
+    """
+    pairs = (
+        Review.objects.values("reviewer_id", "business_user_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .order_by("reviewer_id", "business_user_id")
+    )
+    groups = []
+    for pair in pairs:
+        ids = list(
+            Review.objects.filter(
+                reviewer_id=pair["reviewer_id"], business_user_id=pair["business_user_id"]
+            )
+            .order_by("-updated_at", "-id")
+            .values_list("id", flat=True)
+        )
+        groups.append(((pair["reviewer_id"], pair["business_user_id"]), ids[0], ids[1:]))
+    return groups
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.schema import applied_apps
+from reviews_app.dedupe import duplicate_reviews
+
+
+class Command(BaseCommand):
+    """
+    Removes duplicate reviews per (reviewer, business_user) so migration
+    reviews_app 0002 can add its unique constraint. Keeps the most recently
+    updated review of each pair and lists every review it removes.
+
+        python manage.py dedupe_reviews [--dry-run]
+
+    Works on the schema as currently migrated, so it can run before
+    `migrate`.
+    """
+
+    help = "Remove duplicate reviews that block the unique_review_per_business constraint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        Review = applied_apps(connection).get_model("reviews_app", "Review")
+
+        with transaction.atomic():
+            groups = duplicate_reviews(Review)
+            for (reviewer_id, business_user_id), kept, dropped in groups:
+                self.stdout.write(
+                    f"reviewer {reviewer_id} / business {business_user_id}: keeping "
+                    f"review {kept}, removing {', '.join(map(str, dropped))}"
+                )
+            removed = [pk for _key, _kept, dropped in groups for pk in dropped]
+            if removed and not dry_run:
+                Review.objects.filter(pk__in=removed).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {len(removed)} duplicate review(s) across {len(groups)} pair(s)"
+                + (" (dry run)." if dry_run else ".")
+            )
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:57
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import migrations, models
+
+from reviews_app.dedupe import duplicate_reviews
+
+
+def refuse_duplicate_reviews(apps, schema_editor):
+    """
+    The constraint cannot be added while duplicates exist. Removing them is
+    left to the operator (dedupe_reviews lists what goes) instead of
+    deleting reviews silently here.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    groups = duplicate_reviews(Review)
+    if groups:
+        extra = sum(len(dropped) for _key, _kept, dropped in groups)
+        raise CommandError(
+            f"{extra} duplicate review(s) across {len(groups)} reviewer/business "
+            "pair(s) block unique_review_per_business. Review them with "
+            "`python manage.py dedupe_reviews --dry-run`, remove them with "
+            "`python manage.py dedupe_reviews`, then migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(refuse_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='unique_review_per_business'),
+        ),
+    ]
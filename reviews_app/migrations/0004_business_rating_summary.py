@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:31
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    histograms = defaultdict(dict)
+    grouped = Review.objects.order_by().values_list('business_user_id', 'rating').annotate(n=Count('pk'))
+    for business_user_id, rating, count in grouped:
+        histograms[business_user_id][str(rating)] = count
+    BusinessRatingSummary.objects.bulk_create(
+        BusinessRatingSummary(
+            business_user_id=pk,
+            review_count=sum(histograms[pk].values()),
+            rating_sum=sum(int(rating) * count for rating, count in histograms[pk].items()),
+            histogram=histograms[pk],
+        )
+        for pk in CustomUser.objects.filter(type='business').values_list('pk', flat=True).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0009_customuser_customuser_type_created_idx'),
+        ('reviews_app', '0003_review_review_updated_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingSummary',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('histogram', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -35,9 +35,71 @@ class Review(models.Model):
     # Timestamp when the review was last updated
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination keys of the review list
+            models.Index(fields=['updated_at', 'id'], name='review_updated_id_idx'),
+            models.Index(fields=['rating', 'id'], name='review_rating_id_idx'),
+        ]
+        constraints = [
+            # A customer may review each business user only once
+            models.UniqueConstraint(
+                fields=['reviewer', 'business_user'],
+                name='unique_review_per_business',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored business user / rating so summaries can move on save
+        instance._loaded_rating_key = (
+            instance.__dict__.get("business_user_id"),
+            instance.__dict__.get("rating"),
+        )
+        return instance
+
     def __str__(self):
         """
         String representation of the review object.
         Shows who wrote the review and for whom, along with the rating.
         """
         return f"Review by {self.reviewer} for {self.business_user} ({self.rating} stars)"
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Materialised rating aggregate per business user.
+
+    Kept in step with Review inside the same transaction (see
+    reviews_app.summaries), so a business's rating is a single primary-key
+    read instead of a scan over its reviews.
+    """
+
+    # The business user these figures belong to
+    business_user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_summary'
+    )
+
+    # Number of reviews and the sum of their ratings
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    # Reviews per rating, e.g. {"4": 12, "5": 30} (JSON object keys are strings)
+    histogram = models.JSONField(default=dict)
+
+    # Timestamp of the last change
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def average_rating(self):
+        """Mean rating rounded to one decimal, 0 without reviews."""
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.average_rating} from {self.review_count} review(s)"
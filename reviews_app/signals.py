@@ -0,0 +1,42 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+from reviews_app import summaries
+from reviews_app.models import BusinessRatingSummary, Review
+
+
+@receiver(post_save, sender=Review)
+def summarize_saved_review(sender, instance, created, raw=False, **kwargs):
+    """Moves the business rating summary along with a created / edited review."""
+    if raw:
+        return
+    old = None if created else getattr(instance, "_loaded_rating_key", None)
+    new = (instance.business_user_id, instance.rating)
+    if old is None and not created:
+        # loaded without from_db (e.g. constructed by hand) – be safe
+        summaries.recount([instance.business_user_id])
+    else:
+        summaries.apply_change(old, new)
+    instance._loaded_rating_key = new
+
+
+@receiver(post_delete, sender=Review)
+def summarize_deleted_review(sender, instance, origin=None, **kwargs):
+    old = getattr(instance, "_loaded_rating_key", None) or (
+        instance.business_user_id, instance.rating
+    )
+    # When a user is deleted its summary row may already be gone – do not
+    # rebuild a row that would point at the user being removed.
+    from_user_delete = isinstance(origin, CustomUser) or (
+        isinstance(origin, QuerySet) and origin.model is CustomUser
+    )
+    summaries.apply_change(old, None, rebuild_missing=not from_user_delete)
+
+
+@receiver(post_save, sender=CustomUser)
+def create_rating_summary(sender, instance, created, raw=False, **kwargs):
+    """New business users start with an empty rating summary."""
+    if created and not raw and instance.type == "business":
+        BusinessRatingSummary.objects.get_or_create(business_user=instance)
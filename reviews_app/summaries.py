@@ -0,0 +1,111 @@
+"""
+Per-business rating summaries (BusinessRatingSummary).
+
+Every review write locks the affected summary row(s) with SELECT ... FOR
+UPDATE and moves count, sum and histogram in the caller's transaction, so
+concurrent reviews never lose an update. A missing row is rebuilt from
+the reviews on demand.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.dispatch import Signal
+
+from auth_app.models import CustomUser
+from reviews_app.models import BusinessRatingSummary, Review
+
+# Sent (on commit) with `business_user_ids` whenever summaries may have
+# changed; None means all business users
+summaries_changed = Signal()
+
+
+def apply_change(old=None, new=None, rebuild_missing=True):
+    """
+    Moves one review from `old` to `new`; both are (business_user_id, rating)
+    tuples or None (created / deleted).
+    """
+    if old == new:
+        return
+    changes = defaultdict(list)
+    if old is not None:
+        changes[old[0]].append((old[1], -1))
+    if new is not None:
+        changes[new[0]].append((new[1], +1))
+
+    summaries = BusinessRatingSummary.objects.select_for_update().in_bulk(sorted(changes))
+    touched = []
+    for business_user_id, moves in changes.items():
+        summary = summaries.get(business_user_id)
+        if summary is None:
+            if rebuild_missing:
+                # no row yet – count from the reviews, which already include this write
+                recount([business_user_id])
+            continue
+        for rating, delta in moves:
+            key = str(rating)
+            summary.review_count += delta
+            summary.rating_sum += delta * rating
+            summary.histogram[key] = summary.histogram.get(key, 0) + delta
+            if not summary.histogram[key]:
+                del summary.histogram[key]
+        summary.histogram = dict(sorted(summary.histogram.items(), key=lambda item: int(item[0])))
+        summary.save(update_fields=["review_count", "rating_sum", "histogram", "updated_at"])
+        touched.append(business_user_id)
+    _notify(touched)
+
+
+def recount(business_user_ids=None):
+    """
+    Rebuilds the summary rows of the given business users (all business
+    users if None) from their reviews. Returns the number of rows written.
+    """
+    users = CustomUser.objects.filter(type="business")
+    reviews = Review.objects.filter(business_user__type="business")
+    if business_user_ids is not None:
+        users = users.filter(pk__in=business_user_ids)
+        reviews = reviews.filter(business_user_id__in=business_user_ids)
+
+    histograms = defaultdict(dict)
+    grouped = reviews.order_by().values_list("business_user_id", "rating").annotate(n=Count("pk"))
+    for business_user_id, rating, count in grouped:
+        histograms[business_user_id][str(rating)] = count
+
+    written = 0
+    for pk in users.values_list("pk", flat=True).iterator():
+        histogram = histograms.get(pk, {})
+        BusinessRatingSummary.objects.update_or_create(
+            business_user_id=pk,
+            defaults={
+                "review_count": sum(histogram.values()),
+                "rating_sum": sum(int(rating) * count for rating, count in histogram.items()),
+                "histogram": histogram,
+            },
+        )
+        written += 1
+    if written:
+        _notify(business_user_ids)
+    return written
+
+
+def _notify(business_user_ids):
+    # robust: the review is committed by now – a failing receiver (e.g. a
+    # locked ranking row) is logged instead of turning the response into a 500
+    if business_user_ids is None or business_user_ids:
+        transaction.on_commit(
+            lambda: summaries_changed.send_robust(
+                sender=BusinessRatingSummary, business_user_ids=business_user_ids
+            )
+        )
+
+
+def get_summary(business_user_id):
+    """
+    The summary row of a business user – one primary-key read. Rebuilt from
+    the reviews if missing; None if the user is not a business user.
+    """
+    summary = BusinessRatingSummary.objects.filter(pk=business_user_id).first()
+    if summary is None and recount([business_user_id]):
+        summary = BusinessRatingSummary.objects.filter(pk=business_user_id).first()
+    return summary
@@ -1,3 +1,242 @@
-from django.test import TestCase
+import sys
+import threading
+import time
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.signals import got_request_exception
+from django.db import OperationalError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from core.schema import applied_apps
+from reviews_app import summaries
+from reviews_app.models import BusinessRatingSummary, Review
+
+
+class RatingSummaryTests(TestCase):
+    """Review writes move the business rating summary; reads are one row."""
+
+    def setUp(self):
+        cache.clear()
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.other = CustomUser.objects.create_user(username="cus2", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def review(self, user, rating):
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            "/api/reviews/",
+            {"business_user": self.business.pk, "rating": rating, "description": "Fine"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def summary(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/reviews/summary/{self.business.pk}/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_summary_follows_review_writes(self):
+        self.assertEqual(self.summary()["review_count"], 0)
+        review_id = self.review(self.customer, 4)
+        self.review(self.other, 5)
+        data = self.summary()
+        self.assertEqual(
+            (data["review_count"], data["rating_sum"], data["average_rating"], data["histogram"]),
+            (2, 9, 4.5, {"4": 1, "5": 1}),
+        )
+
+        self.client.force_authenticate(self.customer)
+        self.client.patch(f"/api/reviews/{review_id}/", {"rating": 2}, format="json")
+        self.assertEqual(self.summary()["histogram"], {"2": 1, "5": 1})
+
+        self.client.delete(f"/api/reviews/{review_id}/")
+        data = self.summary()
+        self.assertEqual((data["review_count"], data["rating_sum"], data["histogram"]), (1, 5, {"5": 1}))
+
+    def test_moving_a_review_onto_a_reviewed_business_is_refused(self):
+        other_business = CustomUser.objects.create_user(username="biz2", password="pw", type="business")
+        self.review(self.customer, 4)
+        moved = Review.objects.create(
+            reviewer=self.customer, business_user=other_business, rating=2, description="Meh"
+        )
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.patch(
+            f"/api/reviews/{moved.pk}/", {"business_user": self.business.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "You have already reviewed this business user.")
+        moved.refresh_from_db()
+        self.assertEqual(moved.business_user, other_business)
+        self.assertEqual(self.summary()["histogram"], {"4": 1})
+
+    def test_failing_summary_receiver_does_not_fail_the_write(self):
+        def broken_receiver(sender, **kwargs):
+            raise OperationalError("database table is locked")
+
+        summaries.summaries_changed.connect(broken_receiver)
+        self.addCleanup(summaries.summaries_changed.disconnect, broken_receiver)
+        with self.assertLogs("django.dispatch", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+            self.review(self.customer, 4)
+        self.assertEqual(self.summary()["histogram"], {"4": 1})
+
+    def test_missing_summary_is_rebuilt(self):
+        self.review(self.customer, 3)
+        BusinessRatingSummary.objects.all().delete()
+        response = self.client.get(f"/api/reviews/summary/{self.business.pk}/")
+        self.assertEqual(response.data["histogram"], {"3": 1})
+        self.assertEqual(self.client.get(f"/api/reviews/summary/{self.customer.pk}/").status_code, 404)
+
+    def test_business_profile_exposes_rating(self):
+        response = self.client.get(f"/api/profile/{self.business.pk}/")
+        etag = response["ETag"]
+        self.assertEqual(response.data["rating"]["review_count"], 0)
+        self.review(self.customer, 4)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(f"/api/profile/{self.business.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rating"]["average_rating"], 4.0)
+        self.assertIsNone(self.client.get(f"/api/profile/{self.customer.pk}/").data["rating"])
+
+        listed = self.client.get("/api/profiles/business/").data
+        self.assertEqual(listed[0]["rating"]["histogram"], {"4": 1})
+
+    def test_deleting_the_business_user_removes_its_summary(self):
+        self.review(self.customer, 4)
+        self.business.delete()
+        self.assertFalse(BusinessRatingSummary.objects.exists())
+        self.assertFalse(Review.objects.exists())
+
+
+class ReviewUniquenessTests(TransactionTestCase):
+    """One review per (reviewer, business_user), enforced by the database."""
+
+    def setUp(self):
+        self.customer = CustomUser.objects.create_user(username="cus", password="pw", type="customer")
+        self.business = CustomUser.objects.create_user(username="biz", password="pw", type="business")
+
+    def post(self, rating, client=None, **params):
+        if client is None:
+            client = APIClient()
+            client.force_authenticate(self.customer)
+        query = "?" + "&".join(f"{key}={value}" for key, value in params.items()) if params else ""
+        return client.post(
+            f"/api/reviews/{query}",
+            {"business_user": self.business.pk, "rating": rating, "description": "Fine"},
+            format="json",
+        )
+
+    def test_parallel_submits_create_one_review(self):
+        submits = 8
+        barrier = threading.Barrier(submits)
+        codes = []
+        errors = {}
+
+        def record_error(sender, **kwargs):
+            errors[threading.get_ident()] = sys.exc_info()[1]
+
+        # the test client's own exception hook is process-wide and would
+        # re-raise other threads' errors – collect them per thread instead
+        got_request_exception.connect(record_error)
+        self.addCleanup(got_request_exception.disconnect, record_error)
+
+        def submit():
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(self.customer)
+            barrier.wait()
+            try:
+                for _ in range(100):
+                    response = self.post(5, client=client)
+                    error = errors.pop(threading.get_ident(), None)
+                    # SQLite's shared in-memory test database refuses a busy
+                    # table instead of waiting – retry that like a client
+                    # would; anything else (e.g. an IntegrityError) counts
+                    if not (isinstance(error, OperationalError) and "locked" in str(error)):
+                        codes.append(response.status_code)
+                        return
+                    time.sleep(0.01)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(submits)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(codes), [201] + [400] * (submits - 1))
+        self.assertEqual(Review.objects.count(), 1)
+        summary = BusinessRatingSummary.objects.get(pk=self.business.pk)
+        self.assertEqual((summary.review_count, summary.rating_sum), (1, 5))
+
+    def test_upsert_updates_the_existing_review(self):
+        response = self.post(4, upsert="true")
+        self.assertEqual(response.status_code, 201)
+        created = response.data
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(2, upsert="true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data["id"], response.data["rating"], response.data["created_at"]),
+            (created["id"], 2, created["created_at"]),
+        )
+        statements = [query["sql"] for query in queries.captured_queries]
+        writes = [sql for sql in statements if sql.startswith('INSERT INTO "reviews_app_review"')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn("ON CONFLICT", writes[0])
+        # the summary moves by the rating delta – no GROUP BY recount
+        self.assertFalse(any('FROM "reviews_app_review"' in sql and "GROUP BY" in sql for sql in statements))
+
+        summary = BusinessRatingSummary.objects.get(pk=self.business.pk)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.histogram), (1, 2, {"2": 1}))
+
+
+class DuplicateReviewMigrationTests(TransactionTestCase):
+    """Migration 0002 refuses duplicates; dedupe_reviews removes them."""
+
+    before = [("reviews_app", "0001_initial")]
+
+    def tearDown(self):
+        call_command("migrate", verbosity=0)
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return applied_apps(connection)
+
+    def test_duplicates_block_the_migration_until_deduped(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model("auth_app", "CustomUser")
+        Review = apps.get_model("reviews_app", "Review")
+        customer = User.objects.create(username="cus", type="customer")
+        business = User.objects.create(username="biz", type="business")
+        old, kept = (
+            Review.objects.create(reviewer=customer, business_user=business, rating=rating)
+            for rating in (1, 5)
+        )
+
+        with self.assertRaisesMessage(CommandError, "dedupe_reviews"):
+            self.migrate([("reviews_app", "0002_review_unique_review_per_business")])
+
+        out = StringIO()
+        call_command("dedupe_reviews", "--dry-run", stdout=out)
+        self.assertIn(f"keeping review {kept.pk}, removing {old.pk}", out.getvalue())
+        self.assertEqual(Review.objects.count(), 2)
+
+        call_command("dedupe_reviews", stdout=StringIO())
+        self.assertEqual(list(Review.objects.values_list("pk", flat=True)), [kept.pk])
+        self.migrate([("reviews_app", "0002_review_unique_review_per_business")])